@@ -0,0 +1,116 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from typing import Any
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_ROOT = os.getenv("CACHE_DIR") or os.path.join(BASE_DIR, "cache")
+
+
+def make_cache_key(*parts: Any) -> str:
+    # 모델 이름, 파라미터 등을 포함한 키 구성 요소를 정렬된 JSON으로 직렬화한 뒤 해시
+    serialized = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+
+
+class DiskCache:
+    """
+    값 하나를 JSON 파일 하나로 저장하는 디스크 캐시입니다.
+    전체 크기가 max_bytes를 넘으면 가장 오래 전에 사용한 항목(mtime 기준)부터 삭제합니다.
+    """
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._total_bytes = None
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, digest[:2], f"{digest}.json")
+
+    def get(self, key: str) -> Any | None:
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                value = json.load(f)
+            os.utime(path)  # 최근 사용 시각 갱신 (LRU)
+        except (OSError, ValueError):
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return value
+
+    def set(self, key: str, value: Any):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        data = json.dumps(value, ensure_ascii=False).encode("utf-8")
+        # 임시 파일에 쓴 뒤 교체하여 읽는 쪽이 반쯤 쓰인 파일을 보지 않도록 함
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            old_size = os.path.getsize(path) if os.path.exists(path) else 0
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"[Cache] 캐시 저장 실패: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+        with self._lock:
+            if self._total_bytes is None:
+                self._total_bytes = self._scan_total_bytes()
+            else:
+                self._total_bytes += len(data) - old_size
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def _iter_entries(self):
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if name.endswith(".json"):
+                    path = os.path.join(root, name)
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    yield path, stat.st_mtime, stat.st_size
+
+    def _scan_total_bytes(self) -> int:
+        return sum(size for _, _, size in self._iter_entries())
+
+    def _evict(self):
+        # 최대 크기의 90%까지 줄여서 매번 삭제가 일어나지 않도록 함
+        target_bytes = int(self.max_bytes * 0.9)
+        entries = sorted(self._iter_entries(), key=lambda entry: entry[1])
+        total = sum(size for _, _, size in entries)
+        removed = 0
+        for path, _, size in entries:
+            if total <= target_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        self._total_bytes = total
+        print(f"[Cache] {self.directory}: {removed}개 항목 삭제 (현재 {total / 1024 / 1024:.1f}MB)")
+
+    def stats(self) -> dict:
+        with self._lock:
+            if self._total_bytes is None:
+                self._total_bytes = self._scan_total_bytes()
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size_bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+            }
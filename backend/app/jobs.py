@@ -0,0 +1,159 @@
+import os
+import queue
+import threading
+import time
+import uuid
+from typing import Any, Callable
+
+from .pipeline import PipelineError
+
+# 백그라운드에서 동시에 처리할 강의 수와 대기열 길이 (대기열이 가득 차면 새 작업을 거절)
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+JOB_QUEUE_SIZE = int(os.getenv("JOB_QUEUE_SIZE", "8"))
+# 끝난 작업의 상태/결과를 보관하는 시간
+JOB_RESULT_TTL_SECONDS = int(os.getenv("JOB_RESULT_TTL_SECONDS", "3600"))
+
+
+class JobQueueFullError(Exception):
+    pass
+
+
+class Job:
+    def __init__(self, run: Callable[["Job"], Any], description: str):
+        self.id = uuid.uuid4().hex
+        self.description = description
+        self.status = "queued"  # queued → running → completed / failed
+        self.stage = "queued"
+        self.message = "대기 중"
+        self.result = None
+        self.provisional_summary = None  # STT가 끝나기 전에 보여줄 잠정 요약
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self._run = run
+        self._lock = threading.Lock()
+
+    def update_progress(self, stage: str, message: str):
+        with self._lock:
+            self.stage = stage
+            self.message = message
+
+    def update_provisional_summary(self, summary: str):
+        with self._lock:
+            self.provisional_summary = summary
+
+    def to_status_dict(self) -> dict:
+        with self._lock:
+            elapsed_until = self.finished_at or time.time()
+            return {
+                "job_id": self.id,
+                "description": self.description,
+                "status": self.status,
+                "stage": self.stage,
+                "progress": self.message,
+                "provisional_summary": self.provisional_summary,
+                "error": self.error,
+                "elapsed_seconds": round(elapsed_until - (self.started_at or elapsed_until), 2),
+            }
+
+
+class JobManager:
+    """
+    제한된 크기의 대기열과 고정 개수의 워커 스레드로 파이프라인 작업을 처리합니다.
+    처리량은 클라이언트 연결 유지 시간이 아니라 대기열이 결정합니다.
+    """
+
+    def __init__(self, num_workers: int = JOB_WORKERS, max_queue_size: int = JOB_QUEUE_SIZE):
+        self.num_workers = max(1, num_workers)
+        self._queue: queue.Queue[Job] = queue.Queue(maxsize=max(1, max_queue_size))
+        self._jobs: dict[str, Job] = {}
+        self._jobs_lock = threading.Lock()
+        self._workers: list[threading.Thread] = []
+        self._start_lock = threading.Lock()
+
+    def _ensure_started(self):
+        with self._start_lock:
+            if self._workers:
+                return
+            for i in range(self.num_workers):
+                worker = threading.Thread(target=self._worker_loop, name=f"lecture-job-{i}", daemon=True)
+                worker.start()
+                self._workers.append(worker)
+            print(f"[Jobs] 워커 {self.num_workers}개 시작 (대기열 크기 {self._queue.maxsize})")
+
+    def submit(self, run: Callable[[Job], Any], description: str = "") -> Job:
+        self._ensure_started()
+        self._prune_finished_jobs()
+        job = Job(run, description)
+        with self._jobs_lock:
+            self._jobs[job.id] = job
+        try:
+            self._queue.put_nowait(job)
+        except queue.Full:
+            with self._jobs_lock:
+                del self._jobs[job.id]
+            raise JobQueueFullError("작업 대기열이 가득 찼습니다. 잠시 후 다시 시도해주세요.")
+        print(f"[Jobs] 작업 등록: {job.id} ({description})")
+        return job
+
+    def add_completed(self, result: Any, description: str = "") -> Job:
+        # 캐시 적중처럼 바로 결과가 있는 경우에도 같은 조회 API를 쓸 수 있도록 완료된 작업으로 등록
+        self._prune_finished_jobs()
+        job = Job(lambda _: result, description)
+        now = time.time()
+        job.status = "completed"
+        job.stage = "done"
+        job.message = "완료 (캐시)"
+        job.result = result
+        job.started_at = job.finished_at = now
+        with self._jobs_lock:
+            self._jobs[job.id] = job
+        return job
+
+    def get(self, job_id: str) -> Job | None:
+        with self._jobs_lock:
+            return self._jobs.get(job_id)
+
+    def _worker_loop(self):
+        while True:
+            job = self._queue.get()
+            with job._lock:
+                job.status = "running"
+                job.started_at = time.time()
+            try:
+                result = job._run(job)
+                with job._lock:
+                    job.result = result
+                    job.status = "completed"
+                    job.stage = "done"
+                    job.message = "완료"
+            except PipelineError as e:
+                self._fail(job, e.detail)
+            except Exception as e:
+                print(f"[Jobs] 작업 {job.id} 처리 중 예기치 않은 오류: {e}")
+                self._fail(job, f"서버 내부 처리 중 예기치 않은 오류 발생: {e}")
+            finally:
+                with job._lock:
+                    job.finished_at = time.time()
+                self._queue.task_done()
+                print(f"[Jobs] 작업 종료: {job.id} ({job.status})")
+
+    def _fail(self, job: Job, detail: str):
+        with job._lock:
+            job.status = "failed"
+            job.error = detail
+            job.message = "실패"
+
+    def _prune_finished_jobs(self):
+        now = time.time()
+        with self._jobs_lock:
+            expired = [
+                job_id for job_id, job in self._jobs.items()
+                if job.finished_at and now - job.finished_at > JOB_RESULT_TTL_SECONDS
+            ]
+            for job_id in expired:
+                del self._jobs[job_id]
+
+
+job_manager = JobManager()
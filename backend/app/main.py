@@ -1,21 +1,38 @@
 import os
-import shutil
-from fastapi import FastAPI, File, UploadFile, HTTPException
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.concurrency import run_in_threadpool
-from werkzeug.utils import secure_filename
-from pydub import AudioSegment
 
-from .stt.azure_stt import transcribe_multiple_files
-from .stt.audio_splitter import split_audio 
-from .summary.koBart_summary import summarize_long_text
-from .preprocess.text_utils import preprocess_text_for_summary
-from .quiz_list.blank_quiz import generate_blank_quizzes
-from .quiz_list.OX_quiz import generate_ox_quizzes
+from .pipeline import (
+    PipelineError, transcribe_lecture_audio, analyze_transcript, get_cached_result, store_cached_result,
+)
+from .jobs import JobQueueFullError, job_manager
+from .model_registry import registry
+from .summary.incremental_summary import BackgroundIncrementalSummarizer
+from .summary.koBart_summary import SUMMARY_MODE
+from .upload import AUDIO_UPLOAD_OPENAPI, UploadError, receive_audio_upload
+from .workspace import UPLOAD_AUDIO_DIR, request_workspace, create_request_workspace, remove_request_workspace
+
+
+# 서버 시작 후 백그라운드에서 미리 로드할 리소스 (쉼표 구분, "none"이면 모두 첫 사용 시 로드)
+# KoBART는 hybrid 요약 모드에서만 쓰이므로 그때만 기본 목록에 포함
+MODEL_WARMUP = os.getenv("MODEL_WARMUP", "sentence_model,okt,kobart" if SUMMARY_MODE == "hybrid" else "sentence_model,okt")
+WARMUP_MODEL_NAMES = [] if MODEL_WARMUP.strip().lower() == "none" else [
+    name.strip() for name in MODEL_WARMUP.split(",") if name.strip()
+]
+# STT가 끝난 뒤 잠정 요약 스레드가 남은 조각을 반영하기를 기다리는 최대 시간 (초). 넘으면 최종 분석을 바로 시작
+PROVISIONAL_SUMMARY_CLOSE_TIMEOUT = float(os.getenv("PROVISIONAL_SUMMARY_CLOSE_TIMEOUT", "5"))
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 모델 로드를 기다리지 않고 바로 요청을 받을 수 있도록 백그라운드 스레드에서 웜업
+    if WARMUP_MODEL_NAMES:
+        registry.warm_up(WARMUP_MODEL_NAMES, background=True)
+    yield
 
-app = FastAPI(title="강의 음성 STT 서비스 (Azure)")
+app = FastAPI(title="강의 음성 STT 서비스 (Azure)", lifespan=lifespan)
 
 origins = [
     "http://localhost:3000",
@@ -29,119 +46,132 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-UPLOAD_AUDIO_DIR = os.path.join(BASE_DIR, "uploaded_audio_files")
 os.makedirs(UPLOAD_AUDIO_DIR, exist_ok=True)
 
-def convert_audio_to_wav(source_path: str, target_dir: str) -> str | None:
-    filename_without_ext, original_ext = os.path.splitext(os.path.basename(source_path))
-    wav_filename = f"{filename_without_ext}_converted.wav"
-    wav_filepath = os.path.join(target_dir, wav_filename)
-    try:
-        print(f"[CONVERT] 오디오 파일 변환 시도: {source_path} -> {wav_filepath}")
-        audio_format = original_ext.replace('.', '')
-        if not audio_format:
-            audio = AudioSegment.from_file(source_path)
-        else:
-            audio = AudioSegment.from_file(source_path, format=audio_format)
-        audio.export(wav_filepath, format="wav")
-        print(f"[CONVERT] 오디오 파일 변환 성공: {wav_filepath}")
-        return wav_filepath
-    except Exception as e:
-        print(f"[CONVERT ERROR] {source_path} -> WAV 변환 중 오류 발생: {e}")
-        return None
-
 @app.get("/")
 async def root():
     return {"message": "강의 음성 STT 서비스 API입니다. POST /process-lecture/ 로 오디오 파일을 업로드하세요."}
 
-@app.post("/process-lecture/")
-async def process_lecture_audio(audio_file: UploadFile = File(...)):
-    if not audio_file.filename:
-        raise HTTPException(status_code=400, detail="파일이 선택되지 않았습니다.")
-
-    original_filename = secure_filename(audio_file.filename)
-    original_saved_filepath = os.path.join(UPLOAD_AUDIO_DIR, original_filename)
-    
-    filepath_for_stt = original_saved_filepath
-    converted_temp_file_path = None
-
+@app.get("/health/ready")
+async def readiness():
+    # 웜업 대상 리소스가 모두 로드되었는지 확인 (로드 중이면 503)
+    models_status = registry.status()
+    ready = all(registry.is_ready(name) for name in WARMUP_MODEL_NAMES if name in models_status)
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={"ready": ready, "models": models_status},
+    )
+
+@app.post("/process-lecture/", openapi_extra=AUDIO_UPLOAD_OPENAPI)
+async def process_lecture_audio(request: Request):
+    # 업로드 본문을 받는 대로 작업 공간에 한 번만 씀 (해시/형식/크기 검사도 받는 동안 처리)
     try:
-        # 1. 오디오 파일 저장
-        with open(original_saved_filepath, "wb") as buffer:
-            shutil.copyfileobj(audio_file.file, buffer)
-
-        # 2. mp3 → wav 변환
-        file_extension = os.path.splitext(original_filename)[1].lower()
-        if file_extension == ".mp3":
-            print(f"[PROCESS] MP3 파일 감지: {original_filename}. WAV로 변환합니다...")
-            converted_temp_file_path = await run_in_threadpool(
-                convert_audio_to_wav, original_saved_filepath, UPLOAD_AUDIO_DIR
+        with request_workspace() as workspace_dir:
+            # 1. 오디오 파일 저장
+            upload = await receive_audio_upload(request, workspace_dir)
+            original_filename, saved_filepath, audio_sha256 = upload.filename, upload.path, upload.sha256
+
+            # 같은 파일을 이미 처리한 적이 있으면 바로 반환
+            cached_result = await run_in_threadpool(get_cached_result, audio_sha256)
+            if cached_result is not None:
+                return {"filename": original_filename, **cached_result}
+
+            # 2. STT (변환/분할/인식)
+            transcribed_text = await run_in_threadpool(
+                transcribe_lecture_audio, saved_filepath, original_filename, workspace_dir,
+                audio_format=upload.audio_format,
             )
-            if not converted_temp_file_path:
-                raise HTTPException(status_code=500, detail="MP3를 WAV로 변환하는 데 실패했습니다.")
-            filepath_for_stt = converted_temp_file_path
-
-        # 3. 오디오 분할
-        audio_chunks = await run_in_threadpool(split_audio, filepath_for_stt, UPLOAD_AUDIO_DIR)
-        if not audio_chunks:
-            raise HTTPException(status_code=500, detail="오디오 분할에 실패했습니다.")
-
-        # 4. 조각별 STT 수행
-        transcribed_text = await run_in_threadpool(transcribe_multiple_files, audio_chunks)
-        if not transcribed_text or ("오류:" in str(transcribed_text)):
-            error_detail = transcribed_text if transcribed_text else "STT 처리 중 알 수 없는 오류 발생 또는 빈 결과"
-            raise HTTPException(status_code=500, detail=f"STT 처리 실패: {error_detail}")
-
-        # 5. 전처리
-        print("[Main] STT 완료. 텍스트 전처리 시작...")
-        preprocessed_text = await run_in_threadpool(preprocess_text_for_summary, transcribed_text)
-        print("[Main] 텍스트 전처리 완료.")
-
-        # 6. 요약
-        summary_text = await run_in_threadpool(summarize_long_text, preprocessed_text)
-        if "요약 중 오류 발생:" in str(summary_text):
-            raise HTTPException(status_code=500, detail=f"요약 처리 실패: {summary_text}")
-
-        # 7. 퀴즈 생성
-        print("[Main] 퀴즈 생성 시작...")
-        
-        # 빈칸 퀴즈 생성 
-        blank_quizzes = await run_in_threadpool(generate_blank_quizzes, preprocessed_text, num_quizzes=5)
-        print(f"[Main] 빈칸 퀴즈 생성 완료. 생성된 퀴즈 개수: {len(blank_quizzes)}")
-
-        # O/X 퀴즈 생성 
-        ox_quizzes = await run_in_threadpool(generate_ox_quizzes, preprocessed_text, num_quizzes=5) # <-- 이 부분을 num_quizzes=5로 변경
-        print(f"[Main] O/X 퀴즈 생성 완료. 생성된 퀴즈 개수: {len(ox_quizzes)}")
-
-        # 모든 퀴즈를 합치기
-        quizzes_list = blank_quizzes + ox_quizzes
-        
-        if not quizzes_list:
-            print("[Main] 퀴즈 생성 실패 또는 생성된 퀴즈 없음. 기본 퀴즈 리스트를 사용합니다.")
-            quizzes_list = [
-                {"type": "O/X", "question": "이곳에 O/X 문제가 표시됩니다. (아직 구현되지 않음)", "answer": "미정"},
-                {"type": "빈칸", "question": "이곳에 _______ 문제가 표시됩니다. (아직 구현되지 않음)", "answer": "미정"},
-            ]
-
-
-        return {
-            "filename": original_filename,
-            "transcription": transcribed_text,
-            "summary": summary_text,
-            "quizzes": quizzes_list,
-        }
 
+        # 이후 단계는 텍스트만 사용하므로 작업 공간(업로드/조각 파일)은 여기서 이미 삭제됨
+        # 3. 전처리, 요약, 퀴즈 생성
+        result, succeeded = await run_in_threadpool(analyze_transcript, transcribed_text)
+        if succeeded:
+            await run_in_threadpool(store_cached_result, audio_sha256, result)
+        return {"filename": original_filename, **result}
+
+    except UploadError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+    except PipelineError as e:
+        raise HTTPException(status_code=500, detail=e.detail)
     except HTTPException:
         raise
     except Exception as e:
         print(f"[Main App Error] /process-lecture/ endpoint error: {str(e)}")
         raise HTTPException(status_code=500, detail=f"서버 내부 처리 중 예기치 않은 오류 발생: {str(e)}")
-    finally:
-        await audio_file.close()
-        if converted_temp_file_path and os.path.exists(converted_temp_file_path):
-            try:
-                os.remove(converted_temp_file_path)
-                print(f"[CLEANUP] 임시 변환 파일 삭제: {converted_temp_file_path}")
-            except OSError as e:
-                print(f"[CLEANUP ERROR] 임시 파일 삭제 실패: {converted_temp_file_path}, 오류: {e}")
+
+@app.post("/jobs/process-lecture/", status_code=202, openapi_extra=AUDIO_UPLOAD_OPENAPI)
+async def submit_lecture_job(request: Request):
+    """
+    업로드만 받고 바로 job_id를 돌려줍니다. 처리는 백그라운드 워커가 맡고,
+    진행 상황은 GET /jobs/{job_id}, 결과는 GET /jobs/{job_id}/result 로 확인합니다.
+    """
+    # 작업 공간은 작업이 끝날 때 워커가 삭제함
+    workspace_dir = create_request_workspace()
+    try:
+        upload = await receive_audio_upload(request, workspace_dir)
+    except UploadError as e:
+        remove_request_workspace(workspace_dir)
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+    except Exception as e:
+        remove_request_workspace(workspace_dir)
+        raise HTTPException(status_code=500, detail=f"업로드 파일 저장 실패: {e}")
+    original_filename, saved_filepath, audio_sha256 = upload.filename, upload.path, upload.sha256
+
+    cached_result = await run_in_threadpool(get_cached_result, audio_sha256)
+    if cached_result is not None:
+        remove_request_workspace(workspace_dir)
+        job = job_manager.add_completed({"filename": original_filename, **cached_result}, description=original_filename)
+        return {
+            "job_id": job.id,
+            "status_url": f"/jobs/{job.id}",
+            "result_url": f"/jobs/{job.id}/result",
+        }
+
+    def run_job(job) -> dict:
+        # 조각이 인식될 때마다 잠정 요약을 갱신해 작업 상태 조회로 바로 보여줌
+        # (STT 콜백은 큐에 넣기만 하고, 요약 계산은 전용 스레드에서 처리)
+        provisional_summarizer = BackgroundIncrementalSummarizer(on_summary=job.update_provisional_summary)
+        try:
+            transcribed_text = transcribe_lecture_audio(
+                saved_filepath, original_filename, workspace_dir,
+                progress=job.update_progress, on_transcript_text=provisional_summarizer.add_chunk,
+                audio_format=upload.audio_format,
+            )
+        finally:
+            remove_request_workspace(workspace_dir)
+            provisional_summarizer.close(timeout=PROVISIONAL_SUMMARY_CLOSE_TIMEOUT)
+        result, succeeded = analyze_transcript(transcribed_text, progress=job.update_progress)
+        if succeeded:
+            store_cached_result(audio_sha256, result)
+        return {"filename": original_filename, **result}
+
+    try:
+        job = job_manager.submit(run_job, description=original_filename)
+    except JobQueueFullError as e:
+        remove_request_workspace(workspace_dir)
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "30"})
+
+    return {
+        "job_id": job.id,
+        "status_url": f"/jobs/{job.id}",
+        "result_url": f"/jobs/{job.id}/result",
+    }
+
+@app.get("/jobs/{job_id}")
+async def get_lecture_job_status(job_id: str):
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="해당 작업을 찾을 수 없습니다.")
+    return job.to_status_dict()
+
+@app.get("/jobs/{job_id}/result")
+async def get_lecture_job_result(job_id: str):
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="해당 작업을 찾을 수 없습니다.")
+    if job.status == "failed":
+        raise HTTPException(status_code=500, detail=job.error)
+    if job.status != "completed":
+        # 아직 처리 중이면 현재 상태를 202로 돌려줌
+        return JSONResponse(status_code=202, content=job.to_status_dict())
+    return job.result
@@ -0,0 +1,85 @@
+import threading
+import time
+from typing import Any, Callable, Iterable
+
+
+class ModelRegistry:
+    """
+    무거운 리소스(KoBART, 문장 임베딩 모델, Okt JVM 등)를 처음 사용할 때 한 번만 로드합니다.
+    import 시점에는 로더만 등록하므로 서버가 바로 뜨고, 요약을 하지 않는 워커는 KoBART를 로드하지 않습니다.
+    """
+
+    def __init__(self):
+        self._loaders: dict[str, Callable[[], Any]] = {}
+        self._instances: dict[str, Any] = {}
+        self._status: dict[str, str] = {}
+        self._errors: dict[str, str] = {}
+        self._locks: dict[str, threading.Lock] = {}
+        self._registry_lock = threading.Lock()
+
+    def register(self, name: str, loader: Callable[[], Any]):
+        with self._registry_lock:
+            if name in self._loaders:
+                return  # 여러 모듈이 같은 리소스를 등록해도 한 번만 로드
+            self._loaders[name] = loader
+            self._status[name] = "not_loaded"
+            self._locks[name] = threading.Lock()
+
+    def get(self, name: str) -> Any | None:
+        """리소스를 반환합니다. 아직 로드되지 않았다면 지금 로드하고, 로드에 실패했으면 None을 반환합니다."""
+        if self._status.get(name) == "ready":
+            return self._instances[name]
+        if name not in self._loaders:
+            raise KeyError(f"등록되지 않은 모델입니다: {name}")
+
+        with self._locks[name]:
+            status = self._status[name]
+            if status == "ready":
+                return self._instances[name]
+            if status == "failed":
+                return None
+
+            self._status[name] = "loading"
+            print(f"[Models] '{name}' 로드 시작...")
+            start_time = time.perf_counter()
+            try:
+                instance = self._loaders[name]()
+            except Exception as e:
+                print(f"[Models] '{name}' 로드 실패: {e}")
+                self._errors[name] = str(e)
+                self._status[name] = "failed"
+                return None
+            self._instances[name] = instance
+            self._status[name] = "ready"
+            print(f"[Models] '{name}' 로드 완료 ({time.perf_counter() - start_time:.1f}초)")
+            return instance
+
+    def is_ready(self, name: str) -> bool:
+        return self._status.get(name) == "ready"
+
+    def status(self) -> dict:
+        return {
+            name: {"status": status, "error": self._errors.get(name)}
+            for name, status in self._status.items()
+        }
+
+    def warm_up(self, names: Iterable[str] | None = None, background: bool = True) -> threading.Thread | None:
+        # 서버 시작 직후 미리 로드해둘 리소스. background=True면 요청 처리를 막지 않음
+        names = list(names) if names is not None else list(self._loaders)
+
+        def load_all():
+            for name in names:
+                if name in self._loaders:
+                    self.get(name)
+                else:
+                    print(f"[Models] 웜업 대상이 등록되어 있지 않습니다: {name}")
+
+        if not background:
+            load_all()
+            return None
+        thread = threading.Thread(target=load_all, name="model-warmup", daemon=True)
+        thread.start()
+        return thread
+
+
+registry = ModelRegistry()
@@ -0,0 +1,239 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+from pydub import AudioSegment
+
+from .stt.azure_stt import transcribe_multiple_files, transcribe_pcm_stream_with_azure
+from .stt.audio_splitter import split_audio
+from .stt.audio_stream import iter_pcm_frames
+from .summary.koBart_summary import summarize_long_text
+from .preprocess.text_utils import preprocess_text_for_summary
+from .preprocess.document import analyze_document
+from .quiz_list.blank_quiz import generate_blank_quizzes
+from .quiz_list.OX_quiz import generate_ox_quizzes
+from .summary.textrank_summary import SENTENCE_MODEL_NAME, is_summary_failure
+from .summary.embedding_service import SENTENCE_EMBEDDING_BACKEND
+from .summary.hierarchical_summary import HIERARCHICAL_MIN_SENTENCES, HIERARCHICAL_SEGMENT_SENTENCES
+from .summary.koBart_summary import model_name as KOBART_MODEL_NAME, SUMMARY_MODE, KOBART_QUANTIZE
+from .cache import CACHE_ROOT, DiskCache, make_cache_key
+
+# STT_STREAMING=1 이면 WAV 변환/분할 없이 업로드 파일을 한 번만 디코딩해 바로 인식기로 흘려보냄
+USE_STREAMING_STT = os.getenv("STT_STREAMING", "0") == "1"
+# 오디오 분할 방식: "fixed"(60초 고정) 또는 "silence"(무음 지점 기준)
+AUDIO_SPLIT_MODE = os.getenv("AUDIO_SPLIT_MODE", "fixed")
+
+NUM_BLANK_QUIZZES = 5
+NUM_OX_QUIZZES = 5
+
+# 같은 파일을 다시 올리면 STT/요약/퀴즈를 건너뛰고 저장된 결과를 돌려줌
+RESULT_CACHE_ENABLED = os.getenv("RESULT_CACHE", "1") == "1"
+RESULT_CACHE_MAX_BYTES = int(os.getenv("RESULT_CACHE_MAX_MB", "512")) * 1024 * 1024
+# 파이프라인 동작(전처리 규칙, 퀴즈 생성 방식 등)이 바뀌면 올려서 이전 캐시를 무효화
+PIPELINE_CACHE_VERSION = 3
+
+result_cache = DiskCache(os.path.join(CACHE_ROOT, "results"), RESULT_CACHE_MAX_BYTES)
+
+# 진행 상황 보고 콜백: (단계 이름, 사람이 읽을 수 있는 진행 메시지)
+ProgressCallback = Callable[[str, str], None]
+
+
+class PipelineError(Exception):
+    """파이프라인 단계가 실패했을 때 사용자에게 보여줄 메시지를 담는 예외"""
+
+    def __init__(self, detail: str):
+        super().__init__(detail)
+        self.detail = detail
+
+
+def _report(progress: ProgressCallback | None, stage: str, message: str):
+    print(f"[Pipeline] {stage}: {message}")
+    if progress:
+        progress(stage, message)
+
+def result_cache_key(audio_sha256: str) -> str:
+    return make_cache_key("lecture-result", PIPELINE_CACHE_VERSION, audio_sha256, {
+        "stt_language": "ko-KR",
+        "stt_streaming": USE_STREAMING_STT,
+        "split_mode": AUDIO_SPLIT_MODE,
+        "sentence_model": SENTENCE_MODEL_NAME,
+        "sentence_backend": SENTENCE_EMBEDDING_BACKEND,
+        "kobart_model": KOBART_MODEL_NAME,
+        "summary_mode": SUMMARY_MODE,
+        "kobart_quantize": KOBART_QUANTIZE,
+        "hierarchical": [HIERARCHICAL_MIN_SENTENCES, HIERARCHICAL_SEGMENT_SENTENCES],
+        "num_blank_quizzes": NUM_BLANK_QUIZZES,
+        "num_ox_quizzes": NUM_OX_QUIZZES,
+    })
+
+def get_cached_result(audio_sha256: str) -> dict | None:
+    if not RESULT_CACHE_ENABLED:
+        return None
+    cached = result_cache.get(result_cache_key(audio_sha256))
+    if cached is not None:
+        print(f"[Pipeline] 결과 캐시 적중: {audio_sha256[:12]}")
+    return cached
+
+def store_cached_result(audio_sha256: str, result: dict):
+    if RESULT_CACHE_ENABLED:
+        result_cache.set(result_cache_key(audio_sha256), result)
+
+def convert_audio_to_wav(source_path: str, target_dir: str, audio_format: str | None = None) -> str | None:
+    # audio_format(업로드 때 판별한 실제 형식)이 없으면 확장자로 형식을 정함
+    filename_without_ext, original_ext = os.path.splitext(os.path.basename(source_path))
+    wav_filename = f"{filename_without_ext}_converted.wav"
+    wav_filepath = os.path.join(target_dir, wav_filename)
+    try:
+        print(f"[CONVERT] 오디오 파일 변환 시도: {source_path} -> {wav_filepath}")
+        audio_format = audio_format or original_ext.replace('.', '').lower()
+        if not audio_format:
+            audio = AudioSegment.from_file(source_path)
+        else:
+            audio = AudioSegment.from_file(source_path, format=audio_format)
+        audio.export(wav_filepath, format="wav")
+        print(f"[CONVERT] 오디오 파일 변환 성공: {wav_filepath}")
+        return wav_filepath
+    except Exception as e:
+        print(f"[CONVERT ERROR] {source_path} -> WAV 변환 중 오류 발생: {e}")
+        return None
+
+def transcribe_audio_streaming(
+    source_path: str,
+    progress: ProgressCallback | None = None,
+    on_transcript_text: Callable[[str], None] | None = None,
+) -> str | None:
+    recognized_count = 0
+
+    def on_text(text: str):
+        nonlocal recognized_count
+        recognized_count += 1
+        print(f"[Stream STT] 인식됨: {text[:50]}...")
+        if progress:
+            progress("stt", f"STT 인식 문장 {recognized_count}개")
+        if on_transcript_text:
+            on_transcript_text(text)
+    return transcribe_pcm_stream_with_azure(iter_pcm_frames(source_path), on_text=on_text)
+
+def transcribe_lecture_audio(
+    saved_filepath: str,
+    original_filename: str,
+    workspace_dir: str,
+    progress: ProgressCallback | None = None,
+    on_transcript_text: Callable[[str], None] | None = None,
+    audio_format: str | None = None,
+) -> str:
+    """
+    업로드된 오디오를 텍스트로 변환합니다. 변환/조각 파일은 모두 workspace_dir 안에 만들어집니다.
+    on_transcript_text가 주어지면 인식된 텍스트를 강의 순서대로 받는 즉시 전달합니다 (점진적 요약용).
+    audio_format은 업로드 때 파일 앞부분으로 판별한 형식이며, 없으면 파일 확장자로 판단합니다.
+    """
+    if USE_STREAMING_STT:
+        # 디코딩 → 인식을 하나의 스트림으로 처리
+        _report(progress, "stt", f"스트리밍 STT 모드: {original_filename}")
+        transcribed_text = transcribe_audio_streaming(saved_filepath, progress, on_transcript_text)
+    else:
+        filepath_for_stt = saved_filepath
+
+        # 1. mp3 → wav 변환
+        source_format = audio_format or os.path.splitext(original_filename)[1].lower().lstrip(".")
+        if source_format == "mp3":
+            _report(progress, "convert", f"MP3 파일 감지: {original_filename}. WAV로 변환합니다...")
+            converted_temp_file_path = convert_audio_to_wav(saved_filepath, workspace_dir, audio_format=source_format)
+            if not converted_temp_file_path:
+                raise PipelineError("MP3를 WAV로 변환하는 데 실패했습니다.")
+            filepath_for_stt = converted_temp_file_path
+
+        # 2. 오디오 분할
+        _report(progress, "split", "오디오 분할 중")
+        audio_chunks = split_audio(filepath_for_stt, workspace_dir, mode=AUDIO_SPLIT_MODE)
+        if not audio_chunks:
+            raise PipelineError("오디오 분할에 실패했습니다.")
+
+        # 3. 조각별 STT 수행
+        _report(progress, "stt", f"STT chunk 0/{len(audio_chunks)}")
+
+        def on_chunk_done(done: int, total: int):
+            if progress:
+                progress("stt", f"STT chunk {done}/{total}")
+        def on_chunk_text(chunk_index: int, text: str):
+            if on_transcript_text:
+                on_transcript_text(text)
+        transcribed_text = transcribe_multiple_files(
+            audio_chunks, progress_callback=on_chunk_done, chunk_text_callback=on_chunk_text
+        )
+
+    if not transcribed_text or ("오류:" in str(transcribed_text)):
+        error_detail = transcribed_text if transcribed_text else "STT 처리 중 알 수 없는 오류 발생 또는 빈 결과"
+        raise PipelineError(f"STT 처리 실패: {error_detail}")
+    return transcribed_text
+
+def _timed(stage_timings: dict, stage: str, fn: Callable, *args, **kwargs):
+    start_time = time.perf_counter()
+    try:
+        return fn(*args, **kwargs)
+    finally:
+        stage_timings[stage] = time.perf_counter() - start_time
+
+def analyze_transcript(transcribed_text: str, progress: ProgressCallback | None = None) -> tuple[dict, bool]:
+    """
+    STT 결과 텍스트로 요약과 퀴즈를 만듭니다.
+    요약, 빈칸 퀴즈, O/X 퀴즈는 서로 의존하지 않으므로 동시에 실행하고 모두 끝날 때까지 기다립니다.
+    (결과, 성공 여부)를 반환합니다. 요약이 실패 안내로 대체됐거나 기본 퀴즈를 썼으면 성공이 아니며, 결과 캐시에 저장하지 않아야 합니다.
+    """
+    stage_timings: dict[str, float] = {}
+
+    # 1. 전처리
+    _report(progress, "preprocess", "텍스트 전처리 중")
+    preprocessed_text = _timed(stage_timings, "preprocess", preprocess_text_for_summary, transcribed_text)
+
+    # 문장 분리/형태소 분석은 여기서 한 번만 하고 요약과 두 퀴즈 생성기가 결과를 공유
+    _report(progress, "analyze", "문장 분리 및 형태소 분석 중")
+    document = _timed(stage_timings, "analyze", analyze_document, preprocessed_text)
+
+    # 2. 요약과 3. 퀴즈 생성을 동시에 실행
+    # (임베딩/토크나이저 연산은 GIL을 놓고, 형태소 분석은 이미 document에 끝나 있으므로 스레드로 충분)
+    _report(progress, "summary", "요약 및 퀴즈 생성 중")
+    fan_out_start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=3, thread_name_prefix="analyze") as executor:
+        summary_future = executor.submit(
+            _timed, stage_timings, "summary", summarize_long_text, preprocessed_text, document=document
+        )
+        blank_future = executor.submit(
+            _timed, stage_timings, "blank_quiz", generate_blank_quizzes,
+            preprocessed_text, num_quizzes=NUM_BLANK_QUIZZES, document=document
+        )
+        ox_future = executor.submit(
+            _timed, stage_timings, "ox_quiz", generate_ox_quizzes,
+            preprocessed_text, num_quizzes=NUM_OX_QUIZZES, document=document
+        )
+        summary_text = summary_future.result()
+        blank_quizzes = blank_future.result()
+        ox_quizzes = ox_future.result()
+    stage_timings["summary_and_quiz"] = time.perf_counter() - fan_out_start
+
+    timing_text = ", ".join(f"{stage} {seconds:.2f}초" for stage, seconds in stage_timings.items())
+    _report(progress, "timing", timing_text)
+
+    if "요약 중 오류 발생:" in str(summary_text):
+        raise PipelineError(f"요약 처리 실패: {summary_text}")
+    print(f"[Pipeline] 빈칸 퀴즈 생성 완료. 생성된 퀴즈 개수: {len(blank_quizzes)}")
+    print(f"[Pipeline] O/X 퀴즈 생성 완료. 생성된 퀴즈 개수: {len(ox_quizzes)}")
+
+    # 모든 퀴즈를 합치기
+    quizzes_list = blank_quizzes + ox_quizzes
+    succeeded = not is_summary_failure(summary_text) and bool(quizzes_list)
+
+    if not quizzes_list:
+        print("[Pipeline] 퀴즈 생성 실패 또는 생성된 퀴즈 없음. 기본 퀴즈 리스트를 사용합니다.")
+        quizzes_list = [
+            {"type": "O/X", "question": "이곳에 O/X 문제가 표시됩니다. (아직 구현되지 않음)", "answer": "미정"},
+            {"type": "빈칸", "question": "이곳에 _______ 문제가 표시됩니다. (아직 구현되지 않음)", "answer": "미정"},
+        ]
+
+    if not succeeded:
+        print("[Pipeline] 요약 또는 퀴즈가 정상적으로 생성되지 않아 결과를 캐시하지 않습니다.")
+    return {
+        "transcription": transcribed_text,
+        "summary": summary_text,
+        "quizzes": quizzes_list,
+    }, succeeded
@@ -0,0 +1,83 @@
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+
+from .morph_analyzer import morph_analyzer, PosTags
+from .nlp_resources import get_okt
+
+# 요약/퀴즈가 공통으로 쓰는 문장 분리 기준 (마침표, 물음표, 느낌표 뒤 공백)
+SENTENCE_BOUNDARY_PATTERN = re.compile(r'(?<=[.?!])\s+')
+# 퀴즈 문장에서 제거할 문자 (한글, 영문, 숫자, 공백, 기본 문장부호 외)
+QUIZ_DISALLOWED_CHARS_PATTERN = re.compile(r'[^\w\s가-힣.?!,]')
+WHITESPACE_PATTERN = re.compile(r'\s+')
+NOUN_WORD_PATTERN = re.compile(r'[가-힣a-zA-Z]+')
+
+
+@dataclass
+class LectureDocument:
+    """
+    전처리된 강의 텍스트를 한 번만 분석한 결과입니다.
+    요약기와 두 퀴즈 생성기가 문장 분리/형태소 분석을 각자 다시 하지 않고 이 객체를 공유합니다.
+    """
+    text: str
+    sentences: list[str]                    # 요약에 쓰는 원문 문장
+    offsets: list[tuple[int, int]]          # text 안에서 각 문장의 (시작, 끝) 위치
+    quiz_sentences: list[str]               # 특수문자를 정리한 퀴즈용 문장 (sentences와 같은 순서)
+    stemmed_tags: list[PosTags] = field(default_factory=list)   # quiz_sentences의 어간 기준 태깅
+    original_tags: list[PosTags] = field(default_factory=list)  # quiz_sentences의 원형 태깅
+    sentence_nouns: list[list[str]] = field(default_factory=list)  # 문장별 명사 목록 (어간 기준)
+
+    def noun_counts(self, sentence_indices: list[int] | None = None, min_word_length: int = 1) -> Counter:
+        # 지정한 문장들에 등장한 명사 빈도
+        if sentence_indices is None:
+            sentence_indices = range(len(self.sentences))
+        return Counter(
+            noun
+            for i in sentence_indices
+            for noun in self.sentence_nouns[i]
+            if len(noun) >= min_word_length
+        )
+
+
+def split_document_sentences(text: str) -> tuple[list[str], list[tuple[int, int]]]:
+    sentences = []
+    offsets = []
+    start = 0
+    for boundary in SENTENCE_BOUNDARY_PATTERN.finditer(text):
+        if text[start:boundary.start()].strip():
+            sentences.append(text[start:boundary.start()])
+            offsets.append((start, boundary.start()))
+        start = boundary.end()
+    if text[start:].strip():
+        end = len(text.rstrip())
+        sentences.append(text[start:end])
+        offsets.append((start, end))
+    return sentences, offsets
+
+
+def clean_quiz_sentence(sentence: str) -> str:
+    cleaned = QUIZ_DISALLOWED_CHARS_PATTERN.sub('', sentence)
+    return WHITESPACE_PATTERN.sub(' ', cleaned).strip()
+
+
+def analyze_document(text: str, with_pos: bool = True) -> LectureDocument:
+    """
+    문장 분리, 퀴즈용 정리, 형태소 분석, 명사 추출을 요청당 한 번만 수행합니다.
+    """
+    text = text.strip() if text else ""
+    sentences, offsets = split_document_sentences(text)
+    quiz_sentences = [clean_quiz_sentence(s) for s in sentences]
+    document = LectureDocument(text=text, sentences=sentences, offsets=offsets, quiz_sentences=quiz_sentences)
+
+    if with_pos and sentences and get_okt() is None:
+        # 형태소 분석기가 없어도 요약은 가능하도록 태깅만 건너뜀 (퀴즈 생성기는 태깅 결과가 없으면 빈 목록 반환)
+        print("[Document] 형태소 분석기를 로드하지 못해 품사 태깅을 건너뜁니다.")
+    elif with_pos and sentences:
+        document.stemmed_tags = morph_analyzer.pos_many(quiz_sentences, norm=True, stem=True)
+        document.original_tags = morph_analyzer.pos_many(quiz_sentences, norm=False, stem=False)
+        document.sentence_nouns = [
+            [word for word, tag in tags if tag == 'Noun' and NOUN_WORD_PATTERN.fullmatch(word)]
+            for tags in document.stemmed_tags
+        ]
+    print(f"[Document] 문장 {len(sentences)}개 분석 완료")
+    return document
@@ -0,0 +1,73 @@
+import os
+import threading
+from collections import OrderedDict
+
+from .nlp_resources import get_okt
+
+# (문장, norm, stem) → 품사 태깅 결과를 기억해둘 최대 개수
+MORPH_CACHE_SIZE = int(os.getenv("MORPH_CACHE_SIZE", "20000"))
+
+PosTags = tuple[tuple[str, str], ...]
+
+
+class MorphAnalyzer:
+    """
+    모든 퀴즈 생성기가 함께 쓰는 Okt 품사 태깅 서비스입니다.
+    JVM 호출은 락 하나로 직렬화하고, 같은 (문장, norm, stem) 조합은 LRU 캐시에서 바로 돌려줍니다.
+    """
+
+    def __init__(self, cache_size: int = MORPH_CACHE_SIZE):
+        self.cache_size = cache_size
+        self.hits = 0
+        self.misses = 0
+        self._cache: OrderedDict[tuple[str, bool, bool], PosTags] = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._jvm_lock = threading.Lock()
+
+    def pos(self, sentence: str, norm: bool = False, stem: bool = False) -> PosTags:
+        return self.pos_many([sentence], norm=norm, stem=stem)[0]
+
+    def pos_many(self, sentences: list[str], norm: bool = False, stem: bool = False) -> list[PosTags]:
+        """
+        여러 문장을 한 번에 태깅합니다. 캐시에 없는 문장만 모아서 JVM 락을 한 번 잡고 연속으로 처리합니다.
+        """
+        results: list[PosTags | None] = [None] * len(sentences)
+        missing: dict[str, list[int]] = {}
+
+        with self._cache_lock:
+            for i, sentence in enumerate(sentences):
+                key = (sentence, norm, stem)
+                cached = self._cache.get(key)
+                if cached is not None:
+                    self._cache.move_to_end(key)
+                    results[i] = cached
+                    self.hits += 1
+                else:
+                    missing.setdefault(sentence, []).append(i)
+                    self.misses += 1
+
+        if missing:
+            okt = get_okt()
+            if okt is None:
+                raise RuntimeError("Okt 형태소 분석기를 로드하지 못했습니다.")
+            tagged: dict[str, PosTags] = {}
+            with self._jvm_lock:
+                for sentence in missing:
+                    tagged[sentence] = tuple(okt.pos(sentence, norm=norm, stem=stem))
+
+            with self._cache_lock:
+                for sentence, tags in tagged.items():
+                    self._cache[(sentence, norm, stem)] = tags
+                    for i in missing[sentence]:
+                        results[i] = tags
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+
+        return results
+
+    def stats(self) -> dict:
+        with self._cache_lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._cache)}
+
+
+morph_analyzer = MorphAnalyzer()
@@ -0,0 +1,12 @@
+from ..model_registry import registry
+
+# 형태소 분석기(Okt, JVM 기동)는 퀴즈를 처음 만들 때 로드
+
+def _load_okt():
+    from konlpy.tag import Okt
+    return Okt()
+
+registry.register("okt", _load_okt)
+
+def get_okt():
+    return registry.get("okt")
@@ -1,34 +1,102 @@
 import re
 
-def preprocess_text_for_summary(text: str) -> str:
-    if not text:
-        return ""
+# 요약 전에 지우는 필러(군말) 어휘. 단어 단위로만 지우고, 뒤따르는 쉼표/공백도 함께 제거
+FILLER_WORDS = (
+    # 너무 많이 제거하지 않고, 필러 단어 앞뒤 쉼표나 공백만 적당히 제거
+    "음", "어", "그", "저기", "일단", "약간", "뭐랄까", "아무튼", "글쎄", "암튼", "뭐냐", "어쨌든", "하여튼",
+    "그게", "저게", "이거", "그거", "저거", "그래서", "근데", "그러니까", "그러면", "게다가", "이렇게", "그렇게", "저렇게",
+    "그런 거", "저런 거", "예를 들어", "바로",
+    "네", "자", "좀", "막", "그냥", "아니", "혹시", "지금", "사실", "아마", "정말", "진짜", "완전", "아주", "매우", "엄청", "되게", "굉장히",
+)
+# 너무 짧은 문장(15자 미만)만 필터링 (30자 -> 15자로 완화)
+MIN_SENTENCE_LENGTH = 15
+SENTENCE_END_CHARS = ".?!"
+
+
+def _build_trie_pattern(words) -> str:
+    """
+    단어 목록을 접두사 트리로 묶은 정규식으로 만듭니다. 예: 그, 그게, 그냥 → 그(?:게|냥)?
+    여러 개의 대안을 차례로 시도하지 않고 글자 하나씩 따라가며 비교하므로 어휘가 늘어나도 느려지지 않습니다.
+    """
+    trie: dict = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def to_pattern(node: dict) -> str:
+        branches = [re.escape(char) + to_pattern(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        # 여기서 끝나는 단어도 있으면 나머지 글자는 선택 사항
+        return f"(?:{body})?" if "" in node else body
+
+    return to_pattern(trie)
+
 
-    filler_patterns = [
-        # 너무 많이 제거하지 않고, 필러 단어 앞뒤 쉼표나 공백만 적당히 제거
-        r'\b(음|어|그|저기|일단|약간|뭐랄까|아무튼|글쎄|암튼|뭐냐|어쨌든|하여튼)\b[,\s]*',
-        r'\b(그게|저게|이거|그거|저거|그래서|근데|그러니까|그러면|게다가|이렇게|그렇게|저렇게)\b[,\s]*',
-        r'\b(그런 거|저런 거|예를 들어|바로)\b[,\s]*',
-        r'\b(네|자|좀|막|그냥|아니|혹시|지금|사실|아마|정말|진짜|완전|아주|매우|엄청|되게|굉장히)\b[,\s]*',
-    ]
+# 필러 단어 하나 (단어 경계까지)
+FILLER_PATTERN = r"(?:" + _build_trie_pattern(FILLER_WORDS) + r")\b"
+# 필러 제거와 연속 중복 단어 제거를 한 번의 치환으로 처리하는 정규식 (모듈 로드 시 한 번만 컴파일)
+# 중복 단어의 반복 부분이 필러(예: "그런 그런 거"의 "그런 거")이면 중복으로 보지 않음 (필러 제거가 먼저였던 기존 처리 순서와 동일)
+PREPROCESS_SCAN_PATTERN = re.compile(
+    r"\b(?:(?P<word>\w+)(?: (?!" + FILLER_PATTERN + r")(?P=word)\b)+"
+    r"|(?P<filler>" + FILLER_PATTERN + r"[,\s]*))"
+)
+# 공백 정리 후의 문장 경계 (문장 부호 뒤 공백)
+SENTENCE_SPLIT_PATTERN = re.compile(r"(?<=[.?!]) ")
+# 스트리밍 입력에서 여기까지는 확정해서 처리해도 되는 위치 (문장 부호 바로 뒤 공백)
+SENTENCE_BREAK_PATTERN = re.compile(r"[.?!](?=\s)")
 
-    processed_text = text
-    for pattern in filler_patterns:
-        processed_text = re.sub(pattern, ' ', processed_text)
 
-    # 중복 단어 연속 제거 (너무 강하면 제거)
-    processed_text = re.sub(r'\b(\w+)( \1\b)+', r'\1', processed_text)
+def _replace_filler_or_duplicate(match: re.Match) -> str:
+    # 중복 단어는 한 번만 남기고, 필러는 공백 하나로 바꿈
+    return match.group("word") or " "
 
-    # 여러 공백은 하나로
-    processed_text = re.sub(r'\s+', ' ', processed_text).strip()
 
-    # 문장 분리 (문장 끝에 마침표, 물음표, 느낌표 뒤 공백 기준)
-    sentences = re.split(r'(?<=[.?!])\s+', processed_text)
+class SummaryPreprocessor:
+    """
+    preprocess_text_for_summary의 처리 엔진입니다.
+    필러 제거와 중복 단어 제거를 한 번의 정규식 치환으로 처리한 뒤, 공백 정리 → 문장 분리 → 짧은 문장 제거를 이어서 수행합니다.
+    feed()로 STT 조각을 받는 대로 넣으면 확정된 문장만 돌려주고, 마지막에 flush()로 남은 문장을 처리합니다.
+    """
 
-    # 너무 짧은 문장(15자 미만)만 필터링 (30자 -> 15자로 완화)
-    filtered_sentences = [s for s in sentences if len(s) >= 15]
+    def __init__(self, min_sentence_length: int = MIN_SENTENCE_LENGTH):
+        self.min_sentence_length = min_sentence_length
+        self._buffer = ""
+
+    def feed(self, text: str) -> list[str]:
+        if not text:
+            return []
+        self._buffer = f"{self._buffer} {text}" if self._buffer else text
+        # 마지막 문장 부호 뒤 공백 전까지만 처리 (그 뒤는 다음 조각과 이어질 수 있음)
+        last_break = None
+        for last_break in SENTENCE_BREAK_PATTERN.finditer(self._buffer):
+            pass
+        if last_break is None:
+            return []
+        ready, self._buffer = self._buffer[:last_break.end()], self._buffer[last_break.end():]
+        return self.process(ready)
+
+    def flush(self) -> list[str]:
+        remaining, self._buffer = self._buffer, ""
+        return self.process(remaining)
+
+    def process(self, text: str) -> list[str]:
+        # 전체 텍스트를 한 번에 처리 (버퍼를 거치지 않음)
+        text = PREPROCESS_SCAN_PATTERN.sub(_replace_filler_or_duplicate, text)
+        text = " ".join(text.split())
+        if not text:
+            return []
+        return [s for s in SENTENCE_SPLIT_PATTERN.split(text) if len(s) >= self.min_sentence_length]
+
+
+def preprocess_text_for_summary(text: str) -> str:
+    if not text:
+        return ""
 
-    processed_text = ' '.join(filtered_sentences)
+    processed_text = " ".join(SummaryPreprocessor().process(text))
 
     if text != processed_text:
         print(f"[Preprocess] 원본 (앞 50자): {text[:50]}...")
@@ -1,40 +1,97 @@
-import re
+import bisect
 import random
-import nltk
-from konlpy.tag import Okt
+import re
 from collections import Counter
 
-# NLTK 데이터 다운로드 (문장 토큰화에 필요)
-try:
-    nltk.data.find('tokenizers/punkt')
-except Exception:
-    nltk.download('punkt', quiet=True)
-
-try:
-    nltk.data.find('tokenizers/punkt_tab')
-except Exception:
-    nltk.download('punkt_tab', quiet=True)
-
-# konlpy Okt 형태소 분석기 초기화
-okt = Okt()
-
-def generate_ox_quizzes(text: str, num_quizzes: int = 5, min_word_length: int = 2) -> list[dict]: # 퀴즈 개수 5개로 변경
-    if not text or not text.strip():
+from ..preprocess.document import LectureDocument, analyze_document
+
+# 거짓(X) 문장 하나를 만들 때 대체 명사를 찾으며 확인하는 최대 후보 수, 그중 무작위로 고를 후보 수
+OX_SUBSTITUTE_SCAN_LIMIT = 64
+OX_SUBSTITUTE_CHOICES = 5
+# 거짓(X) 퀴즈 하나당 시도할 최대 문장 수 (텍스트 길이와 무관하게 생성 시간을 제한)
+OX_MAX_ATTEMPTS_PER_FALSE_QUIZ = 50
+OX_WORD_PATTERN = re.compile(r'[가-힣a-zA-Z]+')
+# O/X 퀴즈 생성에 사용할 불용어 명사 목록 (강화된 목록)
+OX_COMMON_NOUNS_TO_EXCLUDE = {
+    "것", "수", "때", "점", "분", "이", "그", "저", "말", "부분", "경우", "위", "안", "밖", "내", "중", "등", "번", "가지", "동안", "다시", "하나", "모든", "가장", "다른", "이러한", "이것", "그것", "저것", "여기", "저기", "어디", "무엇", "누구", "언제", "어떻게", "왜", "어떤", "어느",
+    "대한", "통해", "위해", "관련", "대해", "따라", "속", "앞", "뒤", "옆", "쪽", "가운데", "사이", "정도", "현재", "미래", "과거", "오늘", "내일", "어제", "이번", "다음", "지난", "매번", "항상", "계속", "점점", "더욱", "아주", "매우", "엄청", "되게", "굉장히", "정말", "진짜", "사실", "아마", "혹시", "지금", "바로", "그냥", "막", "좀", "자", "네", "아니", "음", "어", "그", "저기", "일단", "약간", "뭐랄까", "아무튼", "글쎄", "암튼", "뭐냐", "어쨌든", "하여튼",
+    "사람", "언어", "모델", "텍스트", "단어", "함수", "파라미터", "연산", "아키텍처", "메커니즘", "기술", "분야", "혁명", "인공지능", "벡터", "정보", "교환", "과정", "훈련", "예측", "처리", "사용자", "어시스턴트", "데이터", "컴퓨터", "시리즈", "영상", "구독", "회사", "강연", "링크", "대본", "기계", "칩", "알고리즘", "구조", "의미", "맥락", "네트워크", "어텐션", "수학", "확률", "방향", "연구팀", "연구자", "절반", "오류", "내용", "마지막", "억", "년"
+}
+
+
+class NounSubstitutionIndex:
+    """
+    거짓(X) 문장용 대체 명사 색인입니다. 텍스트의 명사를 빈도순으로 정렬해 두고,
+    바꿀 명사와 빈도가 가장 가까운 명사부터 바깥쪽으로 정해진 개수만 확인하므로 명사 수와 무관하게 조회 비용이 일정합니다.
+    """
+
+    def __init__(self, noun_frequencies: Counter, excluded: set[str]):
+        self.frequencies = noun_frequencies
+        # (빈도, 명사) 순으로 정렬해 두어 같은 입력이면 항상 같은 순서
+        self._entries = sorted((count, noun) for noun, count in noun_frequencies.items() if noun not in excluded)
+        self._counts = [count for count, _ in self._entries]
+
+    def substitutes(self, word: str, sentence: str) -> list[str]:
+        # word와 빈도가 비슷하고, 원문 문장에 들어 있지 않은 명사 후보
+        target = self.frequencies.get(word, 0)
+        right = bisect.bisect_left(self._counts, target)
+        left = right - 1
+        found = []
+        for _ in range(min(OX_SUBSTITUTE_SCAN_LIMIT, len(self._entries))):
+            if right < len(self._entries) and (left < 0 or self._counts[right] - target <= target - self._counts[left]):
+                noun = self._entries[right][1]
+                right += 1
+            else:
+                noun = self._entries[left][1]
+                left -= 1
+            if noun != word and noun not in sentence:
+                found.append(noun)
+                if len(found) >= OX_SUBSTITUTE_CHOICES:
+                    break
+        return found
+
+
+def _replaceable_nouns(sentence: str, tags, min_word_length: int) -> list[str]:
+    # 문장에서 다른 명사로 바꿀 수 있는 명사 (문장에 단어 단위로 실제 등장해야 치환 결과가 원문과 달라짐)
+    nouns = []
+    for word, tag in tags:
+        if (
+            tag == 'Noun' and len(word) >= min_word_length and OX_WORD_PATTERN.fullmatch(word)
+            and word not in OX_COMMON_NOUNS_TO_EXCLUDE and word not in nouns
+            and re.search(r'\b' + re.escape(word) + r'\b', sentence)
+        ):
+            nouns.append(word)
+    return nouns
+
+
+def generate_ox_quizzes(
+    text: str,
+    num_quizzes: int = 5, # 퀴즈 개수 5개로 변경
+    min_word_length: int = 2,
+    document: LectureDocument | None = None,
+    seed: int | None = None,
+) -> list[dict]:
+    # seed를 주면 같은 입력에 대해 항상 같은 퀴즈를 생성 (벤치마크/재현용)
+    rng = random.Random(seed)
+    # document가 주어지면 이미 끝난 문장 분리/형태소 분석 결과를 그대로 사용
+    if document is None:
+        if not text or not text.strip():
+            return []
+        document = analyze_document(text)
+    if not document.sentences:
         return []
-
-    cleaned_text = re.sub(r'[^\w\s가-힣.?!,]', '', text)
-    cleaned_text = re.sub(r'\s+', ' ', cleaned_text).strip()
-
-    sentences = nltk.sent_tokenize(cleaned_text)
-    if not sentences:
+    if not document.stemmed_tags:
+        print("[OX_QuizGen] 형태소 분석 결과가 없어 퀴즈를 생성할 수 없습니다.")
         return []
 
     # 1. 물음표(?) 또는 느낌표(!)가 포함되지 않고, '~다.', '~습니다.', '~ㅂ니다.', '~이다.' 등으로 끝나는 평서문만 퀴즈 후보로 선택
     # 2. 최소 문장 길이 필터 추가 (너무 짧은 문장 제외)
-    filtered_sentences_for_ox = []
+    sentence_indices = []
     min_sentence_char_length = 15 # O/X 퀴즈 문장의 최소 길이
 
-    for s in sentences:
+    for i, s in enumerate(document.quiz_sentences):
+        if not s:
+            continue
         if '?' in s or '!' in s: # 물음표 또는 느낌표 포함 문장 제외
             print(f"DEBUG: [OX Filter] 물음표/느낌표 포함 문장 제외: {s[:50]}...")
             continue
@@ -42,107 +99,73 @@ def generate_ox_quizzes(text: str, num_quizzes: int = 5, min_word_length: int =
         # 문장 끝이 특정 평서형 어미로 끝나는지 확인 
         if re.search(r'(다|습니다|ㅂ니다|이다)\.?$', s.strip()):
             if len(s.strip()) >= min_sentence_char_length:
-                filtered_sentences_for_ox.append(s)
+                sentence_indices.append(i)
             else:
                 print(f"DEBUG: [OX Filter] 너무 짧은 평서문 제외 ({len(s.strip())}자): {s[:50]}...")
         else:
             print(f"DEBUG: [OX Filter] 평서문 어미로 끝나지 않음: {s[:50]}...")
 
-    sentences = filtered_sentences_for_ox
+    sentences = [document.quiz_sentences[i] for i in sentence_indices]
 
     if not sentences:
         print("[OX_QuizGen] O/X 퀴즈를 만들 적절한 평서문이 없습니다. O/X 퀴즈 생성 불가.")
         return []
 
-    all_nouns_in_text = []
-    for sentence in sentences:
-        tagged_tokens = okt.pos(sentence, norm=True, stem=True)
-        for word, tag in tagged_tokens:
-            if tag == 'Noun' and len(word) >= min_word_length and re.fullmatch(r'[가-힣a-zA-Z]+', word):
-                all_nouns_in_text.append(word)
+    all_nouns_in_text = [
+        word
+        for i in sentence_indices
+        for word in document.sentence_nouns[i]
+        if len(word) >= min_word_length
+    ]
     
     if len(all_nouns_in_text) < 2:
         print("[OX_QuizGen] 텍스트 내에 O/X 퀴즈를 만들 충분한 명사 후보가 없습니다.")
         return []
 
-    unique_nouns = list(set(all_nouns_in_text))
-    if len(unique_nouns) < 2:
+    noun_frequencies = Counter(all_nouns_in_text)
+    if len(noun_frequencies) < 2:
         print("[OX_QuizGen] 텍스트 내에 대체할 고유 명사가 부족합니다.")
         return []
-
-    quizzes_list = []
-    processed_sentences = set()
-
-    # O/X 퀴즈 생성에 사용할 불용어 명사 목록 (강화된 목록)
-    ox_common_nouns_to_exclude = {
-        "것", "수", "때", "점", "분", "이", "그", "저", "말", "부분", "경우", "위", "안", "밖", "내", "중", "등", "번", "가지", "동안", "다시", "하나", "모든", "가장", "다른", "이러한", "이것", "그것", "저것", "여기", "저기", "어디", "무엇", "누구", "언제", "어떻게", "왜", "어떤", "어느",
-        "대한", "통해", "위해", "관련", "대해", "따라", "속", "앞", "뒤", "옆", "쪽", "가운데", "사이", "정도", "현재", "미래", "과거", "오늘", "내일", "어제", "이번", "다음", "지난", "매번", "항상", "계속", "점점", "더욱", "아주", "매우", "엄청", "되게", "굉장히", "정말", "진짜", "사실", "아마", "혹시", "지금", "바로", "그냥", "막", "좀", "자", "네", "아니", "음", "어", "그", "저기", "일단", "약간", "뭐랄까", "아무튼", "글쎄", "암튼", "뭐냐", "어쨌든", "하여튼",
-        "사람", "언어", "모델", "텍스트", "단어", "함수", "파라미터", "연산", "아키텍처", "메커니즘", "기술", "분야", "혁명", "인공지능", "벡터", "정보", "교환", "과정", "훈련", "예측", "처리", "사용자", "어시스턴트", "데이터", "컴퓨터", "시리즈", "영상", "구독", "회사", "강연", "링크", "대본", "기계", "칩", "알고리즘", "구조", "의미", "맥락", "네트워크", "어텐션", "수학", "확률", "방향", "연구팀", "연구자", "절반", "오류", "내용", "마지막", "억", "년" 
-    }
+    substitution_index = NounSubstitutionIndex(noun_frequencies, OX_COMMON_NOUNS_TO_EXCLUDE)
 
     num_true_quizzes = num_quizzes // 2
     num_false_quizzes = num_quizzes - num_true_quizzes
 
-    true_quiz_candidates_pool = []
+    # 참(O) 퀴즈 후보
+    true_quiz_candidates_pool = list(sentences)
     false_quiz_generated = []
 
-    # 참(O) 퀴즈 후보 선정
-    for sentence in sentences:
-        if sentence not in processed_sentences:
-            true_quiz_candidates_pool.append(sentence)
-
-    # 거짓(X) 퀴즈 생성 시도 (명사 대체 방식)
-    attempts_false = 0
-    max_attempts_false = len(sentences) * 5 
-    
-    false_sentence_pool = [s for s in sentences if s not in processed_sentences]
-
-    while len(false_quiz_generated) < num_false_quizzes and attempts_false < max_attempts_false and false_sentence_pool:
-        attempts_false += 1
-        
-        candidate_sentence_for_false = random.choice(false_sentence_pool)
-        
-        tagged_tokens_orig = list(okt.pos(candidate_sentence_for_false, norm=False, stem=False, join=False))
-        
-        sentence_nouns_for_replacement = []
-        for word, tag in tagged_tokens_orig:
-            if tag == 'Noun' and len(word) >= min_word_length and re.fullmatch(r'[가-힣a-zA-Z]+', word) and word not in ox_common_nouns_to_exclude:
-                sentence_nouns_for_replacement.append(word)
-        
-        if not sentence_nouns_for_replacement:
-            continue
-
-        word_to_replace = random.choice(sentence_nouns_for_replacement)
-        
-        substitute_nouns_pool = [
-            n for n in unique_nouns 
-            if n != word_to_replace and n not in ox_common_nouns_to_exclude and n not in candidate_sentence_for_false
-        ]
-        
-        if not substitute_nouns_pool:
-            continue
-
-        substitute_word = random.choice(substitute_nouns_pool)
-        
-        # 원본 문장에서 word_to_replace를 substitute_word로 대체하여 거짓 문장 생성
-        false_question_replaced = re.sub(r'\b' + re.escape(word_to_replace) + r'\b', substitute_word, candidate_sentence_for_false, 1)
-        
-        if false_question_replaced.strip() == candidate_sentence_for_false.strip():
-            continue
-
-        false_quiz_generated.append({
-            "type": "O/X",
-            "question": false_question_replaced.strip(),
-            "answer": "X"
-        })
-        processed_sentences.add(candidate_sentence_for_false)
-        if candidate_sentence_for_false in false_sentence_pool:
-            false_sentence_pool.remove(candidate_sentence_for_false)
+    # 거짓(X) 퀴즈 생성 (명사 대체 방식). 문장 순서를 한 번 섞고 문장당 최대 하나씩, 정해진 수의 문장만 시도
+    false_sentence_pool = list({document.quiz_sentences[i]: i for i in sentence_indices}.items())
+    rng.shuffle(false_sentence_pool)
+    max_sentences_to_try = num_false_quizzes * OX_MAX_ATTEMPTS_PER_FALSE_QUIZ
 
+    for candidate_sentence_for_false, i in false_sentence_pool[:max_sentences_to_try]:
+        if len(false_quiz_generated) >= num_false_quizzes:
+            break
+        nouns_to_try = _replaceable_nouns(candidate_sentence_for_false, document.original_tags[i], min_word_length)
+        rng.shuffle(nouns_to_try)
+
+        for word_to_replace in nouns_to_try:
+            substitute_nouns_pool = substitution_index.substitutes(word_to_replace, candidate_sentence_for_false)
+            if not substitute_nouns_pool:
+                continue
+
+            substitute_word = rng.choice(substitute_nouns_pool)
+            # 원본 문장에서 word_to_replace를 substitute_word로 대체하여 거짓 문장 생성
+            false_question_replaced = re.sub(
+                r'\b' + re.escape(word_to_replace) + r'\b', substitute_word, candidate_sentence_for_false, 1
+            )
+            false_quiz_generated.append({
+                "type": "O/X",
+                "question": false_question_replaced.strip(),
+                "answer": "X"
+            })
+            break
 
     # 최종 퀴즈 리스트 구성 (참 퀴즈와 거짓 퀴즈를 섞어서)
-    random.shuffle(true_quiz_candidates_pool)
-    random.shuffle(false_quiz_generated)
+    rng.shuffle(true_quiz_candidates_pool)
+    rng.shuffle(false_quiz_generated)
 
     final_quizzes_output = []
     idx_true = 0
@@ -0,0 +1,241 @@
+# 여러 강의 텍스트의 퀴즈를 한 번에 다시 만드는 배치 도구 (제외 명사 목록 등을 조정한 뒤 강의 전체를 재생성할 때 사용)
+# 입력은 .txt 파일이 들어 있는 디렉토리 또는 {"id": ..., "text": ...} 형식의 JSONL이고,
+# 결과는 강의 하나가 끝날 때마다 JSONL 한 줄로 바로 기록
+# 실행: backend 디렉토리에서 python -m app.quiz_list.batch <디렉토리|JSONL> -o quizzes.jsonl
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ALL_COMPLETED, FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Iterable, Iterator
+
+from ..preprocess.document import analyze_document
+from ..preprocess.morph_analyzer import morph_analyzer
+from ..preprocess.nlp_resources import get_okt
+from ..preprocess.text_utils import preprocess_text_for_summary
+from .OX_quiz import generate_ox_quizzes
+from .blank_quiz import generate_blank_quizzes
+
+# 워커 프로세스 수 (프로세스마다 Okt JVM을 따로 띄우므로 메모리에 맞게 설정)
+QUIZ_BATCH_WORKERS = int(os.getenv("QUIZ_BATCH_WORKERS", str(os.cpu_count() or 1)))
+NUM_BLANK_QUIZZES = 5
+NUM_OX_QUIZZES = 5
+
+
+def iter_transcripts(source: str) -> Iterator[tuple[str, str | None, str | None]]:
+    """
+    (강의 ID, 텍스트, 오류)를 하나씩 읽어옵니다. 디렉토리면 .txt 파일(파일 이름이 ID), 아니면 JSONL로 읽습니다.
+    읽을 수 없는 입력(깨진 JSONL 줄 등)은 배치를 멈추지 않고 텍스트 대신 오류 메시지를 담아 돌려줍니다.
+    """
+    if os.path.isdir(source):
+        for file_name in sorted(os.listdir(source)):
+            if not file_name.endswith(".txt"):
+                continue
+            transcript_id = os.path.splitext(file_name)[0]
+            try:
+                with open(os.path.join(source, file_name), "r", encoding="utf-8") as f:
+                    yield transcript_id, f.read(), None
+            except (OSError, UnicodeDecodeError) as e:
+                yield transcript_id, None, f"입력 파일을 읽을 수 없습니다: {type(e).__name__}: {e}"
+        return
+
+    with open(source, "r", encoding="utf-8", errors="replace") as f:
+        for line_number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield f"line-{line_number}", None, f"JSONL 형식 오류: {e}"
+                continue
+            if not isinstance(record, dict):
+                yield f"line-{line_number}", None, "JSONL 줄이 {\"id\", \"text\"} 객체가 아닙니다."
+                continue
+            transcript_id = str(record.get("id", f"line-{line_number}"))
+            text = record.get("text", "")
+            if not isinstance(text, str):
+                yield transcript_id, None, "text 필드가 문자열이 아닙니다."
+                continue
+            yield transcript_id, text, None
+
+
+def _init_quiz_worker():
+    # 첫 작업이 JVM 기동 시간을 떠안지 않도록 워커가 뜰 때 Okt를 미리 로드하고 한 번 태깅해 둠
+    if get_okt() is None:
+        print(f"[QuizBatch] 워커 {os.getpid()}: 형태소 분석기를 로드하지 못했습니다.")
+        return
+    morph_analyzer.pos("워커 준비용 문장입니다.")
+
+
+def _generate_quizzes_for_transcript(
+    transcript_id: str,
+    text: str,
+    num_blank_quizzes: int,
+    num_ox_quizzes: int,
+    seed: int | None,
+    verbose: bool,
+) -> dict:
+    start_time = time.perf_counter()
+    # 퀴즈 생성기의 문장별 디버그 출력은 강의 수백 개에서는 읽을 수 없으므로 기본으로 버림
+    output = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(io.StringIO())
+    try:
+        with output:
+            # 서버 파이프라인과 같은 순서: 전처리 → 문서 분석(한 번) → 두 퀴즈 생성기가 공유
+            document = analyze_document(preprocess_text_for_summary(text))
+            blank_quizzes = generate_blank_quizzes(
+                document.text, num_quizzes=num_blank_quizzes, document=document
+            )
+            ox_quizzes = generate_ox_quizzes(
+                document.text, num_quizzes=num_ox_quizzes, document=document, seed=seed
+            )
+    except Exception as e:
+        return {"id": transcript_id, "error": f"{type(e).__name__}: {e}"}
+    return {
+        "id": transcript_id,
+        "quizzes": blank_quizzes + ox_quizzes,
+        "seconds": round(time.perf_counter() - start_time, 3),
+    }
+
+
+def _new_quiz_pool(workers: int) -> ProcessPoolExecutor:
+    return ProcessPoolExecutor(
+        max_workers=max(1, workers),
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_quiz_worker,
+    )
+
+
+def _future_result(future: Future, transcript_id: str) -> dict:
+    # 결과를 돌려받지 못한 경우도 해당 강의의 실패로만 기록
+    try:
+        return future.result()
+    except BrokenProcessPool as e:
+        return {"id": transcript_id, "error": f"워커 프로세스가 비정상 종료되었습니다: {e}"}
+    except Exception as e:
+        return {"id": transcript_id, "error": f"{type(e).__name__}: {e}"}
+
+
+def iter_batch_quizzes(
+    transcripts: Iterable[tuple[str, str | None, str | None]],
+    workers: int = QUIZ_BATCH_WORKERS,
+    num_blank_quizzes: int = NUM_BLANK_QUIZZES,
+    num_ox_quizzes: int = NUM_OX_QUIZZES,
+    seed: int | None = None,
+    verbose: bool = False,
+) -> Iterator[dict]:
+    """
+    강의마다 빈칸/O/X 퀴즈를 만들어 끝나는 순서대로 돌려줍니다.
+    형태소 분석(JVM 호출)은 프로세스 하나에서 직렬화되므로 프로세스 풀로 나눠야 코어 수만큼 처리량이 늘어납니다.
+    입력은 필요한 만큼만 읽어 들이며, 동시에 대기하는 작업은 워커 수의 두 배로 제한합니다.
+    입력 오류나 워커 비정상 종료는 해당 강의의 {"id", "error"} 결과로 돌려주고 나머지 강의는 계속 처리합니다.
+    """
+    max_pending = max(1, workers) * 2
+    executor = _new_quiz_pool(workers)
+    pending: dict[Future, tuple[str, str]] = {}  # 대기 중인 작업 → (강의 ID, 텍스트)
+
+    def submit(transcript_id: str, text: str) -> Future:
+        return executor.submit(
+            _generate_quizzes_for_transcript,
+            transcript_id, text, num_blank_quizzes, num_ox_quizzes, seed, verbose,
+        )
+
+    def restart_pool():
+        nonlocal executor
+        executor.shutdown(wait=False, cancel_futures=True)
+        executor = _new_quiz_pool(workers)
+
+    def collect(return_when: str, broken: bool = False) -> Iterator[dict]:
+        done, _ = wait(pending, return_when=return_when)
+        suspects = []
+        for future in done:
+            item = pending.pop(future)
+            if isinstance(future.exception(), BrokenProcessPool):
+                suspects.append(item)
+            else:
+                yield _future_result(future, item[0])
+        if not (broken or suspects):
+            return
+        # 풀이 깨지면 같이 돌던 작업도 모두 실패하므로, 남은 작업까지 모아 새 풀에서 하나씩 다시 실행해
+        # 실제로 워커를 죽인 강의만 실패로 기록
+        done, _ = wait(pending, return_when=ALL_COMPLETED)
+        suspects.extend(pending.pop(future) for future in done)
+        print(f"[QuizBatch] 워커 프로세스가 비정상 종료되어 프로세스 풀을 다시 만들고 강의 {len(suspects)}개를 하나씩 다시 처리합니다.")
+        restart_pool()
+        for transcript_id, text in suspects:
+            future = submit(transcript_id, text)
+            wait([future])
+            yield _future_result(future, transcript_id)
+            if isinstance(future.exception(), BrokenProcessPool):
+                restart_pool()
+
+    try:
+        for transcript_id, text, error in transcripts:
+            if error is not None:
+                yield {"id": transcript_id, "error": error}
+                continue
+            if len(pending) >= max_pending:
+                yield from collect(FIRST_COMPLETED)
+            try:
+                future = submit(transcript_id, text)
+            except BrokenProcessPool:
+                # 아직 결과를 꺼내지 않은 작업에서 풀이 깨진 경우: 정리 후 새 풀에 다시 제출
+                yield from collect(ALL_COMPLETED, broken=True)
+                future = submit(transcript_id, text)
+            pending[future] = (transcript_id, text)
+        while pending:
+            yield from collect(FIRST_COMPLETED)
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def generate_quizzes_batch(source: str, output_path: str, **options) -> dict:
+    """source(디렉토리 또는 JSONL)의 모든 강의 퀴즈를 output_path에 JSONL로 기록하고 처리 통계를 반환합니다."""
+    start_time = time.perf_counter()
+    succeeded = failed = 0
+    with open(output_path, "w", encoding="utf-8") as out:
+        for result in iter_batch_quizzes(iter_transcripts(source), **options):
+            out.write(json.dumps(result, ensure_ascii=False) + "\n")
+            out.flush()
+            if "error" in result:
+                failed += 1
+                print(f"[QuizBatch] {result['id']} 실패: {result['error']}")
+            else:
+                succeeded += 1
+    elapsed = time.perf_counter() - start_time
+    print(f"[QuizBatch] 완료: 성공 {succeeded}개, 실패 {failed}개, {elapsed:.1f}초")
+    return {"succeeded": succeeded, "failed": failed, "seconds": elapsed}
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="여러 강의 텍스트의 빈칸/O/X 퀴즈를 한 번에 생성합니다.")
+    parser.add_argument("source", help=".txt 파일이 들어 있는 디렉토리 또는 {\"id\", \"text\"} JSONL 파일")
+    parser.add_argument("-o", "--output", required=True, help="결과를 기록할 JSONL 파일")
+    parser.add_argument("-w", "--workers", type=int, default=QUIZ_BATCH_WORKERS, help="워커 프로세스 수")
+    parser.add_argument("--num-blank", type=int, default=NUM_BLANK_QUIZZES, help="강의당 빈칸 퀴즈 수")
+    parser.add_argument("--num-ox", type=int, default=NUM_OX_QUIZZES, help="강의당 O/X 퀴즈 수")
+    parser.add_argument("--seed", type=int, default=None, help="O/X 퀴즈 생성 시드 (재현용)")
+    parser.add_argument("-v", "--verbose", action="store_true", help="퀴즈 생성기의 디버그 출력 표시")
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.source):
+        print(f"[QuizBatch] 입력을 찾을 수 없습니다: {args.source}")
+        return 1
+    stats = generate_quizzes_batch(
+        args.source,
+        args.output,
+        workers=args.workers,
+        num_blank_quizzes=args.num_blank,
+        num_ox_quizzes=args.num_ox,
+        seed=args.seed,
+        verbose=args.verbose,
+    )
+    return 1 if stats["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,188 +1,168 @@
+import heapq
 import re
-import random
-import nltk
-from konlpy.tag import Okt
-from collections import Counter
-
-try:
-    nltk.data.find('tokenizers/punkt')
-except Exception:
-    nltk.download('punkt', quiet=True)
-
-try:
-    nltk.data.find('tokenizers/punkt_tab')
-except Exception:
-    nltk.download('punkt_tab', quiet=True)
-
-okt = Okt()
-
-def generate_blank_quizzes(text: str, num_quizzes: int = 3, min_word_length: int = 2) -> list[dict]:
-    if not text or not text.strip():
-        return []
-
-    cleaned_text = re.sub(r'[^\w\s가-힣.?!,]', '', text)
-    cleaned_text = re.sub(r'\s+', ' ', cleaned_text).strip()
-
-    sentences = nltk.sent_tokenize(cleaned_text)
-    if not sentences:
-        return []
-
-    # 물음표가 포함된 문장은 퀴즈 후보에서 제외
-    filtered_sentences_no_questions = []
-    for s in sentences:
-        if '?' in s:
-            print(f"[QuizGen Filter] 물음표 포함 문장 제외: {s[:50]}...")
-            continue
-        filtered_sentences_no_questions.append(s)
-    sentences = filtered_sentences_no_questions
-
-    if not sentences: # 필터링 후 문장이 없으면 퀴즈 생성 불가
-        print("[QuizGen] 물음표 문장 필터링 후 남은 문장이 없습니다.")
-        return []
-
-    all_noun_candidates = []
-    for sentence in sentences:
-        tagged_tokens = okt.pos(sentence, norm=True, stem=True)
-        for word, tag in tagged_tokens:
-            if tag == 'Noun' and len(word) >= min_word_length and re.fullmatch(r'[가-힣a-zA-Z]+', word):
-                all_noun_candidates.append(word)
-
-    word_frequencies = Counter(all_noun_candidates)
-
-    quiz_candidates_with_scores = []
-    processed_quiz_pairs = set()
-
-    # 퀴즈로 출제하기에 적절하지 않은, 너무 흔하거나 의미가 약한 명사들 (강화된 목록)
-    common_nouns_to_exclude = {
-        "것", "수", "때", "점", "분", "이", "그", "저", "곳", "말", "부분", "경우", "위", "아래", "안", "밖", "내", "외", "중", "등", "번", "가지", "동안", "다시", "하나", "모든", "가장", "다른", "이러한", "이것", "그것", "저것", "여기", "저기", "어디", "무엇", "누구", "언제", "어떻게", "왜", "어떤", "어느",
-        "대한", "통해", "위해", "관련", "대해", "따라", "속", "앞", "뒤", "옆", "쪽", "가운데", "사이", "정도", "현재", "미래", "과거", "오늘", "내일", "어제", "이번", "다음", "지난", "매번", "항상", "계속", "점점", "더욱", "아주", "매우", "엄청", "되게", "굉장히", "정말", "진짜", "사실", "아마", "혹시", "지금", "바로", "그냥", "막", "좀", "자", "네", "아니", "음", "어", "그", "저기", "일단", "약간", "뭐랄까", "아무튼", "글쎄", "암튼", "뭐냐", "어쨌든", "하여튼",
-        "대본", "기계", "단어", "함수", "모델", "텍스트", "대화", "확률", "훈련", "파라미터", "연산", "칩", "알고리즘", "구조", "정보", "의미", "맥락", "네트워크", "어텐션", "기술", "분야", "혁명", "인공지능", "학습", "예측", "처리", "사용자", "어시스턴트", "데이터", "컴퓨터", "시리즈", "영상", "구독", "회사", "강연", "링크"
-    }
-
-    for sentence in sentences:
-        tokens_with_original_pos = list(okt.pos(sentence, norm=False, stem=False, join=False))
-        tagged_tokens_stemmed = list(okt.pos(sentence, norm=True, stem=True))
-        
-        token_char_spans = []
-        current_offset = 0
-        for token_word, _ in tokens_with_original_pos:
-            start_idx = sentence.find(token_word, current_offset)
-            if start_idx == -1: 
-                start_idx = current_offset 
-            end_idx = start_idx + len(token_word)
-            token_char_spans.append((start_idx, end_idx))
-            current_offset = end_idx 
-            temp_offset = end_idx
-            while temp_offset < len(sentence) and sentence[temp_offset].isspace():
-                temp_offset += 1
-            current_offset = temp_offset
-
-        for j, (word_orig, tag_orig) in enumerate(tokens_with_original_pos):
-            if j >= len(tagged_tokens_stemmed):
+import threading
+from dataclasses import dataclass
+
+from ..preprocess.document import LectureDocument, analyze_document
+
+
+def _compute_token_char_spans(sentence: str, tokens) -> list[tuple[int, int]]:
+    # 원형 토큰이 문장 안에서 차지하는 (시작, 끝) 문자 위치
+    token_char_spans = []
+    current_offset = 0
+    for token_word, _ in tokens:
+        start_idx = sentence.find(token_word, current_offset)
+        if start_idx == -1: 
+            start_idx = current_offset 
+        end_idx = start_idx + len(token_word)
+        token_char_spans.append((start_idx, end_idx))
+        current_offset = end_idx
+        while current_offset < len(sentence) and sentence[current_offset].isspace():
+            current_offset += 1
+    return token_char_spans
+
+# 퀴즈로 출제하기에 적절하지 않은, 너무 흔하거나 의미가 약한 명사들 (강화된 목록)
+COMMON_NOUNS_TO_EXCLUDE = {
+    "것", "수", "때", "점", "분", "이", "그", "저", "곳", "말", "부분", "경우", "위", "아래", "안", "밖", "내", "외", "중", "등", "번", "가지", "동안", "다시", "하나", "모든", "가장", "다른", "이러한", "이것", "그것", "저것", "여기", "저기", "어디", "무엇", "누구", "언제", "어떻게", "왜", "어떤", "어느",
+    "대한", "통해", "위해", "관련", "대해", "따라", "속", "앞", "뒤", "옆", "쪽", "가운데", "사이", "정도", "현재", "미래", "과거", "오늘", "내일", "어제", "이번", "다음", "지난", "매번", "항상", "계속", "점점", "더욱", "아주", "매우", "엄청", "되게", "굉장히", "정말", "진짜", "사실", "아마", "혹시", "지금", "바로", "그냥", "막", "좀", "자", "네", "아니", "음", "어", "그", "저기", "일단", "약간", "뭐랄까", "아무튼", "글쎄", "암튼", "뭐냐", "어쨌든", "하여튼",
+    "대본", "기계", "단어", "함수", "모델", "텍스트", "대화", "확률", "훈련", "파라미터", "연산", "칩", "알고리즘", "구조", "정보", "의미", "맥락", "네트워크", "어텐션", "기술", "분야", "혁명", "인공지능", "학습", "예측", "처리", "사용자", "어시스턴트", "데이터", "컴퓨터", "시리즈", "영상", "구독", "회사", "강연", "링크"
+}
+# 명사 바로 뒤에 오면 "명사+하다" 같은 복합 표현으로 보고 빈칸 후보에서 제외하는 토큰
+COMPOUND_FOLLOWING_TOKENS = {'하다', '되다', '이다', '시키다', '받다', '주다', '하고', '되어', '되는', '된', '될', '입니다', '있습니다', '있어', '있는'}
+BLANK_WORD_PATTERN = re.compile(r'[가-힣a-zA-Z]+')
+JOSA_PLACEHOLDERS = {"을": "을/를", "를": "을/를", "이": "이/가", "가": "이/가", "은": "은/는", "는": "은/는"}
+
+
+@dataclass(frozen=True)
+class BlankPosting:
+    """명사가 등장한 한 위치. 빈칸으로 바꿀 (시작, 끝) 문자 위치는 바로 붙은 조사까지 포함해 미리 계산해 둡니다."""
+    sentence_idx: int   # 후보 문장 목록 안에서의 순서
+    token_idx: int
+    start: int
+    end: int
+    josa: str
+
+
+class BlankQuizIndex:
+    """
+    빈칸 퀴즈 후보 색인입니다. 문장/형태소 분석 결과를 한 번 훑어 명사 → 등장 위치(posting) 목록을 만들고,
+    명사 점수(빈도 * 0.8 + 길이)를 힙에 넣어 둡니다. next_batch()는 힙에서 필요한 개수만 꺼내므로
+    후보 전체를 정렬하지 않고, 같은 색인으로 다시 분석하지 않고 다음 묶음의 퀴즈를 계속 만들 수 있습니다.
+    """
+
+    def __init__(self, document: LectureDocument, min_word_length: int = 2):
+        self.sentences: list[str] = []
+        self.postings: dict[str, list[BlankPosting]] = {}
+        self.scores: dict[str, float] = {}
+        self._heap: list[tuple[float, int, int, str]] = []
+        self._lock = threading.Lock()
+
+        # 물음표가 포함된 문장은 퀴즈 후보에서 제외
+        sentence_indices = []
+        for i, s in enumerate(document.quiz_sentences):
+            if not s:
                 continue
-
-            word_stemmed, tag_stemmed = tagged_tokens_stemmed[j]
-
-            if tag_stemmed == 'Noun' and len(word_stemmed) >= min_word_length and re.fullmatch(r'[가-힣a-zA-Z]+', word_stemmed):
-                if word_stemmed in common_nouns_to_exclude:
+            if '?' in s:
+                print(f"[QuizGen Filter] 물음표 포함 문장 제외: {s[:50]}...")
+                continue
+            sentence_indices.append(i)
+        if not sentence_indices:
+            return
+
+        word_frequencies = document.noun_counts(sentence_indices, min_word_length)
+        seen_pairs = set()
+        for sentence_idx, document_idx in enumerate(sentence_indices):
+            sentence = document.quiz_sentences[document_idx]
+            self.sentences.append(sentence)
+            original_tags = document.original_tags[document_idx]
+            stemmed_tags = document.stemmed_tags[document_idx]
+            token_spans = None
+
+            for j, (word_stemmed, tag_stemmed) in enumerate(stemmed_tags[:len(original_tags)]):
+                if tag_stemmed != 'Noun' or len(word_stemmed) < min_word_length:
                     continue
-
-                is_compound_form = False
-                if j + 1 < len(tagged_tokens_stemmed):
-                    next_token_stemmed, next_tag_stemmed = tagged_tokens_stemmed[j+1]
-                    if next_tag_stemmed in ['Verb', 'Adjective'] or next_token_stemmed in ['하다', '되다', '이다', '시키다', '받다', '주다', '하고', '되어', '되는', '된', '될', '입니다', '있습니다', '있어', '있는']:
-                        is_compound_form = True
-                
-                if is_compound_form:
+                if word_stemmed in COMMON_NOUNS_TO_EXCLUDE or not BLANK_WORD_PATTERN.fullmatch(word_stemmed):
                     continue
-
-                quiz_pair_key = (sentence, word_stemmed)
-                if quiz_pair_key in processed_quiz_pairs:
+                if j + 1 < len(stemmed_tags):
+                    next_token_stemmed, next_tag_stemmed = stemmed_tags[j + 1]
+                    if next_tag_stemmed in ('Verb', 'Adjective') or next_token_stemmed in COMPOUND_FOLLOWING_TOKENS:
+                        continue
+                if (sentence, word_stemmed) in seen_pairs:
                     continue
-                processed_quiz_pairs.add(quiz_pair_key)
-
-                score = word_frequencies[word_stemmed] * 0.8 + len(word_stemmed) * 1.0
-                quiz_candidates_with_scores.append((score, sentence, word_stemmed, j))
-
-    quiz_candidates_with_scores.sort(key=lambda x: x[0], reverse=True)
-
-    quizzes_list = []
-    selected_words_for_blank = set()
-
-    for score, original_sentence, word_to_blank_stemmed, blank_token_idx in quiz_candidates_with_scores:
-        if len(quizzes_list) >= num_quizzes:
+                seen_pairs.add((sentence, word_stemmed))
+
+                if token_spans is None:
+                    token_spans = _compute_token_char_spans(sentence, original_tags)
+                start, end, josa = _blank_span_with_josa(original_tags, token_spans, j)
+                posting = BlankPosting(sentence_idx, j, start, end, josa)
+                if word_stemmed not in self.postings:
+                    self.postings[word_stemmed] = []
+                    self.scores[word_stemmed] = word_frequencies[word_stemmed] * 0.8 + len(word_stemmed) * 1.0
+                    # 점수가 같으면 먼저 등장한 명사가 먼저 나오도록 첫 등장 위치를 함께 넣음
+                    self._heap.append((-self.scores[word_stemmed], sentence_idx, j, word_stemmed))
+                self.postings[word_stemmed].append(posting)
+
+        heapq.heapify(self._heap)
+
+    def remaining(self) -> int:
+        return len(self._heap)
+
+    def next_batch(self, num_quizzes: int) -> list[dict]:
+        # 아직 출제하지 않은 명사 중 점수가 높은 순으로 num_quizzes개 (명사당 첫 등장 문장으로 출제)
+        with self._lock:
+            words = [heapq.heappop(self._heap)[3] for _ in range(min(num_quizzes, len(self._heap)))]
+        return [self._make_quiz(word, self.postings[word][0]) for word in words]
+
+    def _make_quiz(self, word: str, posting: BlankPosting) -> dict:
+        sentence = self.sentences[posting.sentence_idx]
+        josa_placeholder = JOSA_PLACEHOLDERS.get(posting.josa, posting.josa)
+        question_text = sentence[:posting.start] + '_______' + josa_placeholder + sentence[posting.end:]
+        return {
+            "type": "빈칸",
+            "question": question_text.strip(),
+            "answer": word,
+        }
+
+
+def _blank_span_with_josa(original_tags, token_spans, token_idx: int) -> tuple[int, int, str]:
+    # 명사 토큰의 문자 위치에 바로 붙어 있는 조사까지 빈칸 범위에 포함
+    start, end = token_spans[token_idx]
+    josa = ""
+    for next_k in range(token_idx + 1, len(original_tags)):
+        next_token_word, next_token_tag = original_tags[next_k]
+        if next_token_tag != 'Josa' or token_spans[next_k][0] != end:
             break
-        
-        if word_to_blank_stemmed in selected_words_for_blank:
-            continue
-        
-        tokens_with_original_pos = list(okt.pos(original_sentence, norm=False, stem=False, join=False))
-        
-        token_spans_in_current_sentence = []
-        current_offset_in_sentence = 0
-        for token_word, _ in tokens_with_original_pos:
-            start_idx = original_sentence.find(token_word, current_offset_in_sentence)
-            if start_idx == -1:
-                start_idx = current_offset_in_sentence
-            end_idx = start_idx + len(token_word)
-            token_spans_in_current_sentence.append((start_idx, end_idx))
-            current_offset_in_sentence = end_idx
-            while current_offset_in_sentence < len(original_sentence) and original_sentence[current_offset_in_sentence].isspace():
-                current_offset_in_sentence += 1
-
-
-        blank_start_char_idx = -1
-        blank_end_char_idx = -1
-        original_josa_text = ""
-
-        if blank_token_idx < len(token_spans_in_current_sentence):
-            blank_start_char_idx = token_spans_in_current_sentence[blank_token_idx][0]
-            blank_end_char_idx = token_spans_in_current_sentence[blank_token_idx][1]
-
-            for next_k in range(blank_token_idx + 1, len(tokens_with_original_pos)):
-                next_token_word, next_token_tag = tokens_with_original_pos[next_k]
-                
-                if next_token_tag == 'Josa':
-                    next_actual_start = token_spans_in_current_sentence[next_k][0]
-                    if next_actual_start == blank_end_char_idx:
-                        original_josa_text = next_token_word
-                        blank_end_char_idx = token_spans_in_current_sentence[next_k][1]
-                    else:
-                        break
-                else:
-                    break
-        
-        if blank_start_char_idx != -1:
-            generic_josa_placeholder = ""
-            if original_josa_text:
-                if original_josa_text in ["을", "를"]:
-                    generic_josa_placeholder = "을/를"
-                elif original_josa_text in ["이", "가"]:
-                    generic_josa_placeholder = "이/가"
-                elif original_josa_text in ["은", "는"]:
-                    generic_josa_placeholder = "은/는"
-                else:
-                    generic_josa_placeholder = original_josa_text
-            
-            question_text = original_sentence[:blank_start_char_idx] + '_______' + generic_josa_placeholder + original_sentence[blank_end_char_idx:]
-            
-            quizzes_list.append({
-                "type": "빈칸",
-                "question": question_text.strip(),
-                "answer": word_to_blank_stemmed
-            })
-            selected_words_for_blank.add(word_to_blank_stemmed)
-        else:
-            if re.search(r'\b' + re.escape(word_to_blank_stemmed) + r'\b', original_sentence):
-                question_text = re.sub(r'\b' + re.escape(word_to_blank_stemmed) + r'\b', '_______', original_sentence, 1)
-                quizzes_list.append({
-                    "type": "빈칸",
-                    "question": question_text.strip(),
-                    "answer": word_to_blank_stemmed
-                })
-                selected_words_for_blank.add(word_to_blank_stemmed)
-    
+        josa = next_token_word
+        end = token_spans[next_k][1]
+    return start, end, josa
+
+
+def generate_blank_quizzes(
+    text: str,
+    num_quizzes: int = 3,
+    min_word_length: int = 2,
+    document: LectureDocument | None = None,
+    index: BlankQuizIndex | None = None,
+) -> list[dict]:
+    # index가 주어지면 이전 묶음 이후의 후보로 이어서 출제 (재분석 없음)
+    if index is None:
+        # document가 주어지면 이미 끝난 문장 분리/형태소 분석 결과를 그대로 사용
+        if document is None:
+            if not text or not text.strip():
+                return []
+            document = analyze_document(text)
+        if not document.sentences:
+            return []
+        if not document.stemmed_tags:
+            print("[QuizGen] 형태소 분석 결과가 없어 퀴즈를 생성할 수 없습니다.")
+            return []
+        index = BlankQuizIndex(document, min_word_length)
+        if not index.sentences:  # 필터링 후 문장이 없으면 퀴즈 생성 불가
+            print("[QuizGen] 물음표 문장 필터링 후 남은 문장이 없습니다.")
+            return []
+
+    quizzes_list = index.next_batch(num_quizzes)
     if len(quizzes_list) < num_quizzes:
         print(f"[QuizGen] 퀴즈 후보가 부족합니다. (현재 {len(quizzes_list)}개, 요청 {num_quizzes}개)")
-        
-    return quizzes_list
\ No newline at end of file
+
+    return quizzes_list
@@ -1,7 +1,11 @@
 from pydub import AudioSegment
+import numpy as np
 import os
 
-def split_audio(input_path: str, output_dir: str, chunk_length_ms: int = 60000) -> list:
+def split_audio(input_path: str, output_dir: str, chunk_length_ms: int = 60000, mode: str = "fixed") -> list:
+    if mode == "silence":
+        return split_audio_on_silence(input_path, output_dir, target_chunk_ms=chunk_length_ms)
+
     audio = AudioSegment.from_file(input_path)
     os.makedirs(output_dir, exist_ok=True)
 
@@ -13,3 +17,148 @@ def split_audio(input_path: str, output_dir: str, chunk_length_ms: int = 60000)
         chunks.append(chunk_path)
         print(f"[Splitter] Saved chunk: {chunk_path}")
     return chunks
+
+def compute_frame_dbfs(audio: AudioSegment, frame_ms: int = 30) -> np.ndarray:
+    # 전체 샘플을 (프레임 수, 프레임당 샘플 수) 행렬로 바꿔 프레임별 RMS 에너지를 한 번에 계산
+    samples = np.array(audio.get_array_of_samples(), dtype=np.float32)
+    if audio.channels > 1:
+        samples = samples.reshape(-1, audio.channels).mean(axis=1)
+
+    samples_per_frame = max(1, int(audio.frame_rate * frame_ms / 1000))
+    num_frames = -(-len(samples) // samples_per_frame)
+    if num_frames == 0:
+        return np.array([], dtype=np.float32)
+    padded = np.zeros(num_frames * samples_per_frame, dtype=np.float32)
+    padded[:len(samples)] = samples
+    frames = padded.reshape(num_frames, samples_per_frame)
+
+    rms = np.sqrt(np.mean(frames * frames, axis=1))
+    max_amplitude = float(1 << (8 * audio.sample_width - 1))
+    return 20 * np.log10(np.maximum(rms, 1e-10) / max_amplitude)
+
+def find_silence_segments(
+    is_silent: np.ndarray,
+    target_frames: int,
+    min_frames: int,
+    max_frames: int,
+) -> list[tuple[int, int]]:
+    # [시작+min, 시작+max] 구간 안에서 목표 길이에 가장 가까운 무음 프레임을 경계로 선택
+    num_frames = len(is_silent)
+    silent_indices = np.flatnonzero(is_silent)
+    segments = []
+    start = 0
+    while num_frames - start > max_frames:
+        lo, hi = np.searchsorted(silent_indices, [start + min_frames, start + max_frames + 1])
+        window = silent_indices[lo:hi]
+        if window.size:
+            cut = int(window[np.argmin(np.abs(window - (start + target_frames)))])
+        else:
+            cut = start + max_frames  # 무음이 없으면 최대 길이에서 자름
+        segments.append((start, cut))
+        start = cut
+    if start < num_frames:
+        segments.append((start, num_frames))
+    return segments
+
+def find_speech_ranges(is_silent: np.ndarray, min_silence_frames: int, keep_frames: int) -> list[tuple[int, int]]:
+    # min_silence_frames 이상 이어지는 무음만 잘라내고(앞뒤 keep_frames는 남김), 짧은 쉼은 말소리 구간 안에 그대로 둠
+    padded = np.concatenate(([False], ~is_silent, [False]))
+    edges = np.flatnonzero(np.diff(padded.astype(np.int8)))
+    voiced_starts, voiced_ends = edges[0::2], edges[1::2]
+    if voiced_starts.size == 0:
+        return []
+    # 말소리 구간 사이의 무음이 충분히 길 때만 경계로 삼음
+    gaps = voiced_starts[1:] - voiced_ends[:-1]
+    breaks = np.flatnonzero(gaps >= min_silence_frames)
+    range_starts = np.concatenate(([voiced_starts[0]], voiced_starts[breaks + 1]))
+    range_ends = np.concatenate((voiced_ends[breaks], [voiced_ends[-1]]))
+    num_frames = len(is_silent)
+    return [
+        (max(0, int(start) - keep_frames), min(num_frames, int(end) + keep_frames))
+        for start, end in zip(range_starts, range_ends)
+    ]
+
+def pack_speech_ranges(
+    speech_ranges: list[tuple[int, int]],
+    is_silent: np.ndarray,
+    target_frames: int,
+    min_frames: int,
+    max_frames: int,
+) -> list[list[tuple[int, int]]]:
+    # 말소리 구간을 목표 길이가 될 때까지 이어 붙여 조각 하나로 묶음 (최대 길이를 넘는 구간은 그 안의 무음에서 다시 나눔)
+    pieces = []
+    for start, end in speech_ranges:
+        for piece_start, piece_end in find_silence_segments(is_silent[start:end], target_frames, min_frames, max_frames):
+            pieces.append((start + piece_start, start + piece_end))
+
+    groups = []
+    current, current_frames = [], 0
+    for start, end in pieces:
+        if current and (current_frames >= target_frames or current_frames + (end - start) > max_frames):
+            groups.append(current)
+            current, current_frames = [], 0
+        current.append((start, end))
+        current_frames += end - start
+    if current:
+        groups.append(current)
+    return groups
+
+def split_audio_on_silence(
+    input_path: str,
+    output_dir: str,
+    target_chunk_ms: int = 60000,
+    min_chunk_ms: int = 30000,
+    max_chunk_ms: int = 90000,
+    frame_ms: int = 30,
+    silence_thresh_offset_db: float = 16.0,
+    keep_silence_ms: int = 300,
+    min_silence_ms: int = 1500,
+) -> list:
+    """
+    고정 길이 대신 말이 끊기는 지점(무음)에서 오디오를 나눕니다.
+    min_silence_ms 이상 이어지는 무음은 조각 경계든 조각 안이든 인식에 보내지 않고 잘라내며,
+    남은 말소리 구간을 목표 길이만큼 이어 붙여 조각을 만듭니다.
+    """
+    audio = AudioSegment.from_file(input_path)
+    os.makedirs(output_dir, exist_ok=True)
+
+    frame_dbfs = compute_frame_dbfs(audio, frame_ms)
+    if frame_dbfs.size == 0:
+        return []
+    # 무음 기준은 파일 전체 평균 음량 대비 상대값 (녹음 레벨 차이 흡수)
+    silence_thresh = audio.dBFS - silence_thresh_offset_db
+    if not np.isfinite(silence_thresh):
+        print(f"[Splitter] 전체가 무음인 파일입니다: {input_path}")
+        return []
+    is_silent = frame_dbfs < silence_thresh
+
+    speech_ranges = find_speech_ranges(
+        is_silent,
+        min_silence_frames=max(1, min_silence_ms // frame_ms),
+        keep_frames=keep_silence_ms // frame_ms,
+    )
+    groups = pack_speech_ranges(
+        speech_ranges,
+        is_silent,
+        target_frames=target_chunk_ms // frame_ms,
+        min_frames=min_chunk_ms // frame_ms,
+        max_frames=max_chunk_ms // frame_ms,
+    )
+
+    chunks = []
+    kept_ms = 0
+    for group in groups:
+        # 조각 안의 긴 무음을 뺀 말소리 구간들을 원본 PCM 그대로 이어 붙임
+        chunk = audio._spawn(b"".join(audio[start * frame_ms:end * frame_ms].raw_data for start, end in group))
+        chunk_path = os.path.join(output_dir, f"chunk_{len(chunks)}.wav")
+        chunk.export(chunk_path, format="wav")
+        chunks.append(chunk_path)
+        kept_ms += len(chunk)
+        print(
+            f"[Splitter] Saved chunk: {chunk_path} ({len(chunk) / 1000:.1f}s, "
+            f"{group[0][0] * frame_ms / 1000:.1f}s ~ {group[-1][1] * frame_ms / 1000:.1f}s, 구간 {len(group)}개)"
+        )
+
+    skipped_ms = max(0, len(audio) - kept_ms)
+    print(f"[Splitter] 무음 기준 분할 완료: {len(chunks)}개 조각, 인식 제외 {skipped_ms / 1000:.1f}s / 전체 {len(audio) / 1000:.1f}s")
+    return chunks
@@ -0,0 +1,48 @@
+import subprocess
+import tempfile
+from typing import Iterator
+from pydub.utils import get_encoder_name
+
+# Azure 푸시 스트림에 넣을 PCM 형식 (16kHz, 16bit, mono)
+STREAM_SAMPLE_RATE = 16000
+STREAM_BITS_PER_SAMPLE = 16
+STREAM_CHANNELS = 1
+
+
+def iter_pcm_frames(input_path: str, frame_ms: int = 100) -> Iterator[bytes]:
+    """
+    ffmpeg로 오디오를 한 번만 디코딩하면서 raw PCM 프레임을 순서대로 내보냅니다.
+    전체 AudioSegment를 메모리에 올리거나 WAV 조각을 디스크에 쓰지 않습니다.
+    """
+    bytes_per_frame = STREAM_SAMPLE_RATE * (STREAM_BITS_PER_SAMPLE // 8) * STREAM_CHANNELS * frame_ms // 1000
+    command = [
+        get_encoder_name(), "-nostdin", "-loglevel", "error",
+        "-i", input_path,
+        "-f", "s16le", "-acodec", "pcm_s16le",
+        "-ac", str(STREAM_CHANNELS), "-ar", str(STREAM_SAMPLE_RATE),
+        "-",
+    ]
+    print(f"[Stream] 스트리밍 디코딩 시작: {input_path}")
+    # stderr를 파이프로 두면 경고가 파이프 버퍼를 채운 뒤 ffmpeg가 멈추고 stdout도 더 나오지 않으므로 임시 파일로 받음
+    stderr_file = tempfile.TemporaryFile()
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=stderr_file)
+    total_bytes = 0
+    try:
+        while True:
+            frame = process.stdout.read(bytes_per_frame)
+            if not frame:
+                break
+            total_bytes += len(frame)
+            yield frame
+    finally:
+        process.stdout.close()
+        if process.poll() is None:
+            process.kill()
+        return_code = process.wait()
+        stderr_file.seek(0)
+        stderr_output = stderr_file.read().decode(errors="ignore").strip()
+        stderr_file.close()
+        if return_code != 0 and stderr_output:
+            print(f"[Stream ERROR] 디코딩 실패 ({return_code}): {stderr_output}")
+        bytes_per_second = STREAM_SAMPLE_RATE * (STREAM_BITS_PER_SAMPLE // 8) * STREAM_CHANNELS
+        print(f"[Stream] 디코딩 종료: {total_bytes / bytes_per_second:.1f}초 분량")
@@ -1,12 +1,34 @@
+import asyncio
+import hashlib
 import os
+import random
+import threading
 import time
+import wave
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Iterable
 import azure.cognitiveservices.speech as speechsdk
 from dotenv import load_dotenv
 
+from .audio_stream import STREAM_SAMPLE_RATE, STREAM_BITS_PER_SAMPLE, STREAM_CHANNELS
+from ..cache import CACHE_ROOT, DiskCache, make_cache_key
+
 load_dotenv()
 AZURE_SPEECH_KEY = os.getenv("AZURE_SPEECH_KEY")
 AZURE_SPEECH_REGION = os.getenv("AZURE_SPEECH_REGION")
 
+# 조각 단위 병렬 STT 설정 (동시에 실행할 인식 세션 수, 조각별 재시도 횟수)
+AZURE_STT_MAX_WORKERS = int(os.getenv("AZURE_STT_MAX_WORKERS", "4"))
+AZURE_STT_MAX_RETRIES = int(os.getenv("AZURE_STT_MAX_RETRIES", "2"))
+AZURE_STT_RETRY_BACKOFF_SECONDS = float(os.getenv("AZURE_STT_RETRY_BACKOFF_SECONDS", "1.0"))
+# 조각 PCM 해시 → 인식 결과 캐시 (앞부분이 잘리거나 인트로가 붙은 재업로드에서 바뀐 조각만 인식)
+STT_CHUNK_CACHE_ENABLED = os.getenv("STT_CHUNK_CACHE", "1") == "1"
+STT_CHUNK_CACHE_MAX_BYTES = int(os.getenv("STT_CHUNK_CACHE_MAX_MB", "64")) * 1024 * 1024
+STT_CHUNK_CACHE_VERSION = 2
+stt_chunk_cache = DiskCache(os.path.join(CACHE_ROOT, "stt_chunks"), STT_CHUNK_CACHE_MAX_BYTES)
+# 인식 세션 하나(조각 하나)에 허용하는 최대 시간
+AZURE_STT_SESSION_TIMEOUT_SECONDS = float(os.getenv("AZURE_STT_SESSION_TIMEOUT_SECONDS", "300"))
+
 # Speech SDK 설정 객체 초기화
 speech_config = None
 
@@ -24,8 +46,7 @@ else:
     print("     실제 발급받은 정확한 정보를 입력해주세요. API 호출이 실패합니다.")
     speech_config = None # 이 경우에도 None으로 명시
 
-# --- 이하 transcribe_audio_with_azure 함수 및 테스트 코드는 이전과 동일 ---
-def transcribe_audio_with_azure(audio_filepath: str) -> str | None:
+def _check_recognition_ready(audio_filepath: str) -> str | None:
     if speech_config is None:
         error_msg = "오류: Azure SpeechConfig가 초기화되지 않았습니다. 파일 상단의 구독 키와 지역 설정을 확인해주세요."
         print(f"[Azure Speech] {error_msg}")
@@ -35,18 +56,26 @@ def transcribe_audio_with_azure(audio_filepath: str) -> str | None:
         error_msg = f"오류: 음성 파일 경로를 찾을 수 없습니다 - {audio_filepath}"
         print(f"[Azure Speech] {error_msg}")
         return error_msg
+    return None
 
-    print(f"[Azure Speech] 음성 파일 처리 시작: {audio_filepath}")
-    
-    audio_config = speechsdk.audio.AudioConfig(filename=audio_filepath)
-    speech_recognizer = None 
-    all_recognized_text_parts = []
-    recognition_done = False 
+# 인식 결과 문자열 (캐시/재시도 판단에 사용)
+NO_MATCH_RESULT = "오류: 인식된 텍스트가 없음 (NoMatch 또는 빈 오디오 가능성)"
+RECOGNITION_CANCELED_PREFIX = "오류: 인식 세션 취소됨"
 
+def _connect_recognition_handlers(
+    speech_recognizer,
+    all_recognized_text_parts: list[str],
+    on_done: Callable[[], None],
+    on_text: Callable[[str], None] | None = None,
+    cancellation_errors: list[str] | None = None,
+):
+    # session_stopped 또는 canceled 이벤트가 오면 on_done을 호출해 세션 종료를 알림
+    # 오류로 인한 취소(요청 제한, 인증, 네트워크 등)는 cancellation_errors에 기록해 무음(NoMatch)과 구분
     def recognized_text_handler(evt: speechsdk.SpeechRecognitionEventArgs):
-        nonlocal all_recognized_text_parts
         if evt.result.reason == speechsdk.ResultReason.RecognizedSpeech:
             all_recognized_text_parts.append(evt.result.text)
+            if on_text:
+                on_text(evt.result.text)
             
         elif evt.result.reason == speechsdk.ResultReason.NoMatch:
             print("음성을 인식하지 못했습니다 (NOMATCH).")
@@ -56,60 +85,355 @@ def transcribe_audio_with_azure(audio_filepath: str) -> str | None:
             print(f"음성 인식이 취소되었습니다: {cancellation_details.reason}")
             if cancellation_details.reason == speechsdk.CancellationReason.Error:
                 print(f"취소 오류 상세: {cancellation_details.error_details}")
+                if cancellation_errors is not None:
+                    cancellation_errors.append(f"{cancellation_details.code}: {cancellation_details.error_details}")
+
+    def canceled_handler(evt: speechsdk.SpeechRecognitionEventArgs):
+        recognized_text_handler(evt)
+        on_done()
 
     def session_stopped_handler(evt: speechsdk.SessionEventArgs):
-        nonlocal recognition_done
         print(f"인식 세션 중지됨: {evt}")
-        recognition_done = True
+        on_done()
+
+    speech_recognizer.recognized.connect(recognized_text_handler)
+    speech_recognizer.session_stopped.connect(session_stopped_handler)
+    speech_recognizer.canceled.connect(canceled_handler)
+
+def _stop_recognition(speech_recognizer, recognition_done: bool):
+    if speech_recognizer and not recognition_done: 
+        print("[Azure Speech] 명시적으로 인식 중지 시도...")
+        try:
+            speech_recognizer.stop_continuous_recognition_async().get()
+        except Exception as stop_e:
+            print(f"[Azure Speech] 인식 중지 중 오류 발생: {stop_e}")
+    elif speech_recognizer and recognition_done: 
+        print("[Azure Speech] 인식 세션 정상 종료됨.")
+
+def _join_recognized_text(all_recognized_text_parts: list[str], cancellation_errors: list[str] | None = None) -> str:
+    if cancellation_errors:
+        # 중간에 오류로 끊긴 세션은 일부 텍스트가 있어도 불완전하므로 실패로 처리
+        print(f"[Azure Speech] 인식 세션이 오류로 취소되었습니다: {cancellation_errors[-1]}")
+        return f"{RECOGNITION_CANCELED_PREFIX} ({cancellation_errors[-1]})"
+    if not all_recognized_text_parts:
+        print("[Azure Speech] 최종적으로 인식된 텍스트가 없습니다.")
+        return NO_MATCH_RESULT
+
+    full_transcribed_text = " ".join(all_recognized_text_parts)
+    print("[Azure Speech] 음성 파일 처리 완료.")
+    return full_transcribed_text
+
+def transcribe_audio_with_azure(audio_filepath: str, timeout_seconds: float | None = None) -> str | None:
+    error_msg = _check_recognition_ready(audio_filepath)
+    if error_msg:
+        return error_msg
+
+    if timeout_seconds is None:
+        timeout_seconds = AZURE_STT_SESSION_TIMEOUT_SECONDS
+
+    print(f"[Azure Speech] 음성 파일 처리 시작: {audio_filepath}")
+    
+    audio_config = speechsdk.audio.AudioConfig(filename=audio_filepath)
+    speech_recognizer = None 
+    all_recognized_text_parts = []
+    cancellation_errors = []
+    # 폴링 대신 session_stopped/canceled 콜백에서 이벤트를 set하여 즉시 깨어남
+    recognition_done = threading.Event()
 
     try:
         speech_recognizer = speechsdk.SpeechRecognizer(speech_config=speech_config, audio_config=audio_config)
-        speech_recognizer.recognized.connect(recognized_text_handler)
-        speech_recognizer.session_stopped.connect(session_stopped_handler)
-        speech_recognizer.canceled.connect(recognized_text_handler) 
+        _connect_recognition_handlers(
+            speech_recognizer, all_recognized_text_parts, recognition_done.set, cancellation_errors=cancellation_errors
+        )
 
         speech_recognizer.start_continuous_recognition_async().get() 
         
         print("[Azure Speech] 연속 인식 시작됨. 파일 처리를 기다립니다...")
-        timeout_seconds = 300 
-        start_time = time.time()
-        while not recognition_done:
-            if time.time() - start_time > timeout_seconds:
-                print("[Azure Speech] 처리 시간 초과!")
-                break
-            time.sleep(0.5)
+        if not recognition_done.wait(timeout=timeout_seconds):
+            print("[Azure Speech] 처리 시간 초과!")
+            return f"Azure Speech API 처리 오류: 처리 시간 초과 ({timeout_seconds:g}초)"
         
     except Exception as e:
         print(f"[Azure Speech] 인식 과정 중 예외 발생: {e}")
         return f"Azure Speech API 처리 오류: {e}"
     finally:
-        if speech_recognizer and not recognition_done: 
-            print("[Azure Speech] 명시적으로 인식 중지 시도...")
-            try:
-                speech_recognizer.stop_continuous_recognition_async().get()
-            except Exception as stop_e:
-                print(f"[Azure Speech] 인식 중지 중 오류 발생: {stop_e}")
-        elif speech_recognizer and recognition_done: 
-            print("[Azure Speech] 인식 세션 정상 종료됨.")
+        _stop_recognition(speech_recognizer, recognition_done.is_set())
 
+    return _join_recognized_text(all_recognized_text_parts, cancellation_errors)
 
-    if not all_recognized_text_parts:
-        print("[Azure Speech] 최종적으로 인식된 텍스트가 없습니다.")
-        return "오류: 인식된 텍스트가 없음 (NoMatch 또는 빈 오디오 가능성)"
+async def transcribe_audio_with_azure_async(audio_filepath: str, timeout_seconds: float | None = None) -> str | None:
+    """
+    transcribe_audio_with_azure의 비동기 버전입니다.
+    인식 세션이 진행되는 동안 스레드를 점유하지 않고 이벤트 루프의 future를 기다립니다.
+    """
+    error_msg = _check_recognition_ready(audio_filepath)
+    if error_msg:
+        return error_msg
 
-    full_transcribed_text = " ".join(all_recognized_text_parts)
-    print("[Azure Speech] 음성 파일 처리 완료.")
-    return full_transcribed_text
+    if timeout_seconds is None:
+        timeout_seconds = AZURE_STT_SESSION_TIMEOUT_SECONDS
+
+    print(f"[Azure Speech] (async) 음성 파일 처리 시작: {audio_filepath}")
+
+    loop = asyncio.get_running_loop()
+    recognition_done = loop.create_future()
+
+    def on_done():
+        # SDK 콜백은 별도 스레드에서 호출되므로 이벤트 루프 스레드로 넘겨서 future를 완료
+        def _set_done():
+            if not recognition_done.done():
+                recognition_done.set_result(True)
+        try:
+            loop.call_soon_threadsafe(_set_done)
+        except RuntimeError:
+            pass  # 시간 초과 후 루프가 이미 닫힌 뒤 늦게 도착한 콜백
+
+    audio_config = speechsdk.audio.AudioConfig(filename=audio_filepath)
+    speech_recognizer = None
+    all_recognized_text_parts = []
+    cancellation_errors = []
+
+    try:
+        speech_recognizer = speechsdk.SpeechRecognizer(speech_config=speech_config, audio_config=audio_config)
+        _connect_recognition_handlers(
+            speech_recognizer, all_recognized_text_parts, on_done, cancellation_errors=cancellation_errors
+        )
+
+        start_future = speech_recognizer.start_continuous_recognition_async()
+        await loop.run_in_executor(None, start_future.get)
+
+        print("[Azure Speech] (async) 연속 인식 시작됨. 파일 처리를 기다립니다...")
+        try:
+            await asyncio.wait_for(asyncio.shield(recognition_done), timeout=timeout_seconds)
+        except asyncio.TimeoutError:
+            print("[Azure Speech] 처리 시간 초과!")
+            return f"Azure Speech API 처리 오류: 처리 시간 초과 ({timeout_seconds:g}초)"
+
+    except Exception as e:
+        print(f"[Azure Speech] 인식 과정 중 예외 발생: {e}")
+        return f"Azure Speech API 처리 오류: {e}"
+    finally:
+        if speech_recognizer and not recognition_done.done():
+            await loop.run_in_executor(None, _stop_recognition, speech_recognizer, False)
+        else:
+            _stop_recognition(speech_recognizer, True)
 
-def transcribe_multiple_files(file_paths: list[str]) -> str:
+    return _join_recognized_text(all_recognized_text_parts, cancellation_errors)
+
+def transcribe_pcm_stream_with_azure(
+    pcm_frames: Iterable[bytes],
+    on_text: Callable[[str], None] | None = None,
+    timeout_seconds: float | None = None,
+) -> str | None:
     """
-    여러 오디오 파일을 순차적으로 Azure STT로 처리한 후 텍스트를 하나로 병합하여 반환합니다.
+    디코딩된 PCM 프레임을 푸시 스트림으로 인식기에 바로 흘려보냅니다.
+    WAV 조각을 만들지 않으며, 디코딩이 끝나기 전에도 인식된 문장이 on_text로 전달됩니다.
     """
-    all_text = []
+    if speech_config is None:
+        error_msg = "오류: Azure SpeechConfig가 초기화되지 않았습니다. 파일 상단의 구독 키와 지역 설정을 확인해주세요."
+        print(f"[Azure Speech] {error_msg}")
+        return error_msg
+
+    if timeout_seconds is None:
+        timeout_seconds = AZURE_STT_SESSION_TIMEOUT_SECONDS
+
+    stream_format = speechsdk.audio.AudioStreamFormat(
+        samples_per_second=STREAM_SAMPLE_RATE,
+        bits_per_sample=STREAM_BITS_PER_SAMPLE,
+        channels=STREAM_CHANNELS,
+    )
+    push_stream = speechsdk.audio.PushAudioInputStream(stream_format=stream_format)
+    audio_config = speechsdk.audio.AudioConfig(stream=push_stream)
+    speech_recognizer = None
+    all_recognized_text_parts = []
+    cancellation_errors = []
+    recognition_done = threading.Event()
+    stream_closed = False
+
+    try:
+        speech_recognizer = speechsdk.SpeechRecognizer(speech_config=speech_config, audio_config=audio_config)
+        _connect_recognition_handlers(
+            speech_recognizer, all_recognized_text_parts, recognition_done.set, on_text, cancellation_errors
+        )
+
+        speech_recognizer.start_continuous_recognition_async().get()
+        print("[Azure Speech] 스트리밍 인식 시작됨. 오디오를 밀어 넣는 중...")
+
+        for frame in pcm_frames:
+            if recognition_done.is_set():
+                # 세션이 먼저 취소된 경우 더 이상 디코딩하지 않음
+                break
+            push_stream.write(frame)
+        push_stream.close()
+        stream_closed = True
+
+        # 입력이 끝난 뒤 남은 오디오 인식에 허용하는 시간
+        if not recognition_done.wait(timeout=timeout_seconds):
+            print("[Azure Speech] 처리 시간 초과!")
+            return f"Azure Speech API 처리 오류: 처리 시간 초과 ({timeout_seconds:g}초)"
+
+    except Exception as e:
+        print(f"[Azure Speech] 인식 과정 중 예외 발생: {e}")
+        return f"Azure Speech API 처리 오류: {e}"
+    finally:
+        if not stream_closed:
+            push_stream.close()
+        close_frames = getattr(pcm_frames, "close", None)
+        if close_frames:
+            close_frames()
+        _stop_recognition(speech_recognizer, recognition_done.is_set())
+
+    return _join_recognized_text(all_recognized_text_parts, cancellation_errors)
+
+def _is_retryable_result(result: str | None) -> bool:
+    # API 호출 실패와 오류로 인한 세션 취소(동시 세션이 많을 때의 요청 제한 등)만 재시도
+    # (NoMatch, 파일 없음 등은 다시 해도 결과가 같음)
+    return not result or result.startswith(("Azure Speech API 처리 오류", RECOGNITION_CANCELED_PREFIX))
+
+def _retry_wait_seconds(result: str | None, attempt: int) -> float:
+    # 지수 백오프 + 지터 (동시에 실패한 조각들이 같은 순간에 다시 몰리지 않도록), 요청 제한이면 더 길게 대기
+    wait_seconds = AZURE_STT_RETRY_BACKOFF_SECONDS * (2 ** attempt)
+    if result and "TooManyRequests" in result:
+        wait_seconds *= 4
+    return wait_seconds * random.uniform(1.0, 1.5)
+
+def transcribe_chunk_with_retry(
+    audio_filepath: str,
+    max_retries: int = AZURE_STT_MAX_RETRIES,
+    transcribe_fn: Callable[[str], str | None] = transcribe_audio_with_azure,
+) -> str | None:
+    result = None
+    for attempt in range(max_retries + 1):
+        try:
+            result = transcribe_fn(audio_filepath)
+        except Exception as e:
+            result = f"Azure Speech API 처리 오류: {e}"
+        if not _is_retryable_result(result):
+            return result
+        if attempt < max_retries:
+            wait_seconds = _retry_wait_seconds(result, attempt)
+            print(f"[Azure Batch STT] 재시도 {attempt + 1}/{max_retries} ({wait_seconds:.1f}초 후): {audio_filepath}")
+            time.sleep(wait_seconds)
+    return result
+
+def audio_fingerprint(audio_filepath: str) -> str | None:
+    # WAV 헤더/메타데이터가 아니라 디코딩된 PCM 샘플과 형식만 해시 (같은 소리면 같은 키)
+    hasher = hashlib.sha256()
+    try:
+        with wave.open(audio_filepath, "rb") as wav_file:
+            hasher.update(f"{wav_file.getnchannels()}:{wav_file.getsampwidth()}:{wav_file.getframerate()}".encode())
+            while frames := wav_file.readframes(65536):
+                hasher.update(frames)
+    except (wave.Error, EOFError):
+        # WAV가 아니면 파일 바이트 전체를 해시
+        try:
+            with open(audio_filepath, "rb") as f:
+                while block := f.read(1024 * 1024):
+                    hasher.update(block)
+        except OSError:
+            return None
+    except OSError:
+        return None
+    return hasher.hexdigest()
+
+def _is_cacheable_result(result: str | None) -> bool:
+    # 정상 인식 결과와 NoMatch(무음)만 저장. API 오류, 오류로 인한 세션 취소, 설정 오류는 다시 시도해야 하므로 제외
+    if not result or _is_retryable_result(result):
+        return False
+    return result == NO_MATCH_RESULT or not result.startswith("오류:")
+
+def _chunk_cache_key(fingerprint: str) -> str:
+    return make_cache_key("stt-chunk", STT_CHUNK_CACHE_VERSION, fingerprint, "ko-KR")
+
+def _is_usable_result(result: str | None) -> bool:
+    return bool(result) and not result.startswith("오류:") and not _is_retryable_result(result)
+
+def transcribe_multiple_files(
+    file_paths: list[str],
+    max_workers: int | None = None,
+    max_retries: int = AZURE_STT_MAX_RETRIES,
+    transcribe_fn: Callable[[str], str | None] = transcribe_audio_with_azure,
+    progress_callback: Callable[[int, int], None] | None = None,
+    use_cache: bool | None = None,
+    chunk_text_callback: Callable[[int, str], None] | None = None,
+) -> str:
+    """
+    여러 오디오 파일을 Azure STT로 처리한 후 텍스트를 하나로 병합하여 반환합니다.
+    max_workers개의 인식 세션을 동시에 실행하며, 결과는 항상 조각 순서대로 병합됩니다.
+    chunk_text_callback(조각 번호, 텍스트)은 앞 조각들이 모두 끝나는 즉시 조각 순서대로 호출됩니다 (점진적 요약용).
+    조각마다 PCM 해시로 캐시를 먼저 확인하므로 바뀐 조각만 실제로 인식기에 보냅니다.
+    transcribe_fn을 바꿔 끼우면 Azure 없이 로컬 가짜 인식기로 테스트/벤치마크할 수 있습니다.
+    """
+    if max_workers is None:
+        max_workers = AZURE_STT_MAX_WORKERS
+    if use_cache is None:
+        # 가짜 인식기 결과가 캐시에 섞이지 않도록 실제 Azure 인식기일 때만 기본 사용
+        use_cache = STT_CHUNK_CACHE_ENABLED and transcribe_fn is transcribe_audio_with_azure
+    total = len(file_paths)
+    results: list[str | None] = [None] * total
+    cache_keys: list[str | None] = [None] * total
+
+    pending_indices = []
     for idx, path in enumerate(file_paths):
-        print(f"[Azure Batch STT] ({idx+1}/{len(file_paths)}) 처리 중: {path}")
-        result = transcribe_audio_with_azure(path)
-        if result and not result.startswith("오류:"):
+        if use_cache:
+            fingerprint = audio_fingerprint(path)
+            if fingerprint:
+                cache_keys[idx] = _chunk_cache_key(fingerprint)
+                cached = stt_chunk_cache.get(cache_keys[idx])
+                if cached is not None:
+                    results[idx] = cached
+                    continue
+        pending_indices.append(idx)
+
+    completed = [result is not None for result in results]
+    next_chunk_to_emit = 0
+
+    def emit_ready_chunks():
+        # 병렬로 끝난 순서와 상관없이, 앞에서부터 연속으로 완료된 조각만 순서대로 전달
+        nonlocal next_chunk_to_emit
+        while next_chunk_to_emit < total and completed[next_chunk_to_emit]:
+            result = results[next_chunk_to_emit]
+            if chunk_text_callback and _is_usable_result(result):
+                chunk_text_callback(next_chunk_to_emit, result)
+            next_chunk_to_emit += 1
+
+    done_count = total - len(pending_indices)
+    emit_ready_chunks()
+    if use_cache:
+        print(f"[Azure Batch STT] 조각 캐시 적중 {done_count}/{total}개, 인식 필요 {len(pending_indices)}개")
+        if progress_callback and done_count:
+            progress_callback(done_count, total)
+
+    def finish_chunk(idx: int, result: str | None):
+        nonlocal done_count
+        results[idx] = result
+        completed[idx] = True
+        done_count += 1
+        if cache_keys[idx] and _is_cacheable_result(result):
+            stt_chunk_cache.set(cache_keys[idx], result)
+        print(f"[Azure Batch STT] ({done_count}/{total}) 완료: {file_paths[idx]}")
+        if progress_callback:
+            progress_callback(done_count, total)
+        emit_ready_chunks()
+
+    max_workers = max(1, min(max_workers, len(pending_indices) or 1))
+    if max_workers == 1:
+        for idx in pending_indices:
+            print(f"[Azure Batch STT] ({idx+1}/{total}) 처리 중: {file_paths[idx]}")
+            finish_chunk(idx, transcribe_chunk_with_retry(file_paths[idx], max_retries, transcribe_fn))
+    else:
+        print(f"[Azure Batch STT] {len(pending_indices)}개 조각을 {max_workers}개 세션으로 병렬 처리합니다.")
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="azure-stt") as executor:
+            future_to_idx = {
+                executor.submit(transcribe_chunk_with_retry, file_paths[idx], max_retries, transcribe_fn): idx
+                for idx in pending_indices
+            }
+            for future in as_completed(future_to_idx):
+                finish_chunk(future_to_idx[future], future.result())
+
+    all_text = []
+    for result in results:
+        if _is_usable_result(result):
             all_text.append(result)
         else:
             print(f"[Azure Batch STT] 텍스트 변환 실패 또는 오류 발생: {result}")
@@ -117,6 +441,42 @@ def transcribe_multiple_files(file_paths: list[str]) -> str:
     print("[Azure Batch STT] 전체 파일 처리 완료.")
     return combined_text.strip()
 
+async def transcribe_multiple_files_async(
+    file_paths: list[str],
+    max_concurrency: int | None = None,
+    max_retries: int = AZURE_STT_MAX_RETRIES,
+) -> str:
+    """
+    transcribe_multiple_files의 비동기 버전입니다. 세마포어로 동시 세션 수를 제한하며
+    대기 중인 세션은 스레드를 점유하지 않습니다.
+    """
+    if max_concurrency is None:
+        max_concurrency = AZURE_STT_MAX_WORKERS
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+    total = len(file_paths)
+
+    async def transcribe_one(idx: int, path: str) -> str | None:
+        async with semaphore:
+            result = None
+            for attempt in range(max_retries + 1):
+                result = await transcribe_audio_with_azure_async(path)
+                if not _is_retryable_result(result):
+                    break
+                if attempt < max_retries:
+                    await asyncio.sleep(AZURE_STT_RETRY_BACKOFF_SECONDS * (2 ** attempt))
+            print(f"[Azure Batch STT] (async) ({idx+1}/{total}) 완료: {path}")
+            return result
+
+    results = await asyncio.gather(*(transcribe_one(idx, path) for idx, path in enumerate(file_paths)))
+
+    all_text = []
+    for result in results:
+        if _is_usable_result(result):
+            all_text.append(result)
+        else:
+            print(f"[Azure Batch STT] 텍스트 변환 실패 또는 오류 발생: {result}")
+    print("[Azure Batch STT] (async) 전체 파일 처리 완료.")
+    return " ".join(all_text).strip()
 
 if __name__ == '__main__':
     if speech_config is None: # speech_config가 None이면 키/지역 정보가 유효하지 않거나 설정되지 않은 것
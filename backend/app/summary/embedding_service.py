@@ -0,0 +1,377 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+from ..cache import CACHE_ROOT
+from ..model_registry import registry
+
+SENTENCE_MODEL_NAME = 'jhgan/ko-sroberta-multitask'
+FALLBACK_SENTENCE_MODEL_NAME = 'sentence-transformers/xlm-r-100langs-bert-base-nli-stsb-mean-tokens'
+
+# encode 배치 크기와 CPU 스레드 수 (0이면 torch 기본값)
+SENTENCE_EMBEDDING_BATCH_SIZE = int(os.getenv("SENTENCE_EMBEDDING_BATCH_SIZE", "64"))
+SENTENCE_EMBEDDING_THREADS = int(os.getenv("SENTENCE_EMBEDDING_THREADS", "0"))
+# 추론 방식: "torch"(FP32), "int8"(동적 양자화), "onnx"(ONNX Runtime). 준비에 실패하면 torch로 실행
+SENTENCE_EMBEDDING_BACKENDS = ("torch", "int8", "onnx")
+SENTENCE_EMBEDDING_BACKEND = os.getenv("SENTENCE_EMBEDDING_BACKEND", "torch").strip().lower()
+
+# 문장 → 임베딩 캐시. 같은 과목 강의에서 반복되는 문장(인사말, 공지 등)은 다시 계산하지 않음
+EMBEDDING_CACHE_ENABLED = os.getenv("EMBEDDING_CACHE", "1") == "1"
+EMBEDDING_CACHE_MAX_ENTRIES = int(os.getenv("EMBEDDING_CACHE_MAX_ENTRIES", "100000"))
+# 벡터 파일의 처음 크기 (문장 수). 모자라면 max_entries까지 두 배씩 늘림
+EMBEDDING_CACHE_INITIAL_ENTRIES = int(os.getenv("EMBEDDING_CACHE_INITIAL_ENTRIES", "1024"))
+EMBEDDING_CACHE_DIR = os.path.join(CACHE_ROOT, "embeddings")
+
+
+def _build_sentence_model(model_name: str, backend: str):
+    from sentence_transformers import SentenceTransformer
+    if backend == "onnx":
+        # ONNX Runtime 추론 (sentence-transformers>=3.2, optimum[onnxruntime] 필요)
+        return SentenceTransformer(model_name, backend="onnx")
+
+    model = SentenceTransformer(model_name)
+    if backend == "int8":
+        # Linear 층 가중치를 int8로 동적 양자화 (CPU 전용)
+        import torch
+        model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    return model
+
+def _load_sentence_model_with_backend(model_name: str, backend: str):
+    # 반환값: (캐시 키에 쓰는 모델 식별자, 모델). 추론 방식이 바뀌면 임베딩 값도 달라지므로 식별자에 포함
+    if backend not in SENTENCE_EMBEDDING_BACKENDS:
+        print(f"[Embedding] 알 수 없는 추론 방식 '{backend}', torch로 실행합니다.")
+        backend = "torch"
+    if backend != "torch":
+        try:
+            return f"{model_name}@{backend}", _build_sentence_model(model_name, backend)
+        except Exception as e:
+            print(f"[Embedding] '{backend}' 추론 방식 준비 실패, torch로 실행합니다: {e}")
+    return model_name, _build_sentence_model(model_name, "torch")
+
+def _load_sentence_model():
+    # sentence_transformers(및 torch) import 자체가 무거우므로 실제로 필요할 때까지 미룸
+    if SENTENCE_EMBEDDING_THREADS > 0:
+        import torch
+        torch.set_num_threads(SENTENCE_EMBEDDING_THREADS)
+    try:
+        return _load_sentence_model_with_backend(SENTENCE_MODEL_NAME, SENTENCE_EMBEDDING_BACKEND)
+    except Exception:
+        return _load_sentence_model_with_backend(FALLBACK_SENTENCE_MODEL_NAME, SENTENCE_EMBEDDING_BACKEND)
+
+registry.register("sentence_model", _load_sentence_model)
+
+
+class _InterProcessLock:
+    """
+    같은 캐시 디렉토리를 쓰는 여러 프로세스(uvicorn 워커, 구간 요약 프로세스 풀 등) 사이의 배타적 파일 락입니다.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = None
+
+    def __enter__(self):
+        self._file = open(self.path, "a+b")
+        if fcntl is not None:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+        else:
+            # Windows: 첫 바이트 잠금 (LK_LOCK은 잠길 때까지 최대 10초 재시도하므로 반복)
+            self._file.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(self._file.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    continue
+        return self
+
+    def __exit__(self, *exc_info):
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+            else:
+                self._file.seek(0)
+                msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+        finally:
+            self._file.close()
+            self._file = None
+
+
+class EmbeddingStore:
+    """
+    문장 임베딩을 memmap 파일(슬롯 수 × dim, float32)의 슬롯에 저장하는 디스크 캐시입니다.
+    파일은 작게 시작해서 슬롯이 모자랄 때마다 max_entries까지 두 배씩 늘리므로, 미리 max_entries만큼 할당하지 않습니다.
+    여러 프로세스가 같은 파일을 공유하므로 슬롯 배정, 벡터 쓰기, 조회는 모두 파일 락 안에서 합니다.
+    키 → 슬롯 색인은 추가 전용 로그(index.log)로 기록하고, 각 프로세스는 락을 잡을 때마다 마지막으로 읽은 위치 이후의
+    줄만 읽어 다른 프로세스가 배정한 슬롯을 반영합니다. 슬롯은 공유 카운터 순서대로 돌아가며 배정하므로(가장 오래 전에
+    저장한 항목부터 교체) 프로세스끼리 같은 슬롯을 동시에 배정하지 않습니다.
+    로그가 max_entries줄 이상 쌓이면 현재 색인만 담은 새 파일로 교체합니다. 모델이나 차원이 바뀌면 새로 만듭니다.
+    """
+
+    def __init__(self, directory: str, max_entries: int):
+        self.directory = directory
+        self.max_entries = max_entries
+        self._vectors: np.memmap | None = None
+        self._slots: dict[str, int] = {}
+        self._slot_keys: list[str | None] = []
+        self._next_slot = 0            # 지금까지 배정된 슬롯 수 (다음 슬롯 = _next_slot % max_entries)
+        self._log_lines = 0            # 마지막 교체 이후 로그에 추가된 줄 수
+        self._index_id: tuple[int, int] | None = None  # 읽고 있는 색인 파일 (교체되면 처음부터 다시 읽음)
+        self._index_offset = 0
+        self._model_name: str | None = None
+        self._dim: int | None = None
+
+    @property
+    def _index_path(self) -> str:
+        return os.path.join(self.directory, "index.log")
+
+    @property
+    def _vectors_path(self) -> str:
+        return os.path.join(self.directory, "vectors.f32")
+
+    def _lock(self) -> _InterProcessLock:
+        return _InterProcessLock(os.path.join(self.directory, "store.lock"))
+
+    @property
+    def _row_bytes(self) -> int:
+        return self._dim * np.dtype(np.float32).itemsize
+
+    def _map_vectors(self, rows: int | None = None):
+        # rows가 파일보다 크면 numpy가 파일을 늘림 (다른 프로세스가 늘린 파일은 rows=None으로 현재 크기만큼 다시 매핑)
+        if rows is None:
+            rows = os.path.getsize(self._vectors_path) // self._row_bytes
+        self._vectors = None  # 기존 매핑을 먼저 닫음
+        self._vectors = np.memmap(self._vectors_path, dtype=np.float32, mode="r+", shape=(rows, self._dim))
+
+    def _ensure_rows(self, slot: int):
+        # (락 안에서) slot까지 쓸 수 있도록 매핑을 넓힘
+        if slot < len(self._vectors):
+            return
+        self._vectors.flush()
+        file_rows = os.path.getsize(self._vectors_path) // self._row_bytes
+        if slot < file_rows:
+            self._map_vectors(file_rows)
+        else:
+            self._map_vectors(min(self.max_entries, max(slot + 1, 2 * file_rows)))
+
+    def _header(self) -> dict:
+        return {"model": self._model_name, "dim": self._dim, "max_entries": self.max_entries}
+
+    def open(self, model_name: str, dim: int):
+        if self._vectors is not None and self._model_name == model_name and self._dim == dim:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        self._model_name = model_name
+        self._dim = dim
+        with self._lock():
+            if not self._sync_index():
+                self._create()
+        print(f"[EmbeddingCache] {len(self._slots)}개 문장 임베딩 로드 ({self.directory})")
+
+    def _reset(self, next_slot: int = 0):
+        self._slots = {}
+        self._slot_keys = [None] * self.max_entries
+        self._next_slot = next_slot
+        self._log_lines = 0
+
+    def _assign(self, key: str, slot: int):
+        old_key = self._slot_keys[slot]
+        if old_key is not None and self._slots.get(old_key) == slot:
+            del self._slots[old_key]
+        self._slots[key] = slot
+        self._slot_keys[slot] = key
+
+    def _sync_index(self) -> bool:
+        """(락 안에서) 다른 프로세스가 로그에 추가한 줄을 반영합니다. 색인이 없거나 현재 모델과 맞지 않으면 False."""
+        try:
+            with open(self._index_path, "rb") as f:
+                stat = os.fstat(f.fileno())
+                index_id = (stat.st_dev, stat.st_ino)
+                if index_id != self._index_id or stat.st_size < self._index_offset or self._vectors is None:
+                    # 처음 읽거나 파일이 교체됨: 헤더부터 다시 읽음
+                    header = json.loads(f.readline())
+                    vectors_bytes = os.path.getsize(self._vectors_path)
+                    if (
+                        {k: header.get(k) for k in ("model", "dim", "max_entries")} != self._header()
+                        or vectors_bytes == 0
+                        or vectors_bytes % self._row_bytes
+                        or vectors_bytes > self.max_entries * self._row_bytes
+                    ):
+                        return False
+                    self._reset(header.get("next", 0))
+                    for key, slot in header.get("entries", []):
+                        self._assign(key, slot)
+                    if self._vectors is None:
+                        self._map_vectors()
+                    self._index_id = index_id
+                    self._index_offset = f.tell()
+                else:
+                    f.seek(self._index_offset)
+                new_data = f.read()
+        except (OSError, ValueError, KeyError, TypeError):
+            return False
+
+        # 쓰다가 중단된 마지막 줄은 무시
+        complete = new_data[:new_data.rfind(b"\n") + 1]
+        for line in complete.decode("utf-8").splitlines():
+            key, slot = line.split(" ")
+            self._assign(key, int(slot))
+            self._next_slot += 1
+            self._log_lines += 1
+        self._index_offset += len(complete)
+        return True
+
+    def _write_index(self):
+        # (락 안에서) 현재 색인만 담은 새 로그 파일로 원자적으로 교체
+        header = {
+            **self._header(),
+            "next": self._next_slot,
+            "entries": [[key, slot] for slot, key in enumerate(self._slot_keys) if key is not None],
+        }
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(json.dumps(header).encode("utf-8") + b"\n")
+            size = f.tell()
+        os.replace(tmp_path, self._index_path)
+        stat = os.stat(self._index_path)
+        self._index_id = (stat.st_dev, stat.st_ino)
+        self._index_offset = size
+        self._log_lines = 0
+
+    def _create(self):
+        rows = max(1, min(self.max_entries, EMBEDDING_CACHE_INITIAL_ENTRIES))
+        self._vectors = None
+        self._vectors = np.memmap(self._vectors_path, dtype=np.float32, mode="w+", shape=(rows, self._dim))
+        self._reset()
+        self._write_index()
+
+    def get_many(self, keys: list[str]) -> dict[str, np.ndarray]:
+        found = {}
+        with self._lock():
+            if not self._sync_index():
+                return found
+            for key in keys:
+                slot = self._slots.get(key)
+                if slot is not None:
+                    self._ensure_rows(slot)  # 다른 프로세스가 파일을 늘렸을 수 있음
+                    found[key] = np.array(self._vectors[slot])
+        return found
+
+    def put_many(self, keys: list[str], vectors: np.ndarray):
+        try:
+            with self._lock():
+                if not self._sync_index():
+                    self._create()
+                lines = []
+                for key, vector in zip(keys, vectors):
+                    if key in self._slots:
+                        continue  # 다른 프로세스가 먼저 저장함
+                    slot = self._next_slot % self.max_entries
+                    self._ensure_rows(slot)
+                    self._vectors[slot] = vector
+                    self._assign(key, slot)
+                    self._next_slot += 1
+                    lines.append(f"{key} {slot}\n")
+                if not lines:
+                    return
+                # 벡터를 먼저 쓴 뒤 색인에 추가하여, 색인이 아직 쓰이지 않은 슬롯을 가리키지 않도록 함
+                self._vectors.flush()
+                data = "".join(lines).encode("utf-8")
+                with open(self._index_path, "ab") as f:
+                    f.write(data)
+                self._index_offset += len(data)
+                self._log_lines += len(lines)
+                if self._log_lines >= self.max_entries:
+                    self._write_index()
+        except OSError as e:
+            print(f"[EmbeddingCache] 임베딩 저장 실패: {e}")
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+
+class SentenceEmbeddingService:
+    """
+    TextRank가 사용하는 문장 임베딩 서비스입니다.
+    정규화된 float32 임베딩을 반환하고, 캐시에 없는 (중복 제거된) 문장만 배치로 encode합니다.
+    """
+
+    def __init__(self, store: EmbeddingStore | None, batch_size: int = SENTENCE_EMBEDDING_BATCH_SIZE):
+        self.store = store
+        self.batch_size = batch_size
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def cache_key(model_name: str, sentence: str) -> str:
+        return hashlib.sha256(f"{model_name}\0{sentence}".encode("utf-8")).hexdigest()[:32]
+
+    def _encode(self, model, sentences: list[str]) -> np.ndarray:
+        embeddings = model.encode(
+            sentences,
+            batch_size=self.batch_size,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+            show_progress_bar=False,
+        )
+        return np.asarray(embeddings, dtype=np.float32)
+
+    def encode(self, sentences: list[str]) -> np.ndarray | None:
+        loaded = registry.get("sentence_model")
+        if loaded is None:
+            return None
+        model_name, model = loaded
+        if not sentences:
+            return np.zeros((0, model.get_sentence_embedding_dimension()), dtype=np.float32)
+        if self.store is None:
+            return self._encode(model, sentences)
+
+        keys = [self.cache_key(model_name, sentence) for sentence in sentences]
+        with self._lock:
+            self.store.open(model_name, model.get_sentence_embedding_dimension())
+            found = self.store.get_many(keys)
+
+        missing: dict[str, str] = {}
+        for key, sentence in zip(keys, sentences):
+            if key not in found:
+                missing.setdefault(key, sentence)
+
+        if missing:
+            # 모델 계산은 락 밖에서 수행 (다른 요청의 캐시 조회를 막지 않음)
+            computed = self._encode(model, list(missing.values()))
+            found.update(zip(missing.keys(), computed))
+            with self._lock:
+                self.store.put_many(list(missing.keys()), computed)
+
+        with self._lock:
+            self.hits += len(sentences) - len(missing)
+            self.misses += len(missing)
+        return np.stack([found[key] for key in keys])
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self.store) if self.store is not None else 0,
+            }
+
+
+embedding_service = SentenceEmbeddingService(
+    EmbeddingStore(EMBEDDING_CACHE_DIR, EMBEDDING_CACHE_MAX_ENTRIES) if EMBEDDING_CACHE_ENABLED else None
+)
+
+def get_sentence_model():
+    loaded = registry.get("sentence_model")
+    return loaded[1] if loaded is not None else None
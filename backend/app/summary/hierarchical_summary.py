@@ -0,0 +1,117 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from ..model_registry import registry
+from ..preprocess.document import LectureDocument
+from .textrank_summary import TEXTRANK_KNN_MIN_SENTENCES, is_summary_failure, summarize_with_textrank
+
+# 문장 수가 이 값 이상이면 구간별 요약(map) → 구간 요약 모음 재요약(reduce) 방식으로 요약 (0이면 사용 안 함)
+# 문장 수에 따른 순서: TEXTRANK_KNN_MIN_SENTENCES 미만은 전체 유사도 행렬, 그 이상은 kNN 희소 그래프로 한 번에,
+# 이 값 이상은 구간별 요약. 따라서 이 값은 TEXTRANK_KNN_MIN_SENTENCES보다 커야 함
+HIERARCHICAL_MIN_SENTENCES = int(os.getenv("HIERARCHICAL_MIN_SENTENCES", "6000"))
+# 한 구간의 문장 수와 구간마다 뽑을 최대 문장 수
+HIERARCHICAL_SEGMENT_SENTENCES = int(os.getenv("HIERARCHICAL_SEGMENT_SENTENCES", "200"))
+HIERARCHICAL_SEGMENT_MAX_SENTENCES = int(os.getenv("HIERARCHICAL_SEGMENT_MAX_SENTENCES", "8"))
+# 구간 요약을 나눠 처리할 프로세스 수 (각 프로세스가 문장 임베딩 모델을 따로 로드하므로 메모리에 맞게 설정)
+HIERARCHICAL_WORKERS = int(os.getenv("HIERARCHICAL_WORKERS", str(min(4, max(1, (os.cpu_count() or 2) // 2)))))
+
+if 0 < HIERARCHICAL_MIN_SENTENCES <= TEXTRANK_KNN_MIN_SENTENCES:
+    print(
+        f"[Hierarchical] 경고: HIERARCHICAL_MIN_SENTENCES({HIERARCHICAL_MIN_SENTENCES})가 "
+        f"TEXTRANK_KNN_MIN_SENTENCES({TEXTRANK_KNN_MIN_SENTENCES}) 이하라서 kNN 그래프 요약은 사용되지 않습니다."
+    )
+
+# 구간 요약에서 문장을 하나도 얻지 못했을 때 반환하는 안내 (is_summary_failure로 실패 판정됨)
+HIERARCHICAL_FAILURE_MESSAGE = "오류: 구간 요약에서 핵심 문장을 찾지 못했습니다."
+
+_pool: ProcessPoolExecutor | None = None
+_pool_lock = threading.Lock()
+
+
+def _summarize_sentences(sentences: list[str], textrank_params: dict) -> list[str]:
+    document = LectureDocument(text=" ".join(sentences), sentences=sentences, offsets=[], quiz_sentences=[])
+    summary = summarize_with_textrank(document.text, document=document, **textrank_params)
+    if is_summary_failure(summary):
+        return []
+    return [line for line in summary.split("\n") if line.strip()]
+
+
+def _init_segment_worker(torch_threads: int):
+    # 임베딩 캐시는 파일 락으로 프로세스 간에 공유되므로 워커에서도 그대로 사용
+    try:
+        import torch
+        torch.set_num_threads(torch_threads)
+    except ImportError:
+        pass
+    registry.get("sentence_model")
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    # 워커마다 모델 로드가 필요하므로 풀은 한 번 만들어 계속 재사용
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            torch_threads = max(1, (os.cpu_count() or 1) // HIERARCHICAL_WORKERS)
+            _pool = ProcessPoolExecutor(
+                max_workers=HIERARCHICAL_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_segment_worker,
+                initargs=(torch_threads,),
+            )
+            print(f"[Hierarchical] 구간 요약 프로세스 {HIERARCHICAL_WORKERS}개 시작 (프로세스당 torch 스레드 {torch_threads}개)")
+        return _pool
+
+
+def _discard_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+def partition_sentences(sentences: list[str], segment_size: int = HIERARCHICAL_SEGMENT_SENTENCES) -> list[list[str]]:
+    # 강의 흐름을 유지하도록 연속된 문장끼리 구간을 나누고, 마지막 구간이 너무 짧으면 앞 구간에 합침
+    segments = [sentences[start:start + segment_size] for start in range(0, len(sentences), segment_size)]
+    if len(segments) > 1 and len(segments[-1]) < segment_size // 2:
+        segments[-2].extend(segments.pop())
+    return segments
+
+
+def summarize_hierarchically(sentences: list[str], textrank_params: dict) -> str:
+    """
+    긴 강의를 구간으로 나눠 구간마다 TextRank로 핵심 문장을 뽑고(map, 프로세스 풀에서 병렬),
+    구간에서 뽑힌 문장들을 강의 순서대로 모아 한 번 더 TextRank로 최종 요약합니다(reduce).
+    구간 하나의 비용은 구간 크기로 제한되므로 강의가 길어져도 전체 비용은 문장 수에 비례합니다.
+    """
+    segments = partition_sentences(sentences)
+    segment_params = {
+        **textrank_params,
+        "min_sentences": min(textrank_params.get("min_sentences", 5), HIERARCHICAL_SEGMENT_MAX_SENTENCES),
+        "max_sentences": HIERARCHICAL_SEGMENT_MAX_SENTENCES,
+        "perform_preprocessing": False,
+    }
+    print(f"[Hierarchical] 문장 {len(sentences)}개를 {len(segments)}개 구간으로 나눠 요약")
+
+    try:
+        pool = _get_pool()
+        segment_summaries = list(pool.map(_summarize_sentences, segments, [segment_params] * len(segments)))
+    except Exception as e:
+        # 프로세스 풀을 쓸 수 없거나 워커에서 예외가 나면 현재 프로세스에서 순서대로 처리
+        print(f"[Hierarchical] 프로세스 풀 사용 실패, 순차 처리합니다: {type(e).__name__}: {e}")
+        if isinstance(e, (BrokenProcessPool, OSError)):
+            _discard_pool()
+        segment_summaries = [_summarize_sentences(segment, segment_params) for segment in segments]
+
+    candidate_sentences = [sentence for summary in segment_summaries for sentence in summary]
+    if not candidate_sentences:
+        return HIERARCHICAL_FAILURE_MESSAGE
+
+    reduce_params = {**textrank_params, "perform_preprocessing": False}
+    document = LectureDocument(
+        text=" ".join(candidate_sentences), sentences=candidate_sentences, offsets=[], quiz_sentences=[]
+    )
+    return summarize_with_textrank(document.text, document=document, **reduce_params)
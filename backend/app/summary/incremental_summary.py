@@ -0,0 +1,206 @@
+import queue
+import threading
+from typing import Callable
+
+import numpy as np
+from scipy import sparse
+
+from ..preprocess.document import split_document_sentences
+from ..preprocess.text_utils import SummaryPreprocessor
+from .koBart_summary import DEFAULT_TEXTRANK_PARAMS
+from .pagerank import pagerank, rank_nodes, threshold_similarity_graph
+from .textrank_summary import (
+    TEXTRANK_KNN_NEIGHBORS,
+    compose_textrank_summary,
+    count_sentences_to_select,
+    embed_sentences_textrank,
+)
+
+
+class IncrementalTextRankSummarizer:
+    """
+    STT 조각이 인식되는 대로 받아서 TextRank 요약을 점진적으로 갱신합니다.
+    새 문장만 임베딩하고, 유사도 그래프에는 새 문장의 간선(문장마다 상위 k개 이웃)만 추가하며,
+    PageRank는 직전 점수에서 다시 시작(warm start)하므로 조각이 늘어나도 처음부터 다시 계산하지 않습니다.
+    summary()는 언제든 지금까지 들어온 내용의 잠정 요약을 돌려줍니다.
+    잠정 요약은 항상 문장마다 상위 TEXTRANK_KNN_NEIGHBORS개 이웃만 잇는 그래프를 쓰지만, 최종 TextRank는
+    문장 수가 TEXTRANK_KNN_MIN_SENTENCES 미만이면 전체(dense) 유사도 그래프를 쓰므로 선택되는 문장이 크게 다를 수 있습니다.
+    잠정 요약은 진행 중 미리보기일 뿐이며, 작업이 끝나면 최종 요약으로 통째로 바뀔 수 있습니다.
+    """
+
+    def __init__(self, textrank_params: dict | None = None, num_neighbors: int = TEXTRANK_KNN_NEIGHBORS):
+        self.params = {**DEFAULT_TEXTRANK_PARAMS, **(textrank_params or {})}
+        self.num_neighbors = num_neighbors
+        self.sentences: list[str] = []
+        self._embeddings: np.ndarray | None = None  # 용량을 두 배씩 늘려가며 재사용하는 버퍼
+        self._edge_rows: list[np.ndarray] = []
+        self._edge_cols: list[np.ndarray] = []
+        self._edge_weights: list[np.ndarray] = []
+        self._scores: np.ndarray | None = None
+        self._summary: str = ""
+        self._summary_sentence_count = 0
+        self._preprocessor = SummaryPreprocessor()  # 끝나지 않은 마지막 문장은 다음 조각이 올 때까지 보관
+        self._lock = threading.Lock()
+
+    def add_chunk(self, text: str) -> int:
+        """인식된 텍스트 조각을 추가하고, 새로 확정된 문장 수를 반환합니다. 끝나지 않은 마지막 문장은 다음 조각과 합칩니다."""
+        with self._lock:
+            return self._add_sentences(self._preprocessor.feed(text))
+
+    def flush(self) -> int:
+        """마지막 조각 뒤에 남은 (문장 부호로 끝나지 않은) 텍스트까지 반영합니다."""
+        with self._lock:
+            return self._add_sentences(self._preprocessor.flush())
+
+    def _add_sentences(self, preprocessed_sentences: list[str]) -> int:
+        if not preprocessed_sentences:
+            return 0
+        new_sentences, _ = split_document_sentences(" ".join(preprocessed_sentences))
+        new_sentences = [sentence.strip() for sentence in new_sentences if sentence.strip()]
+        if not new_sentences:
+            return 0
+        new_embeddings = embed_sentences_textrank(new_sentences)
+        if new_embeddings is None or new_embeddings.size == 0:
+            print("[IncrementalSummary] 새 문장 임베딩 실패, 이번 조각은 요약에 반영하지 않습니다.")
+            return 0
+
+        start = len(self.sentences)
+        end = start + len(new_sentences)
+        self._append_embeddings(start, np.asarray(new_embeddings, dtype=np.float32))
+        self.sentences.extend(new_sentences)
+
+        # 새 문장 ↔ 지금까지의 모든 문장 유사도에서 문장마다 상위 k개 이웃만 간선으로 추가
+        similarities = self._embeddings[start:end] @ self._embeddings[:end].T
+        num_neighbors = min(self.num_neighbors, end)
+        neighbor_cols = np.argpartition(similarities, -num_neighbors, axis=1)[:, -num_neighbors:]
+        self._edge_rows.append(np.repeat(np.arange(start, end), num_neighbors))
+        self._edge_cols.append(neighbor_cols.ravel())
+        self._edge_weights.append(np.take_along_axis(similarities, neighbor_cols, axis=1).ravel())
+        return len(new_sentences)
+
+    def _append_embeddings(self, start: int, new_embeddings: np.ndarray):
+        needed = start + len(new_embeddings)
+        if self._embeddings is None or needed > len(self._embeddings):
+            capacity = max(needed, 2 * (len(self._embeddings) if self._embeddings is not None else 64))
+            grown = np.zeros((capacity, new_embeddings.shape[1]), dtype=np.float32)
+            if self._embeddings is not None:
+                grown[:start] = self._embeddings[:start]
+            self._embeddings = grown
+        self._embeddings[start:needed] = new_embeddings
+
+    def _rank(self) -> list[tuple[int, float]]:
+        num_sentences = len(self.sentences)
+        graph = sparse.csr_matrix(
+            (np.concatenate(self._edge_weights), (np.concatenate(self._edge_rows), np.concatenate(self._edge_cols))),
+            shape=(num_sentences, num_sentences),
+        )
+        graph = threshold_similarity_graph(graph.maximum(graph.T), self.params["similarity_graph_threshold"])
+        if graph.nnz == 0:
+            self._scores = np.full(num_sentences, 1.0 / num_sentences)
+            return rank_nodes(self._scores)
+
+        initial_scores = None
+        if self._scores is not None:
+            # 기존 문장은 직전 점수, 새 문장은 평균 점수에서 시작
+            new_count = num_sentences - len(self._scores)
+            initial_scores = np.concatenate([self._scores, np.full(new_count, 1.0 / num_sentences)])
+        self._scores = pagerank(graph, initial_scores=initial_scores)
+        return rank_nodes(self._scores)
+
+    def summary(self) -> str:
+        """지금까지 들어온 문장으로 만든 잠정 요약 (새 문장이 없으면 이전 결과를 그대로 반환)"""
+        with self._lock:
+            num_sentences = len(self.sentences)
+            if num_sentences == 0:
+                return ""
+            if num_sentences == self._summary_sentence_count:
+                return self._summary
+
+            ranked = self._rank()
+            num_to_select = count_sentences_to_select(
+                num_sentences,
+                self.params["num_sentences_to_select_ratio"],
+                self.params["min_sentences"],
+                self.params["max_sentences"],
+            )
+            self._summary = compose_textrank_summary(
+                self.sentences,
+                ranked,
+                self._embeddings[:num_sentences],
+                num_to_select,
+                lambda_mmr=self.params["lambda_mmr"],
+                use_mmr=self.params["use_mmr"],
+                filter_endings=self.params["filter_endings"],
+            )
+            self._summary_sentence_count = num_sentences
+            return self._summary
+
+
+_STOP = object()
+
+
+class BackgroundIncrementalSummarizer:
+    """
+    IncrementalTextRankSummarizer를 전용 스레드에서 돌립니다.
+    add_chunk()는 텍스트를 큐에 넣기만 하므로 STT 콜백 스레드(SDK 이벤트 스레드, 조각 결과 수집 루프)를
+    임베딩/PageRank 계산으로 막지 않고, 밀린 조각은 한 번에 반영한 뒤 on_summary로 잠정 요약을 한 번만 알립니다.
+    """
+
+    def __init__(self, on_summary: Callable[[str], None], textrank_params: dict | None = None):
+        self.summarizer = IncrementalTextRankSummarizer(textrank_params)
+        self._on_summary = on_summary
+        self._queue: queue.Queue = queue.Queue()
+        self._cancelled = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="incremental-summary", daemon=True)
+        self._thread.start()
+
+    def add_chunk(self, text: str):
+        self._queue.put(text)
+
+    def close(self, timeout: float | None = None):
+        """
+        남은 조각과 마지막 미완성 문장까지 반영한 뒤 작업 스레드가 끝나기를 기다립니다.
+        timeout 안에 끝나지 않으면 남은 조각은 버리고(잠정 요약도 더 갱신하지 않음) 기다리지 않고 돌아갑니다.
+        """
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            self._cancelled.set()
+            print("[IncrementalSummary] 잠정 요약 스레드가 제때 끝나지 않아 남은 조각을 버리고 진행합니다.")
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            texts = [self._queue.get()]
+            if self._cancelled.is_set():
+                return
+            # 계산하는 동안 쌓인 조각은 모아서 한 번에 반영 (요약 갱신도 한 번)
+            while True:
+                try:
+                    texts.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if _STOP in texts:
+                stopping = True
+                texts = [text for text in texts if text is not _STOP]
+            steps = [lambda text=text: self.summarizer.add_chunk(text) for text in texts]
+            if stopping:
+                steps.append(self.summarizer.flush)
+            added = 0
+            for step in steps:
+                if self._cancelled.is_set():
+                    return
+                added += self._safely(step, 0)
+            if added and not self._cancelled.is_set():
+                summary = self._safely(self.summarizer.summary, None)
+                if summary is not None:
+                    self._safely(lambda: self._on_summary(summary), None)
+
+    @staticmethod
+    def _safely(step: Callable, default):
+        # 작업 스레드의 예외는 호출한 쪽으로 전달되지 않으므로 여기서 기록하고 다음 조각을 계속 처리
+        try:
+            return step()
+        except Exception as e:
+            print(f"[IncrementalSummary] 잠정 요약 갱신 실패 (최종 요약에는 영향 없음): {type(e).__name__}: {e}")
+            return default
@@ -1,19 +1,56 @@
+import os
 import re
-from .textrank_summary import summarize_with_textrank 
+import threading
+from collections import OrderedDict
+from .textrank_summary import is_summary_failure, summarize_with_textrank, split_sentences_texrank
+from .hierarchical_summary import HIERARCHICAL_MIN_SENTENCES, summarize_hierarchically
 from ..preprocess.text_utils import preprocess_text_for_summary 
-from transformers import BartForConditionalGeneration, PreTrainedTokenizerFast
-import torch
+from ..model_registry import registry
 
-# KoBART 모델 및 토크나이저 초기화
+# KoBART 모델 및 토크나이저 (transformers/torch import 포함) 는 summarize_text를 처음 호출할 때 로드
 model_name = "hyunwoongko/kobart"
-tokenizer = PreTrainedTokenizerFast.from_pretrained(model_name)
-model = BartForConditionalGeneration.from_pretrained(model_name)
-model.eval()
 
-if torch.cuda.is_available():
-    model.to("cuda")
-else:
-    pass
+# 요약 방식: "textrank"(추출 요약만) 또는 "hybrid"(TextRank로 고른 문장을 KoBART로 다시 요약)
+SUMMARY_MODE = os.getenv("SUMMARY_MODE", "textrank").strip().lower()
+# CPU에서 Linear 층을 int8로 동적 양자화 (GPU에서는 무시)
+KOBART_QUANTIZE = os.getenv("KOBART_QUANTIZE", "0") == "1"
+# 한 번의 generate 호출에 넣을 조각 수
+KOBART_BATCH_SIZE = int(os.getenv("KOBART_BATCH_SIZE", "4"))
+# 같은 입력 조각 + 같은 생성 옵션의 요약 결과를 기억해둘 개수 (샘플링을 쓰지 않을 때만 사용)
+KOBART_SUMMARY_CACHE_SIZE = int(os.getenv("KOBART_SUMMARY_CACHE_SIZE", "256"))
+KOBART_MAX_INPUT_TOKENS = 1024
+
+def _load_kobart():
+    import torch
+    from transformers import BartForConditionalGeneration, PreTrainedTokenizerFast
+
+    tokenizer = PreTrainedTokenizerFast.from_pretrained(model_name)
+    model = BartForConditionalGeneration.from_pretrained(model_name)
+    model.eval()
+
+    device = "cuda" if torch.cuda.is_available() else "cpu"
+    if device == "cpu" and KOBART_QUANTIZE:
+        model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+        print("[KoBART] int8 동적 양자화 적용")
+    model.to(device)
+    return tokenizer, model, device
+
+registry.register("kobart", _load_kobart)
+
+# 강의 요약에 쓰는 TextRank 기본 설정 (점진적 요약도 같은 설정을 사용)
+DEFAULT_TEXTRANK_PARAMS = {
+    "num_sentences_to_select_ratio": 0.25,
+    "min_sentences": 5,
+    "max_sentences": 15,
+    "similarity_graph_threshold": 0.15,
+    "lambda_mmr": 0.5,
+    "use_mmr": True,
+    "filter_endings": True,
+    "perform_preprocessing": False
+}
+
+_summary_cache: OrderedDict[tuple, str] = OrderedDict()
+_summary_cache_lock = threading.Lock()
 
 def split_text_by_length(text, max_length=1000):
     sentences = re.split(r'(?<=[.?!])\s+', text)
@@ -39,6 +76,92 @@ def split_text_by_length(text, max_length=1000):
 
     return chunks
 
+def summarize_texts(texts: list[str],
+                    max_summary_length: int = 250,
+                    min_summary_length: int = 40,
+                    num_beams: int = 1,
+                    length_penalty: float = 1.5,
+                    no_repeat_ngram_size: int = 3,
+                    repetition_penalty: float = 3.0,
+                    do_sample: bool = True,
+                    top_k: int = 50,
+                    top_p: float = 0.95,
+                    batch_size: int = KOBART_BATCH_SIZE) -> list[str]:
+    """
+    여러 조각을 KoBART로 요약합니다. 입력 순서대로 결과를 반환합니다.
+    조각을 토큰 길이순으로 정렬해 batch_size개씩 묶고, 묶음 안에서 가장 긴 조각에 맞춰서만 패딩합니다.
+    """
+    summaries = ["" for _ in texts]
+    pending = [i for i, text in enumerate(texts) if text.strip()]
+    if not pending:
+        return summaries
+
+    kobart = registry.get("kobart")
+    if kobart is None:
+        return ["요약 중 오류 발생: KoBART 모델 로드 실패" for _ in texts]
+    tokenizer, model, device = kobart
+
+    generation_options = dict(
+        max_length=max_summary_length,
+        min_length=min_summary_length,
+        num_beams=num_beams,
+        early_stopping=True,
+        no_repeat_ngram_size=no_repeat_ngram_size,
+        length_penalty=length_penalty,
+        repetition_penalty=repetition_penalty,
+        do_sample=do_sample,
+        top_k=top_k,
+        top_p=top_p,
+    )
+    # 샘플링을 하면 같은 입력도 매번 결과가 다르므로 캐시하지 않음
+    use_cache = not do_sample and KOBART_SUMMARY_CACHE_SIZE > 0
+    options_key = tuple(sorted(generation_options.items()))
+
+    if use_cache:
+        with _summary_cache_lock:
+            for i in list(pending):
+                cached = _summary_cache.get((texts[i], options_key))
+                if cached is not None:
+                    _summary_cache.move_to_end((texts[i], options_key))
+                    summaries[i] = cached
+                    pending.remove(i)
+        if not pending:
+            return summaries
+
+    import torch
+
+    # 패딩 없이 한 번 토큰화해 길이를 구하고, 길이가 비슷한 조각끼리 묶음
+    token_ids = tokenizer([texts[i] for i in pending], max_length=KOBART_MAX_INPUT_TOKENS, truncation=True)["input_ids"]
+    order = sorted(range(len(pending)), key=lambda j: len(token_ids[j]))
+
+    try:
+        for start in range(0, len(order), batch_size):
+            batch = order[start:start + batch_size]
+            inputs = tokenizer.pad({"input_ids": [token_ids[j] for j in batch]}, padding=True, return_tensors="pt")
+            if device != "cpu":
+                inputs = {k: v.to(device) for k, v in inputs.items()}
+
+            with torch.inference_mode():
+                summary_ids = model.generate(
+                    inputs["input_ids"],
+                    attention_mask=inputs["attention_mask"],
+                    **generation_options
+                )
+            decoded = tokenizer.batch_decode(summary_ids.to("cpu"), skip_special_tokens=True)
+            for j, summary in zip(batch, decoded):
+                summaries[pending[j]] = summary.strip()
+    except Exception as e:
+        print(f"[KoBART] 요약 생성 실패: {e}")
+        return ["요약 중 오류 발생: KoBART 모델 처리 실패" for _ in texts]
+
+    if use_cache:
+        with _summary_cache_lock:
+            for i in pending:
+                _summary_cache[(texts[i], options_key)] = summaries[i]
+            while len(_summary_cache) > KOBART_SUMMARY_CACHE_SIZE:
+                _summary_cache.popitem(last=False)
+    return summaries
+
 def summarize_text(text: str,
                    max_summary_length: int = 250,
                    min_summary_length: int = 40,
@@ -51,67 +174,67 @@ def summarize_text(text: str,
                    top_p: float = 0.95) -> str:
     if not text.strip():
         return ""
-            
-    inputs = tokenizer(text, return_tensors="pt", max_length=1024, truncation=True, padding="max_length")
-    
-    if torch.cuda.is_available():
-        inputs = {k: v.to("cuda") for k, v in inputs.items()}
-
-    try:
-        summary_ids = model.generate(
-            inputs["input_ids"],
-            attention_mask=inputs["attention_mask"],
-            max_length=max_summary_length,
-            min_length=min_summary_length,
-            num_beams=num_beams,
-            early_stopping=True,
-            no_repeat_ngram_size=no_repeat_ngram_size,
-            length_penalty=length_penalty,
-            repetition_penalty=repetition_penalty,
-            do_sample=do_sample,
-            top_k=top_k,
-            top_p=top_p
-        )
-        summary = tokenizer.decode(summary_ids[0].to("cpu"), skip_special_tokens=True)
-        return summary.strip()
-    except Exception as e:
-        return "요약 중 오류 발생: KoBART 모델 처리 실패"
-
+    return summarize_texts(
+        [text],
+        max_summary_length=max_summary_length,
+        min_summary_length=min_summary_length,
+        num_beams=num_beams,
+        length_penalty=length_penalty,
+        no_repeat_ngram_size=no_repeat_ngram_size,
+        repetition_penalty=repetition_penalty,
+        do_sample=do_sample,
+        top_k=top_k,
+        top_p=top_p,
+    )[0]
 
 def summarize_long_text(
     text: str,
     textrank_params: dict = None,
     kobart_final_max_length: int = 700,
-    kobart_final_min_length: int = 150
+    kobart_final_min_length: int = 150,
+    document=None,
+    summary_mode: str | None = None
     ) -> str:
     # 1. TextRank 요약 시작
-    default_textrank_params = {
-        "num_sentences_to_select_ratio": 0.25,
-        "min_sentences": 5,
-        "max_sentences": 15,
-        "similarity_graph_threshold": 0.15,
-        "lambda_mmr": 0.5,
-        "use_mmr": True,
-        "filter_endings": True,
-        "perform_preprocessing": False
-    }
-    current_textrank_params = {**default_textrank_params, **(textrank_params or {})}
-
-    # 2. TextRank 요약 실행
-    textrank_summary = summarize_with_textrank(
-        text,
-        num_sentences_to_select_ratio=current_textrank_params["num_sentences_to_select_ratio"],
-        min_sentences=current_textrank_params["min_sentences"],
-        max_sentences=current_textrank_params["max_sentences"],
-        similarity_graph_threshold=current_textrank_params["similarity_graph_threshold"],
-        lambda_mmr=current_textrank_params["lambda_mmr"],
-        use_mmr=current_textrank_params["use_mmr"],
-        filter_endings=current_textrank_params["filter_endings"],
-        perform_preprocessing=current_textrank_params["perform_preprocessing"]
-    )
+    current_textrank_params = {**DEFAULT_TEXTRANK_PARAMS, **(textrank_params or {})}
+
+    # 2. TextRank 요약 실행 (아주 긴 강의는 구간별 요약 후 재요약)
+    sentences = document.sentences if document is not None else split_sentences_texrank(text)
+    if HIERARCHICAL_MIN_SENTENCES > 0 and len(sentences) >= HIERARCHICAL_MIN_SENTENCES:
+        textrank_summary = summarize_hierarchically(
+            [sentence.strip() for sentence in sentences if sentence.strip()], current_textrank_params
+        )
+    else:
+        textrank_summary = summarize_with_textrank(
+            text,
+            num_sentences_to_select_ratio=current_textrank_params["num_sentences_to_select_ratio"],
+            min_sentences=current_textrank_params["min_sentences"],
+            max_sentences=current_textrank_params["max_sentences"],
+            similarity_graph_threshold=current_textrank_params["similarity_graph_threshold"],
+            lambda_mmr=current_textrank_params["lambda_mmr"],
+            use_mmr=current_textrank_params["use_mmr"],
+            filter_endings=current_textrank_params["filter_endings"],
+            perform_preprocessing=current_textrank_params["perform_preprocessing"],
+            document=document
+        )
 
     # 3. TextRank 결과 오류 처리 및 반환
-    if not textrank_summary.strip() or "오류:" in textrank_summary or "실패" in textrank_summary or "없습니다" in textrank_summary:
-        return textrank_summary if textrank_summary.strip() and ("오류:" in textrank_summary or "실패" in textrank_summary or "없습니다" in textrank_summary) else "TextRank 요약 생성 중 문제가 발생했습니다."
+    if is_summary_failure(textrank_summary):
+        return textrank_summary if textrank_summary.strip() else "TextRank 요약 생성 중 문제가 발생했습니다."
+
+    if (summary_mode or SUMMARY_MODE) != "hybrid":
+        return textrank_summary
 
-    return textrank_summary 
\ No newline at end of file
+    # 4. hybrid: TextRank로 고른 문장을 조각으로 나눠 KoBART로 한 번에(배치로) 다시 요약
+    chunks = split_text_by_length(textrank_summary.replace("\n", " "), max_length=1000)
+    chunk_summaries = summarize_texts(
+        chunks,
+        max_summary_length=min(250, kobart_final_max_length),
+        min_summary_length=min(40, kobart_final_min_length),
+        do_sample=False,
+    )
+    if any("요약 중 오류 발생:" in summary for summary in chunk_summaries):
+        print("[KoBART] 생성 요약 실패, TextRank 요약을 그대로 사용합니다.")
+        return textrank_summary
+    hybrid_summary = "\n".join(summary for summary in chunk_summaries if summary)
+    return hybrid_summary or textrank_summary 
\ No newline at end of file
@@ -0,0 +1,72 @@
+import numpy as np
+from scipy import sparse
+
+PAGERANK_ALPHA = 0.85
+PAGERANK_MAX_ITER = 500
+PAGERANK_TOL = 1.0e-6
+
+
+def threshold_similarity_graph(similarity_matrix, similarity_threshold: float) -> sparse.csr_matrix:
+    """
+    유사도가 threshold 미만인 간선을 버린 희소 그래프를 만듭니다.
+    dense 행렬이면 남는 간선 위치만 뽑아 CSR로 옮기고, 이미 희소 행렬이면 data만 걸러냅니다.
+    """
+    if sparse.issparse(similarity_matrix):
+        graph = sparse.csr_matrix(similarity_matrix, dtype=np.float64, copy=True)
+        graph.data[graph.data < similarity_threshold] = 0.0
+        graph.eliminate_zeros()
+        return graph
+
+    similarity_matrix = np.asarray(similarity_matrix)
+    rows, cols = np.nonzero(similarity_matrix >= similarity_threshold)
+    weights = similarity_matrix[rows, cols].astype(np.float64)
+    keep = weights != 0
+    return sparse.csr_matrix((weights[keep], (rows[keep], cols[keep])), shape=similarity_matrix.shape)
+
+
+def pagerank(
+    graph: sparse.spmatrix,
+    alpha: float = PAGERANK_ALPHA,
+    max_iter: int = PAGERANK_MAX_ITER,
+    tol: float = PAGERANK_TOL,
+    initial_scores: np.ndarray | None = None,
+) -> np.ndarray:
+    """
+    가중치 그래프(인접 행렬) 위에서 PageRank를 거듭제곱법으로 계산합니다.
+    networkx.pagerank와 같은 규칙을 따릅니다: 행 합으로 정규화(자기 자신으로의 간선은 한 번만 셈),
+    나가는 간선이 없는 노드의 점수는 모든 노드에 고르게 분배, 수렴 기준은 L1 오차 < N * tol.
+    initial_scores를 주면 그 점수에서 반복을 시작합니다 (문장이 조금 늘어난 그래프를 다시 계산할 때 빠르게 수렴).
+    """
+    num_nodes = graph.shape[0]
+    if num_nodes == 0:
+        return np.array([])
+
+    graph = sparse.csr_matrix(graph, dtype=np.float64)
+    out_weights = np.asarray(graph.sum(axis=1)).ravel()
+    is_dangling = out_weights == 0
+    inverse_out_weights = np.zeros(num_nodes)
+    inverse_out_weights[~is_dangling] = 1.0 / out_weights[~is_dangling]
+    # x @ P 를 P.T @ x 로 계산하기 위해 전치된 전이 행렬을 CSR로 한 번만 만들어 둠
+    transition_t = sparse.csr_matrix((sparse.diags(inverse_out_weights) @ graph).T)
+
+    teleport = np.full(num_nodes, 1.0 / num_nodes)
+    if initial_scores is not None and len(initial_scores) == num_nodes and np.sum(initial_scores) > 0:
+        scores = np.asarray(initial_scores, dtype=np.float64) / np.sum(initial_scores)
+    else:
+        scores = teleport.copy()
+
+    for iteration in range(max_iter):
+        previous_scores = scores
+        dangling_mass = previous_scores[is_dangling].sum()
+        scores = alpha * (transition_t @ previous_scores + dangling_mass * teleport) + (1 - alpha) * teleport
+        if np.abs(scores - previous_scores).sum() < num_nodes * tol:
+            return scores
+
+    print(f"[PageRank] {max_iter}회 반복 안에 수렴하지 않아 마지막 점수를 사용합니다.")
+    return scores
+
+
+def rank_nodes(scores: np.ndarray) -> list[tuple[int, float]]:
+    # 점수 내림차순 (동점이면 앞 번호 문장 우선)
+    order = np.argsort(-scores, kind="stable")
+    return [(int(i), float(scores[i])) for i in order]
@@ -1,8 +1,11 @@
+import os
 import re
 import numpy as np
+from scipy import sparse
 from sklearn.metrics.pairwise import cosine_similarity
-import networkx as nx
-from sentence_transformers import SentenceTransformer
+
+from .embedding_service import SENTENCE_MODEL_NAME, embedding_service, get_sentence_model
+from .pagerank import pagerank, rank_nodes, threshold_similarity_graph
 
 try:
     from ..preprocess.text_utils import preprocess_text_for_summary
@@ -12,16 +15,20 @@ except ImportError:
     def preprocess_text_for_summary(text: str) -> str:
         return re.sub(r'\s+', ' ', text).strip()
 
-SENTENCE_MODEL_NAME = 'jhgan/ko-sroberta-multitask'
-FALLBACK_SENTENCE_MODEL_NAME = 'sentence-transformers/xlm-r-100langs-bert-base-nli-stsb-mean-tokens'
-sentence_model = None
-try:
-    sentence_model = SentenceTransformer(SENTENCE_MODEL_NAME)
-except Exception:
-    try:
-        sentence_model = SentenceTransformer(FALLBACK_SENTENCE_MODEL_NAME)
-    except Exception:
-        pass
+# 문장 수가 이 값 이상이면 n×n 유사도 행렬 대신 문장별 상위 k개 이웃만 남긴 희소 그래프를 사용 (메모리가 문장 수에 선형)
+TEXTRANK_KNN_MIN_SENTENCES = int(os.getenv("TEXTRANK_KNN_MIN_SENTENCES", "2000"))
+TEXTRANK_KNN_NEIGHBORS = int(os.getenv("TEXTRANK_KNN_NEIGHBORS", "30"))
+# 한 번에 유사도를 계산할 문장 수 (블록 크기 × 문장 수 float32 만큼의 임시 메모리 사용)
+TEXTRANK_KNN_BLOCK_SIZE = int(os.getenv("TEXTRANK_KNN_BLOCK_SIZE", "256"))
+
+# 요약 함수들이 실패 시 돌려주는 안내 문장에 들어 있는 표현
+SUMMARY_FAILURE_MARKERS = ("오류:", "실패", "없습니다", "문제가 발생했습니다", "찾지 못했습니다")
+
+def is_summary_failure(summary: str) -> bool:
+    # 실패 안내는 한 줄짜리이므로, 여러 줄인 정상 요약 문장에 "없습니다" 등이 들어 있어도 실패로 보지 않음
+    if not summary or not summary.strip():
+        return True
+    return "\n" not in summary.strip() and any(marker in summary for marker in SUMMARY_FAILURE_MARKERS)
 
 def split_sentences_texrank(text: str) -> list[str]:
     if not text or not text.strip():
@@ -31,14 +38,13 @@ def split_sentences_texrank(text: str) -> list[str]:
     return sentences
 
 def embed_sentences_textrank(sentences: list[str]) -> np.ndarray | None:
-    if not sentence_model:
-        return None
+    # 정규화된 float32 임베딩 (캐시에 있는 문장은 다시 계산하지 않음)
     if not sentences:
         return np.array([])
     try:
-        embeddings = sentence_model.encode(sentences)
-        return embeddings
-    except Exception:
+        return embedding_service.encode(sentences)
+    except Exception as e:
+        print(f"[TextRank] 문장 임베딩 실패: {e}")
         return None
 
 def build_similarity_matrix_textrank(sentence_embeddings: np.ndarray) -> np.ndarray | None:
@@ -56,31 +62,52 @@ def build_similarity_matrix_textrank(sentence_embeddings: np.ndarray) -> np.ndar
     except Exception:
         return None
 
-def apply_textrank_algorithm(similarity_matrix: np.ndarray, similarity_threshold: float = 0.1) -> list[tuple[int, float]]:
-    if similarity_matrix is None or similarity_matrix.size == 0 or similarity_matrix.shape[0] == 0:
+def build_knn_similarity_graph(
+    sentence_embeddings: np.ndarray,
+    num_neighbors: int = TEXTRANK_KNN_NEIGHBORS,
+    block_size: int = TEXTRANK_KNN_BLOCK_SIZE,
+) -> sparse.csr_matrix:
+    """
+    각 문장마다 코사인 유사도가 가장 높은 num_neighbors개(자기 자신 포함)만 남긴 희소 유사도 그래프를 만듭니다.
+    정규화된 float32 임베딩을 block_size개씩 나눠 행렬곱하므로 n×n 행렬을 한 번에 만들지 않습니다.
+    결과는 A와 A.T 중 큰 값을 취해 대칭(무방향) 그래프로 만듭니다.
+    """
+    embeddings = _normalize_rows(np.asarray(sentence_embeddings, dtype=np.float32))
+    num_sentences = embeddings.shape[0]
+    num_neighbors = max(1, min(num_neighbors, num_sentences))
+
+    row_blocks, col_blocks, weight_blocks = [], [], []
+    for start in range(0, num_sentences, block_size):
+        block_similarities = embeddings[start:start + block_size] @ embeddings.T
+        neighbor_cols = np.argpartition(block_similarities, -num_neighbors, axis=1)[:, -num_neighbors:]
+        row_blocks.append(np.repeat(np.arange(start, start + block_similarities.shape[0]), num_neighbors))
+        col_blocks.append(neighbor_cols.ravel())
+        weight_blocks.append(np.take_along_axis(block_similarities, neighbor_cols, axis=1).ravel())
+
+    graph = sparse.csr_matrix(
+        (np.concatenate(weight_blocks), (np.concatenate(row_blocks), np.concatenate(col_blocks))),
+        shape=(num_sentences, num_sentences),
+    )
+    return graph.maximum(graph.T).tocsr()
+
+def apply_textrank_algorithm(
+    similarity_matrix,
+    similarity_threshold: float = 0.1,
+    initial_scores: np.ndarray | None = None,
+) -> list[tuple[int, float]]:
+    if similarity_matrix is None or similarity_matrix.shape[0] == 0:
         return []
-    processed_matrix = np.where(similarity_matrix < similarity_threshold, 0, similarity_matrix)
     try:
-        nx_graph = nx.from_numpy_array(processed_matrix)
-        if not nx_graph.nodes() or not nx_graph.edges():
-            if nx_graph.nodes():
-                num_nodes = len(nx_graph.nodes())
-                return sorted(((i, 1.0/num_nodes if num_nodes > 0 else 0) for i in nx_graph.nodes()), key=lambda x: x[1], reverse=True)
-            return []
-        scores = nx.pagerank(nx_graph, alpha=0.85, max_iter=500, tol=1.0e-6)
-    except Exception:
-        try:
-            nx_graph = nx.from_numpy_array(processed_matrix)
-            if not nx_graph.nodes() or not nx_graph.edges():
-                if nx_graph.nodes():
-                    num_nodes = len(nx_graph.nodes())
-                    return sorted(((i, 1.0/num_nodes if num_nodes > 0 else 0) for i in nx_graph.nodes()), key=lambda x: x[1], reverse=True)
-                return []
-            scores = nx.pagerank_numpy(nx_graph, alpha=0.85)
-        except Exception:
-            return []
-            
-    return sorted(((i, score) for i, score in scores.items()), key=lambda x: x[1], reverse=True)
+        graph = threshold_similarity_graph(similarity_matrix, similarity_threshold)
+        num_nodes = graph.shape[0]
+        if graph.nnz == 0:
+            return [(i, 1.0 / num_nodes) for i in range(num_nodes)]
+        scores = pagerank(graph, alpha=0.85, max_iter=500, tol=1.0e-6, initial_scores=initial_scores)
+    except Exception as e:
+        print(f"[TextRank] PageRank 계산 실패: {e}")
+        return []
+
+    return rank_nodes(scores)
 
 def apply_mmr_to_ranked_sentences(
     ranked_sentences_with_scores: list[tuple[int, float]],
@@ -103,48 +130,45 @@ def apply_mmr_to_ranked_sentences(
     normalized_scores = {idx: score / max_score if max_score > 0 else 0
                          for idx, score in ranked_sentences_with_scores}
 
-    selected_indices = []
     candidate_indices_pool = [idx for idx, score in ranked_sentences_with_scores]
 
     if not candidate_indices_pool:
         return []
-        
-    first_sentence_index = ranked_sentences_with_scores[0][0]
-    selected_indices.append(first_sentence_index)
 
-    while len(selected_indices) < num_to_select:
-        remaining_candidate_indices = [idx for idx in candidate_indices_pool if idx not in selected_indices]
-        if not remaining_candidate_indices:
-            break
+    # 임베딩은 한 번만 정규화하고, 후보는 TextRank 순위 순서로 배열에 담아둠
+    # (argmax는 동점일 때 앞쪽을 고르므로 순위가 높은 문장이 먼저 선택되는 기존 동작과 같음)
+    candidate_order = np.asarray(candidate_indices_pool)
+    candidate_embeddings = _normalize_rows(np.asarray(sentence_embeddings)[candidate_order])
+    relevance = np.array([normalized_scores.get(idx, 0) for idx in candidate_indices_pool], dtype=np.float64)
+    is_selected = np.zeros(len(candidate_indices_pool), dtype=bool)
 
-        mmr_scores = []
-        current_selected_embeddings = sentence_embeddings[selected_indices]
-        
-        if current_selected_embeddings.ndim == 1:
-            current_selected_embeddings_reshaped = current_selected_embeddings.reshape(1, -1)
-        else:
-            current_selected_embeddings_reshaped = current_selected_embeddings
-
-        for cand_idx in remaining_candidate_indices:
-            original_score = normalized_scores.get(cand_idx, 0)
-            cand_embedding = sentence_embeddings[cand_idx].reshape(1, -1)
-            
-            similarities = cosine_similarity(cand_embedding, current_selected_embeddings_reshaped)
-            max_similarity_to_selected = np.max(similarities) if similarities.size > 0 else 0
-            
-            mmr_score = lambda_val * original_score - (1 - lambda_val) * max_similarity_to_selected
-            mmr_scores.append((cand_idx, mmr_score))
-        
-        if not mmr_scores:
-            break
+    # 이미 선택된 문장들과의 최대 유사도. 문장을 하나 고를 때마다 행렬-벡터 곱 한 번으로 갱신
+    max_similarity_to_selected = np.full(len(candidate_indices_pool), -np.inf)
 
-        mmr_scores.sort(key=lambda x: x[1], reverse=True)
-        next_best_idx = mmr_scores[0][0]
-        
-        selected_indices.append(next_best_idx)
+    def select(position: int):
+        nonlocal max_similarity_to_selected
+        is_selected[position] = True
+        selected_indices.append(int(candidate_order[position]))
+        similarities = candidate_embeddings @ candidate_embeddings[position]
+        max_similarity_to_selected = np.maximum(max_similarity_to_selected, similarities)
+
+    selected_indices = []
+    select(0)
+
+    while len(selected_indices) < num_to_select and not is_selected.all():
+        mmr_scores = lambda_val * relevance - (1 - lambda_val) * max_similarity_to_selected
+        mmr_scores[is_selected] = -np.inf
+        select(int(np.argmax(mmr_scores)))
 
     return selected_indices
 
+def _normalize_rows(embeddings: np.ndarray) -> np.ndarray:
+    # 코사인 유사도를 내적으로 계산하기 위한 L2 정규화 (영벡터는 그대로 두어 유사도 0)
+    if embeddings.ndim == 1:
+        embeddings = embeddings.reshape(1, -1)
+    norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return embeddings / norms
 
 def summarize_with_textrank(text: str, 
                             num_sentences_to_select_ratio: float = 0.2, 
@@ -155,28 +179,33 @@ def summarize_with_textrank(text: str,
                             use_mmr: bool = True,
                             filter_endings: bool = True,
                             preprocess_function_to_use=preprocess_text_for_summary,
-                            perform_preprocessing: bool = True) -> str:
+                            perform_preprocessing: bool = True,
+                            document=None) -> str:
     # 1. 오류 처리 및 전처리
-    if not sentence_model:
+    if not get_sentence_model():
         return "오류: 문장 임베딩 모델이 로드되지 않았습니다. TextRank 요약을 진행할 수 없습니다."
-    if not text or not text.strip():
-        return "입력 텍스트가 비어있거나 공백만 포함하고 있습니다."
+    if document is not None:
+        # 파이프라인에서 이미 전처리/문장 분리를 마친 LectureDocument를 넘겨준 경우
+        sentences = [s.strip() for s in document.sentences if s.strip()]
+    else:
+        if not text or not text.strip():
+            return "입력 텍스트가 비어있거나 공백만 포함하고 있습니다."
 
-    processed_text = text
-    if perform_preprocessing:
-        processed_text = preprocess_function_to_use(text)
-        
-    if not processed_text or not processed_text.strip():
-        return "전처리 후 또는 입력된 텍스트가 비어있습니다."
+        processed_text = text
+        if perform_preprocessing:
+            processed_text = preprocess_function_to_use(text)
+            
+        if not processed_text or not processed_text.strip():
+            return "전처리 후 또는 입력된 텍스트가 비어있습니다."
 
-    # 2. 문장 분리
-    sentences = split_sentences_texrank(processed_text)
+        # 2. 문장 분리
+        sentences = split_sentences_texrank(processed_text)
     if not sentences:
         return "텍스트에서 문장을 분리할 수 없습니다."
 
-    target_num_sentences = int(len(sentences) * num_sentences_to_select_ratio)
-    num_sentences_to_select_final = max(min_sentences, min(target_num_sentences, max_sentences))
-    num_sentences_to_select_final = min(num_sentences_to_select_final, len(sentences))
+    num_sentences_to_select_final = count_sentences_to_select(
+        len(sentences), num_sentences_to_select_ratio, min_sentences, max_sentences
+    )
     
     if not sentences or num_sentences_to_select_final == 0:
         return "텍스트에서 문장을 분리할 수 없거나 요약할 문장이 없습니다."
@@ -186,9 +215,12 @@ def summarize_with_textrank(text: str,
     if sentence_embeddings is None or sentence_embeddings.size == 0:
         return "문장 벡터화(임베딩)에 실패했습니다."
 
-    # 4. 유사도 행렬 생성
-    similarity_matrix = build_similarity_matrix_textrank(sentence_embeddings)
-    if similarity_matrix is None or similarity_matrix.size == 0:
+    # 4. 유사도 행렬 생성 (긴 강의는 상위 k개 이웃 그래프)
+    if len(sentences) >= TEXTRANK_KNN_MIN_SENTENCES:
+        similarity_matrix = build_knn_similarity_graph(sentence_embeddings)
+    else:
+        similarity_matrix = build_similarity_matrix_textrank(sentence_embeddings)
+    if similarity_matrix is None or similarity_matrix.shape[0] == 0:
         return "유사도 행렬 생성에 실패했습니다."
 
     # 5. TextRank 알고리즘 적용
@@ -198,6 +230,41 @@ def summarize_with_textrank(text: str,
         if len(sentences) == 1: return sentences[0]
         return "TextRank 점수 계산에 실패했거나 유의미한 핵심 문장을 찾지 못했습니다."
 
+    return compose_textrank_summary(
+        sentences,
+        ranked_sentence_indices_with_scores,
+        sentence_embeddings,
+        num_sentences_to_select_final,
+        lambda_mmr=lambda_mmr,
+        use_mmr=use_mmr,
+        filter_endings=filter_endings,
+    )
+
+
+def count_sentences_to_select(
+    num_sentences: int,
+    num_sentences_to_select_ratio: float,
+    min_sentences: int,
+    max_sentences: int,
+) -> int:
+    target_num_sentences = int(num_sentences * num_sentences_to_select_ratio)
+    num_sentences_to_select_final = max(min_sentences, min(target_num_sentences, max_sentences))
+    return min(num_sentences_to_select_final, num_sentences)
+
+
+def compose_textrank_summary(
+    sentences: list[str],
+    ranked_sentence_indices_with_scores: list[tuple[int, float]],
+    sentence_embeddings: np.ndarray,
+    num_sentences_to_select_final: int,
+    lambda_mmr: float = 0.5,
+    use_mmr: bool = True,
+    filter_endings: bool = True,
+) -> str:
+    """
+    TextRank 순위에서 핵심 문장을 고르고(MMR), 마무리 인사를 거른 뒤 원문 순서대로 정리해 요약문을 만듭니다.
+    전체 요약과 점진적 요약(IncrementalTextRankSummarizer)이 함께 사용합니다.
+    """
     # 6. 핵심 문장 선택 (MMR 적용 여부)
     selected_indices_unfiltered: list[int]
     if use_mmr:
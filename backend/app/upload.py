@@ -0,0 +1,208 @@
+import hashlib
+import os
+import shutil
+from dataclasses import dataclass
+
+from fastapi import Request
+from fastapi.concurrency import run_in_threadpool
+from python_multipart.exceptions import MultipartParseError
+from python_multipart.multipart import MultipartParser, parse_options_header
+from werkzeug.utils import secure_filename
+
+# 업로드 최대 크기 (MB). 요청 본문을 끝까지 읽기 전에 Content-Length와 누적 크기로 검사
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_MB", "500")) * 1024 * 1024
+# multipart 경계/헤더 등 파일 외 부분으로 허용하는 여유 크기
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+# 작업 공간 파일 시스템에 업로드 후에도 남겨 둘 여유 공간 (변환/조각 WAV용)
+UPLOAD_FREE_SPACE_RESERVE_BYTES = int(os.getenv("UPLOAD_FREE_SPACE_RESERVE_MB", "256")) * 1024 * 1024
+# 형식 판별에 쓰는 파일 앞부분 크기
+FORMAT_SNIFF_BYTES = 16
+
+# 업로드 폼 스키마 (엔드포인트가 UploadFile 대신 요청 스트림을 직접 읽으므로 문서용으로 따로 지정)
+AUDIO_UPLOAD_OPENAPI = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "properties": {"audio_file": {"type": "string", "format": "binary"}},
+                    "required": ["audio_file"],
+                }
+            }
+        },
+    }
+}
+
+
+class UploadError(Exception):
+    """업로드를 받을 수 없을 때 HTTP 상태 코드와 사용자에게 보여줄 메시지를 담는 예외"""
+
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+@dataclass
+class SavedUpload:
+    filename: str      # secure_filename으로 정리한 원래 파일 이름
+    path: str          # 작업 공간에 저장된 경로
+    sha256: str
+    size: int
+    audio_format: str  # 파일 앞부분(매직 바이트)으로 판별한 형식
+
+
+def sniff_audio_format(header: bytes) -> str | None:
+    # 확장자 대신 파일 앞부분으로 실제 오디오 형식을 판별 (모르는 형식이면 None)
+    if header[:4] == b"RIFF" and header[8:12] == b"WAVE":
+        return "wav"
+    if header[:3] == b"ID3":
+        return "mp3"
+    if header[:4] == b"fLaC":
+        return "flac"
+    if header[:4] == b"OggS":
+        return "ogg"
+    if header[4:8] == b"ftyp":
+        return "mp4"  # m4a, mp4, 3gp
+    if header[:4] == b"\x1a\x45\xdf\xa3":
+        return "webm"  # webm, mkv
+    if header[:4] == b"FORM" and header[8:12] in (b"AIFF", b"AIFC"):
+        return "aiff"
+    if header[:5] == b"#!AMR":
+        return "amr"
+    if header[:4] == b"\x30\x26\xb2\x75":
+        return "asf"  # wma
+    if len(header) >= 2 and header[0] == 0xFF:
+        if header[1] & 0xF6 == 0xF0:
+            return "aac"  # ADTS
+        if header[1] & 0xE0 == 0xE0:
+            return "mp3"  # ID3 태그 없는 MPEG 오디오 프레임
+    return None
+
+
+async def receive_audio_upload(request: Request, workspace_dir: str, field_name: str = "audio_file") -> SavedUpload:
+    """
+    multipart 요청 본문을 받는 대로 파싱해 파일 부분만 작업 공간에 바로 씁니다.
+    FastAPI가 임시 파일로 한 번 저장한 뒤 다시 복사하지 않으므로 업로드당 디스크 쓰기는 한 번이고,
+    쓰는 동안 SHA-256 계산, 형식 판별, 크기 제한 검사를 함께 합니다. 제한을 넘으면 나머지 본문은 읽지 않습니다.
+    """
+    content_type, options = parse_options_header(request.headers.get("content-type", ""))
+    boundary = options.get(b"boundary")
+    if content_type != b"multipart/form-data" or not boundary:
+        raise UploadError(400, "multipart/form-data 형식으로 오디오 파일을 업로드해 주세요.")
+
+    # 크기 제한은 설정값과 작업 공간의 남은 공간 중 작은 쪽 (tmpfs 등 작은 파일 시스템에서 쓰다가 실패하지 않도록)
+    free_bytes = shutil.disk_usage(workspace_dir).free - UPLOAD_FREE_SPACE_RESERVE_BYTES
+    max_bytes = min(MAX_UPLOAD_BYTES, max(0, free_bytes))
+
+    def too_large_error() -> UploadError:
+        if max_bytes < MAX_UPLOAD_BYTES:
+            return UploadError(507, "서버 작업 공간이 부족해 업로드를 받을 수 없습니다. 잠시 후 다시 시도해 주세요.")
+        return UploadError(413, f"업로드 파일이 너무 큽니다. (최대 {MAX_UPLOAD_BYTES // (1024 * 1024)}MB)")
+
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > max_bytes + MULTIPART_OVERHEAD_BYTES:
+        raise too_large_error()
+
+    part_headers: dict[bytes, bytes] = {}
+    header_field = bytearray()
+    header_value = bytearray()
+    pending_data: list[bytes] = []  # 이번 요청 조각에서 파싱된 파일 데이터 (파서 콜백 밖에서 디스크에 씀)
+    state = {"in_file": False, "filename": None, "done": False}
+
+    def on_part_begin():
+        part_headers.clear()
+        state["in_file"] = False
+
+    def on_header_field(data: bytes, start: int, end: int):
+        header_field.extend(data[start:end])
+
+    def on_header_value(data: bytes, start: int, end: int):
+        header_value.extend(data[start:end])
+
+    def on_header_end():
+        part_headers[bytes(header_field).lower()] = bytes(header_value)
+        header_field.clear()
+        header_value.clear()
+
+    def on_headers_finished():
+        _, disposition = parse_options_header(part_headers.get(b"content-disposition", b""))
+        name = disposition.get(b"name", b"").decode("utf-8", errors="replace")
+        # 같은 필드가 여러 번 오면 첫 번째 파일만 사용
+        if name == field_name and b"filename" in disposition and state["filename"] is None:
+            state["in_file"] = True
+            state["filename"] = disposition[b"filename"].decode("utf-8", errors="replace")
+
+    def on_part_data(data: bytes, start: int, end: int):
+        if state["in_file"]:
+            pending_data.append(data[start:end])
+
+    def on_part_end():
+        if state["in_file"]:
+            state["in_file"] = False
+            state["done"] = True
+
+    parser = MultipartParser(boundary, {
+        "on_part_begin": on_part_begin,
+        "on_header_field": on_header_field,
+        "on_header_value": on_header_value,
+        "on_header_end": on_header_end,
+        "on_headers_finished": on_headers_finished,
+        "on_part_data": on_part_data,
+        "on_part_end": on_part_end,
+    })
+
+    hasher = hashlib.sha256()
+    held: list[bytes] = []  # 형식을 확인하기 전까지 모아 두는 파일 앞부분
+    size = 0
+    audio_format = None
+    saved_filepath = None
+    out = None
+    try:
+        async for chunk in request.stream():
+            try:
+                parser.write(chunk)
+            except MultipartParseError as e:
+                raise UploadError(400, f"업로드 요청 형식이 올바르지 않습니다: {e}")
+            if pending_data:
+                data = b"".join(pending_data)
+                pending_data.clear()
+                size += len(data)
+                if size > max_bytes:
+                    raise too_large_error()
+                hasher.update(data)
+
+                if out is None:
+                    # 앞부분이 모여 형식이 확인된 뒤에야 파일을 만듦
+                    held.append(data)
+                    if size < FORMAT_SNIFF_BYTES and not state["done"]:
+                        continue
+                    data = b"".join(held)
+                    held.clear()
+                    audio_format = sniff_audio_format(data[:FORMAT_SNIFF_BYTES])
+                    if audio_format is None:
+                        raise UploadError(415, "지원하지 않는 오디오 형식입니다.")
+                    saved_filepath = os.path.join(workspace_dir, secure_filename(state["filename"]) or "uploaded_audio")
+                    out = await run_in_threadpool(open, saved_filepath, "wb")
+                await run_in_threadpool(out.write, data)
+            if state["done"]:
+                break  # 파일 부분을 다 받았으면 나머지 폼 필드는 읽지 않음
+    finally:
+        if out is not None:
+            await run_in_threadpool(out.close)
+
+    if not state["filename"]:
+        raise UploadError(400, "파일이 선택되지 않았습니다.")
+    if not state["done"]:
+        raise UploadError(400, "업로드가 중간에 끊겼습니다.")
+    if saved_filepath is None:
+        raise UploadError(400, "빈 파일은 처리할 수 없습니다.")
+    print(f"[Upload] {state['filename']} 저장 완료 ({size / (1024 * 1024):.1f}MB, {audio_format})")
+    return SavedUpload(
+        filename=os.path.basename(saved_filepath),
+        path=saved_filepath,
+        sha256=hasher.hexdigest(),
+        size=size,
+        audio_format=audio_format,
+    )
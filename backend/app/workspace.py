@@ -0,0 +1,37 @@
+import os
+import shutil
+import tempfile
+from contextlib import contextmanager
+from typing import Iterator
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+UPLOAD_AUDIO_DIR = os.path.join(BASE_DIR, "uploaded_audio_files")
+
+# 요청 작업 공간(업로드 원본, 변환 WAV, 조각 WAV)을 만들 위치
+# 업로드는 최대 MAX_UPLOAD_MB까지 그대로 이 안에 쓰이므로 기본값은 디스크 위 디렉토리
+# (Docker의 /dev/shm은 기본 64MB라 큰 업로드를 받을 수 없음. 메모리가 넉넉하면 SCRATCH_ROOT로 tmpfs를 지정)
+SCRATCH_ROOT = os.getenv("SCRATCH_ROOT") or os.path.join(UPLOAD_AUDIO_DIR, "scratch")
+
+def create_request_workspace() -> str:
+    # 요청마다 고유한 임시 디렉토리 (업로드 파일, 변환 파일, 조각 WAV를 모두 이 안에 둠)
+    os.makedirs(SCRATCH_ROOT, exist_ok=True)
+    workspace_dir = tempfile.mkdtemp(prefix="lecture_", dir=SCRATCH_ROOT)
+    print(f"[Workspace] 요청 작업 공간 생성: {workspace_dir}")
+    return workspace_dir
+
+def remove_request_workspace(workspace_dir: str):
+    if workspace_dir and os.path.exists(workspace_dir):
+        shutil.rmtree(workspace_dir, ignore_errors=True)
+        print(f"[CLEANUP] 요청 작업 공간 삭제: {workspace_dir}")
+
+@contextmanager
+def request_workspace() -> Iterator[str]:
+    """
+    요청 전용 작업 공간을 만들고, 블록을 벗어나면 디렉토리 전체를 삭제합니다.
+    동시에 들어온 요청끼리 chunk_{i}.wav나 같은 이름의 업로드 파일을 덮어쓰지 않습니다.
+    """
+    workspace_dir = create_request_workspace()
+    try:
+        yield workspace_dir
+    finally:
+        remove_request_workspace(workspace_dir)
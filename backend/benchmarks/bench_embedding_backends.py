@@ -0,0 +1,85 @@
+# 문장 임베딩 추론 방식(torch FP32 / int8 / onnx) 비교: CPU 처리량과 TextRank 선택 결과 일치도
+# 실행: backend 디렉토리에서 python -m benchmarks.bench_embedding_backends <강의 텍스트 파일>
+import sys
+import time
+
+import numpy as np
+
+from app.preprocess.document import split_document_sentences
+from app.preprocess.text_utils import preprocess_text_for_summary
+from app.summary.embedding_service import (
+    SENTENCE_EMBEDDING_BACKENDS,
+    SENTENCE_EMBEDDING_BATCH_SIZE,
+    SENTENCE_MODEL_NAME,
+    _load_sentence_model_with_backend,
+)
+from app.summary.textrank_summary import (
+    apply_mmr_to_ranked_sentences,
+    apply_textrank_algorithm,
+    build_similarity_matrix_textrank,
+)
+
+# summarize_long_text 기본값과 같은 선택 조건
+SELECT_RATIO = 0.25
+MIN_SENTENCES = 5
+MAX_SENTENCES = 15
+SIMILARITY_THRESHOLD = 0.15
+LAMBDA_MMR = 0.5
+REPEATS = 3
+
+
+def select_sentences(embeddings: np.ndarray) -> list[int]:
+    num_to_select = max(MIN_SENTENCES, min(int(len(embeddings) * SELECT_RATIO), MAX_SENTENCES))
+    num_to_select = min(num_to_select, len(embeddings))
+    ranked = apply_textrank_algorithm(build_similarity_matrix_textrank(embeddings), SIMILARITY_THRESHOLD)
+    return apply_mmr_to_ranked_sentences(ranked, embeddings, num_to_select, LAMBDA_MMR)
+
+
+def encode(model, sentences: list[str]) -> np.ndarray:
+    return np.asarray(
+        model.encode(
+            sentences,
+            batch_size=SENTENCE_EMBEDDING_BATCH_SIZE,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+            show_progress_bar=False,
+        ),
+        dtype=np.float32,
+    )
+
+
+def main():
+    if len(sys.argv) < 2:
+        print("사용법: python -m benchmarks.bench_embedding_backends <강의 텍스트 파일>")
+        return
+    with open(sys.argv[1], "r", encoding="utf-8") as f:
+        sentences, _ = split_document_sentences(preprocess_text_for_summary(f.read()))
+    print(f"문장 {len(sentences)}개, 모델 {SENTENCE_MODEL_NAME}")
+
+    baseline_embeddings = None
+    baseline_selection = None
+    for backend in SENTENCE_EMBEDDING_BACKENDS:
+        model_id, model = _load_sentence_model_with_backend(SENTENCE_MODEL_NAME, backend)
+        if backend != "torch" and not model_id.endswith(f"@{backend}"):
+            print(f"{backend:5s}  준비 실패로 건너뜀")
+            continue
+
+        encode(model, sentences[:SENTENCE_EMBEDDING_BATCH_SIZE])  # 워밍업
+        start = time.perf_counter()
+        for _ in range(REPEATS):
+            embeddings = encode(model, sentences)
+        sentences_per_second = len(sentences) * REPEATS / (time.perf_counter() - start)
+        selection = select_sentences(embeddings)
+
+        line = f"{backend:5s}  {sentences_per_second:8.1f} sentences/s"
+        if baseline_embeddings is None:
+            baseline_embeddings, baseline_selection = embeddings, selection
+        else:
+            mean_cosine = float(np.mean(np.sum(embeddings * baseline_embeddings, axis=1)))
+            overlap = len(set(selection) & set(baseline_selection)) / len(baseline_selection)
+            line += f"  mean_cosine_vs_fp32={mean_cosine:.4f}  selection_overlap_vs_fp32={overlap:.2f}"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+# 긴 강의용 TextRank 유사도 그래프 벤치마크 (dense n×n vs 상위 k 이웃 희소 그래프)
+# 실행: backend 디렉토리에서 python -m benchmarks.bench_knn_graph
+import time
+import tracemalloc
+
+import numpy as np
+from scipy.stats import spearmanr
+
+from app.summary.textrank_summary import (
+    apply_textrank_algorithm,
+    build_knn_similarity_graph,
+    build_similarity_matrix_textrank,
+)
+
+EMBEDDING_DIM = 768
+SIMILARITY_THRESHOLD = 0.15
+SENTENCE_COUNTS = (2000, 5000, 10000, 20000)
+DENSE_MAX_SENTENCES = 5000  # 이보다 크면 dense 행렬이 메모리를 너무 많이 씀
+TOP_N = 15
+
+
+def make_embeddings(num_sentences: int, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    # 강의처럼 자주 다루는 주제와 잠깐 언급하는 주제가 섞이고, 주제에 가까운 문장과 잡담성 문장이 섞이도록 생성
+    topics = rng.normal(size=(40, EMBEDDING_DIM))
+    topic_weights = 1.0 / np.arange(1, len(topics) + 1)
+    topic_ids = rng.choice(len(topics), size=num_sentences, p=topic_weights / topic_weights.sum())
+    noise_scale = rng.uniform(0.8, 2.5, size=(num_sentences, 1))
+    embeddings = topics[topic_ids] + noise_scale * rng.normal(size=(num_sentences, EMBEDDING_DIM))
+    return embeddings.astype(np.float32)
+
+
+def measure(build_fn, embeddings: np.ndarray):
+    tracemalloc.start()
+    start = time.perf_counter()
+    graph = build_fn(embeddings)
+    ranked = apply_textrank_algorithm(graph, SIMILARITY_THRESHOLD)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    scores = np.zeros(len(ranked))
+    for i, score in ranked:
+        scores[i] = score
+    return scores, elapsed, peak / (1024 * 1024)
+
+
+def main():
+    for num_sentences in SENTENCE_COUNTS:
+        embeddings = make_embeddings(num_sentences)
+        knn_scores, knn_seconds, knn_peak_mb = measure(build_knn_similarity_graph, embeddings)
+        line = f"n={num_sentences:5d}  knn {knn_seconds:7.2f}s {knn_peak_mb:8.1f}MB"
+
+        if num_sentences <= DENSE_MAX_SENTENCES:
+            dense_scores, dense_seconds, dense_peak_mb = measure(build_similarity_matrix_textrank, embeddings)
+            # 전체 순위 상관계수와, knn 상위 TOP_N 문장이 dense 순위에서 가장 낮게 놓인 위치
+            dense_rank = np.argsort(np.argsort(-dense_scores, kind="stable"))
+            knn_top = np.argsort(-knn_scores, kind="stable")[:TOP_N]
+            line += (
+                f"  dense {dense_seconds:7.2f}s {dense_peak_mb:8.1f}MB"
+                f"  spearman={spearmanr(knn_scores, dense_scores)[0]:.3f}"
+                f"  worst_dense_rank_of_top{TOP_N}={dense_rank[knn_top].max() + 1}"
+            )
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+# MMR 문장 선택 벤치마크 (기존 구현 vs 벡터화 구현)
+# 실행: backend 디렉토리에서 python -m benchmarks.bench_mmr
+import time
+
+import numpy as np
+from sklearn.metrics.pairwise import cosine_similarity
+
+from app.summary.textrank_summary import apply_mmr_to_ranked_sentences
+
+EMBEDDING_DIM = 768
+NUM_TO_SELECT = 15
+SENTENCE_COUNTS = (200, 1000, 2000, 5000, 10000)
+REFERENCE_MAX_SENTENCES = 2000  # 기존 구현은 이보다 크면 너무 오래 걸려서 생략
+
+
+def reference_mmr(ranked_sentences_with_scores, sentence_embeddings, num_to_select, lambda_val=0.5):
+    # 벡터화 이전의 구현 (후보마다 cosine_similarity 호출)
+    max_score = max(s for _, s in ranked_sentences_with_scores if s > 0)
+    normalized_scores = {idx: score / max_score for idx, score in ranked_sentences_with_scores}
+    candidate_indices_pool = [idx for idx, score in ranked_sentences_with_scores]
+    selected_indices = [ranked_sentences_with_scores[0][0]]
+
+    while len(selected_indices) < num_to_select:
+        remaining_candidate_indices = [idx for idx in candidate_indices_pool if idx not in selected_indices]
+        if not remaining_candidate_indices:
+            break
+        mmr_scores = []
+        current_selected_embeddings = sentence_embeddings[selected_indices]
+        for cand_idx in remaining_candidate_indices:
+            cand_embedding = sentence_embeddings[cand_idx].reshape(1, -1)
+            similarities = cosine_similarity(cand_embedding, current_selected_embeddings)
+            mmr_score = lambda_val * normalized_scores[cand_idx] - (1 - lambda_val) * np.max(similarities)
+            mmr_scores.append((cand_idx, mmr_score))
+        mmr_scores.sort(key=lambda x: x[1], reverse=True)
+        selected_indices.append(mmr_scores[0][0])
+    return selected_indices
+
+
+def make_inputs(num_sentences: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    # 실제 문장 임베딩처럼 몇 개의 주제 방향 주변에 모이도록 생성
+    topics = rng.normal(size=(20, EMBEDDING_DIM))
+    embeddings = topics[rng.integers(0, len(topics), num_sentences)] + 0.5 * rng.normal(size=(num_sentences, EMBEDDING_DIM))
+    embeddings = embeddings.astype(np.float32)
+    scores = rng.random(num_sentences)
+    ranked = sorted(enumerate(scores), key=lambda x: x[1], reverse=True)
+    return ranked, embeddings
+
+
+def main():
+    for num_sentences in SENTENCE_COUNTS:
+        ranked, embeddings = make_inputs(num_sentences)
+
+        start = time.perf_counter()
+        selected = apply_mmr_to_ranked_sentences(ranked, embeddings, NUM_TO_SELECT)
+        vectorized_seconds = time.perf_counter() - start
+
+        if num_sentences <= REFERENCE_MAX_SENTENCES:
+            start = time.perf_counter()
+            expected = reference_mmr(ranked, embeddings, NUM_TO_SELECT)
+            reference_seconds = time.perf_counter() - start
+            print(
+                f"n={num_sentences:5d}  reference {reference_seconds:7.3f}s  vectorized {vectorized_seconds:7.4f}s  "
+                f"speedup={reference_seconds / vectorized_seconds:7.1f}x  identical={selected == expected}"
+            )
+        else:
+            print(f"n={num_sentences:5d}  vectorized {vectorized_seconds:7.4f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+# TextRank PageRank 벤치마크 (networkx vs 희소 행렬 거듭제곱법)
+# 실행: backend 디렉토리에서 python -m benchmarks.bench_pagerank
+# networkx가 설치되어 있으면 기존 방식과 순위/시간/메모리를 비교함
+import time
+import tracemalloc
+
+import numpy as np
+
+from app.summary.textrank_summary import apply_textrank_algorithm
+
+try:
+    import networkx as nx
+except ImportError:
+    nx = None
+
+EMBEDDING_DIM = 256
+SIMILARITY_THRESHOLD = 0.15
+SENTENCE_COUNTS = (500, 1000, 2000, 5000)
+
+
+def networkx_textrank(similarity_matrix: np.ndarray, similarity_threshold: float) -> list[tuple[int, float]]:
+    # 교체 이전의 구현
+    processed_matrix = np.where(similarity_matrix < similarity_threshold, 0, similarity_matrix)
+    nx_graph = nx.from_numpy_array(processed_matrix)
+    scores = nx.pagerank(nx_graph, alpha=0.85, max_iter=500, tol=1.0e-6)
+    return sorted(((i, score) for i, score in scores.items()), key=lambda x: x[1], reverse=True)
+
+
+def make_similarity_matrix(num_sentences: int, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    topics = rng.normal(size=(30, EMBEDDING_DIM))
+    embeddings = topics[rng.integers(0, len(topics), num_sentences)] + 1.5 * rng.normal(size=(num_sentences, EMBEDDING_DIM))
+    embeddings /= np.linalg.norm(embeddings, axis=1, keepdims=True)
+    return embeddings @ embeddings.T
+
+
+def measure(fn, *args):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn(*args)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak / (1024 * 1024)
+
+
+def main():
+    for num_sentences in SENTENCE_COUNTS:
+        similarity_matrix = make_similarity_matrix(num_sentences)
+        ranked, seconds, peak_mb = measure(apply_textrank_algorithm, similarity_matrix, SIMILARITY_THRESHOLD)
+        line = f"n={num_sentences:5d}  sparse {seconds:7.3f}s {peak_mb:8.1f}MB"
+
+        if nx is not None:
+            expected, nx_seconds, nx_peak_mb = measure(networkx_textrank, similarity_matrix, SIMILARITY_THRESHOLD)
+            same_top = [i for i, _ in ranked[:50]] == [i for i, _ in expected[:50]]
+            max_diff = max(abs(score - dict(expected)[i]) for i, score in ranked)
+            line += (
+                f"  networkx {nx_seconds:7.3f}s {nx_peak_mb:8.1f}MB"
+                f"  speedup={nx_seconds / seconds:6.1f}x  same_top50={same_top}  max_score_diff={max_diff:.1e}"
+            )
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+# 요약 전처리(필러 제거 등) 벤치마크 (기존 다중 정규식 방식 vs 단일 스캔 엔진)
+# 실행: backend 디렉토리에서 python -m benchmarks.bench_preprocess
+import contextlib
+import io
+import random
+import re
+import time
+
+from app.preprocess.text_utils import SummaryPreprocessor, preprocess_text_for_summary
+
+TEXT_SIZES_MB = (1, 4, 8)
+STREAM_CHUNK_WORDS = 150  # 60초 STT 조각 하나에 해당하는 단어 수 정도
+
+CONTENT_WORDS = [
+    "트랜스포머는", "어텐션", "메커니즘을", "사용해서", "문장의", "각", "단어가", "다른", "단어와", "얼마나", "관련",
+    "있는지", "계산합니다", "모델은", "대량의", "텍스트로", "사전", "학습되고", "이후", "특정", "작업에", "맞게",
+    "미세", "조정됩니다", "임베딩", "벡터는", "의미가", "비슷한", "단어일수록", "가까운", "위치에", "놓입니다",
+]
+FILLERS = ["음", "어", "그", "저기", "그래서", "근데", "네", "좀", "막", "그냥", "진짜", "예를 들어", "그런 거"]
+
+
+def reference_preprocess(text: str) -> str:
+    # 교체 이전의 구현 (필러 정규식 4개 + 중복 제거 + 공백 정리 + 문장 분리/필터를 각각 전체 텍스트에 적용)
+    filler_patterns = [
+        r'\b(음|어|그|저기|일단|약간|뭐랄까|아무튼|글쎄|암튼|뭐냐|어쨌든|하여튼)\b[,\s]*',
+        r'\b(그게|저게|이거|그거|저거|그래서|근데|그러니까|그러면|게다가|이렇게|그렇게|저렇게)\b[,\s]*',
+        r'\b(그런 거|저런 거|예를 들어|바로)\b[,\s]*',
+        r'\b(네|자|좀|막|그냥|아니|혹시|지금|사실|아마|정말|진짜|완전|아주|매우|엄청|되게|굉장히)\b[,\s]*',
+    ]
+    processed_text = text
+    for pattern in filler_patterns:
+        processed_text = re.sub(pattern, ' ', processed_text)
+    processed_text = re.sub(r'\b(\w+)( \1\b)+', r'\1', processed_text)
+    processed_text = re.sub(r'\s+', ' ', processed_text).strip()
+    sentences = re.split(r'(?<=[.?!])\s+', processed_text)
+    return ' '.join(s for s in sentences if len(s) >= 15)
+
+
+def make_transcript(size_mb: float, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    words = []
+    size = 0
+    while size < size_mb * 1024 * 1024:
+        for _ in range(rng.randint(4, 14)):
+            word = rng.choice(FILLERS) if rng.random() < 0.2 else rng.choice(CONTENT_WORDS)
+            if rng.random() < 0.05:
+                word = f"{word} {word}"  # 말 더듬기
+            words.append(word)
+            size += len(word.encode("utf-8")) + 1
+        words[-1] += rng.choice([".", ".", ".", "?", "!"])
+    return " ".join(words)
+
+
+def main():
+    for size_mb in TEXT_SIZES_MB:
+        text = make_transcript(size_mb)
+
+        start = time.perf_counter()
+        expected = reference_preprocess(text)
+        reference_seconds = time.perf_counter() - start
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            processed = preprocess_text_for_summary(text)
+            engine_seconds = time.perf_counter() - start
+
+        # STT 조각 단위로 넣는 경우
+        words = text.split(" ")
+        preprocessor = SummaryPreprocessor()
+        streamed = []
+        start = time.perf_counter()
+        for i in range(0, len(words), STREAM_CHUNK_WORDS):
+            streamed.extend(preprocessor.feed(" ".join(words[i:i + STREAM_CHUNK_WORDS])))
+        streamed.extend(preprocessor.flush())
+        stream_seconds = time.perf_counter() - start
+
+        actual_mb = len(text.encode("utf-8")) / 1024 / 1024
+        print(
+            f"{actual_mb:5.1f}MB  reference {actual_mb / reference_seconds:6.1f}MB/s"
+            f"  engine {actual_mb / engine_seconds:6.1f}MB/s  streaming {actual_mb / stream_seconds:6.1f}MB/s"
+            f"  identical={processed == expected and ' '.join(streamed) == expected}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+# 병렬 STT 벤치마크 (Azure 없이 가짜 인식기로 실행)
+# 실행: backend 디렉토리에서 python -m benchmarks.bench_stt_parallel
+import random
+import time
+
+from app.stt import azure_stt
+from app.stt.azure_stt import transcribe_multiple_files
+
+NUM_CHUNKS = 90
+FAKE_SESSION_SECONDS = 0.05
+FAILURE_RATE = 0.1
+
+
+def fake_recognizer(audio_filepath: str) -> str:
+    # 실제 인식 세션처럼 일정 시간 대기하고, 가끔 API 오류를 흉내냄
+    time.sleep(FAKE_SESSION_SECONDS)
+    if random.random() < FAILURE_RATE:
+        return "Azure Speech API 처리 오류: fake transient error"
+    return f"{audio_filepath} 인식 결과."
+
+
+def main():
+    # 재시도 대기 시간은 벤치마크에서 무시할 수 있을 만큼 줄임
+    azure_stt.AZURE_STT_RETRY_BACKOFF_SECONDS = 0.01
+    chunk_paths = [f"chunk_{i}.wav" for i in range(NUM_CHUNKS)]
+    baseline = None
+    for workers in (1, 2, 4, 8, 16):
+        random.seed(0)
+        start = time.perf_counter()
+        text = transcribe_multiple_files(chunk_paths, max_workers=workers, transcribe_fn=fake_recognizer)
+        elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        in_order = text.split(" 인식 결과.")[0] == "chunk_0.wav"
+        print(f"workers={workers:2d}  {elapsed:6.2f}s  speedup={baseline / elapsed:5.2f}x  in_order={in_order}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+import os
+import stat
+import sys
+import textwrap
+
+from app.stt import audio_stream
+
+# 경고를 파이프 버퍼(보통 64KB)보다 훨씬 많이 stderr에 쓴 뒤 PCM을 내보내는 가짜 ffmpeg
+FAKE_ENCODER = textwrap.dedent("""\
+    #!{python}
+    import sys
+    for _ in range(10000):
+        sys.stderr.write("[mp3float] Header missing\\n")
+    sys.stderr.flush()
+    sys.stdout.buffer.write(b"\\x00" * {pcm_bytes})
+""")
+
+
+def test_iter_pcm_frames_does_not_block_on_noisy_stderr(tmp_path, monkeypatch):
+    frame_bytes = audio_stream.STREAM_SAMPLE_RATE * 2 * 100 // 1000
+    encoder = tmp_path / "fake_ffmpeg"
+    encoder.write_text(FAKE_ENCODER.format(python=sys.executable, pcm_bytes=frame_bytes * 3))
+    encoder.chmod(encoder.stat().st_mode | stat.S_IEXEC)
+    monkeypatch.setattr(audio_stream, "get_encoder_name", lambda: str(encoder))
+
+    frames = list(audio_stream.iter_pcm_frames(os.devnull))
+
+    assert len(frames) == 3
+    assert all(len(frame) == frame_bytes for frame in frames)